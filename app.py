@@ -1,7 +1,9 @@
 import streamlit as st
+import pandas as pd
 from datetime import datetime
 from database.db import init_database
-from database.models import get_dashboard_stats, get_all_projects
+from database.models import get_dashboard_stats, get_all_projects, get_execution_trend, get_priority_trend
+from components.sql_profiler import sql_profiler_panel
 
 # Database'i başlat
 init_database()
@@ -77,9 +79,6 @@ st.markdown("---")
 # Dashboard metrikleri
 st.subheader("📊 Dashboard Overview")
 
-# Verileri çek
-stats = get_dashboard_stats()
-
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
@@ -118,6 +117,63 @@ with col4:
 
 st.markdown("---")
 
+# Trendler (yalnızca günlük özet tablosundan okunur)
+st.subheader("📈 Test Trendleri")
+
+if stats['total_executions'] == 0:
+    st.info("📊 Trend grafikleri için henüz test sonucu yok. **Test Execution** sayfasından test sonuçlarını kaydedin.")
+else:
+    trend_projects = {"🌐 Tüm Projeler": None}
+    trend_projects.update({f"📁 {p['name']} (ID: {p['id']})": p['id'] for p in get_all_projects()})
+
+    col_project, col_days = st.columns([3, 2])
+
+    with col_project:
+        trend_project_name = st.selectbox("Proje", options=list(trend_projects.keys()), key="trend_project")
+
+    with col_days:
+        trend_days = st.radio(
+            "Dönem",
+            options=[7, 30, 90, 180],
+            index=2,
+            format_func=lambda x: f"Son {x} gün",
+            horizontal=True,
+            key="trend_days"
+        )
+
+    trend_project_id = trend_projects[trend_project_name]
+    trend = get_execution_trend(trend_project_id, days=trend_days)
+
+    if len(trend) == 0:
+        st.info(f"📊 Son {trend_days} günde kaydedilmiş test sonucu yok.")
+    else:
+        trend_df = pd.DataFrame(trend).set_index("day")
+
+        col_rate, col_status = st.columns(2)
+
+        with col_rate:
+            st.markdown("**✅ Günlük Başarı Oranı (%)**")
+            st.line_chart(trend_df[["pass_rate"]].rename(columns={"pass_rate": "Başarı Oranı"}))
+
+        with col_status:
+            st.markdown("**📊 Günlük Sonuç Dağılımı**")
+            st.bar_chart(
+                trend_df[["passed", "failed", "blocked", "skipped"]].rename(columns={
+                    "passed": "Pass", "failed": "Fail", "blocked": "Blocked", "skipped": "Skipped"
+                }),
+                color=["#4CAF50", "#F44336", "#FF9800", "#9E9E9E"]
+            )
+
+        priority_df = pd.DataFrame(get_priority_trend(trend_project_id, days=trend_days))
+        st.markdown("**🎯 Önceliğe Göre Başarı Oranı (%)**")
+        st.line_chart(priority_df, x="day", y="pass_rate", color="priority")
+
+        total_runs = int(trend_df["total"].sum())
+        period_rate = round(trend_df["passed"].sum() / total_runs * 100, 1)
+        st.caption(f"Son {trend_days} gün: {total_runs} çalıştırma · ortalama başarı %{period_rate}")
+
+st.markdown("---")
+
 # Platform Özellikleri
 st.subheader("✨ Platform Özellikleri")
 
@@ -274,4 +330,6 @@ with col3:
     """)
 
 st.markdown("---")
-st.caption("🤖 SmartQA - AI Test Assistant | Version 1.0.0")
\ No newline at end of file
+st.caption("🤖 SmartQA - AI Test Assistant | Version 1.0.0")
+
+sql_profiler_panel()
@@ -0,0 +1,125 @@
+"""
+Benchmark'lar için tohumlu (seed) sentetik veri üreticisi
+
+N proje × M senaryo × K execution ve başarısız execution'ların bir kısmı için bug
+raporu üretir. Aynı seed ve parametreler her zaman aynı veriyi üretir; tarihler
+son DAYS gün içine yayılır. Veriler doğrudan SQL ile yazılır, istatistik ve arama
+index'i trigger'lar tarafından güncellenir.
+"""
+import random
+from datetime import datetime, timedelta
+
+DAYS = 180
+END_DATE = datetime(2025, 1, 1)  # Tarihler bu andan geriye doğru dağıtılır
+
+# Execution durum dağılımı
+STATUS_WEIGHTS = {"pass": 0.70, "fail": 0.18, "blocked": 0.07, "skipped": 0.05}
+PRIORITY_WEIGHTS = {"critical": 0.1, "high": 0.3, "medium": 0.4, "low": 0.2}
+
+WORDS = [
+    "login", "kayıt", "sepet", "ödeme", "arama", "filtre", "profil", "şifre", "bildirim",
+    "rapor", "fatura", "sipariş", "ürün", "kategori", "yetki", "oturum", "mobil", "api",
+    "dosya", "yükleme", "indirme", "e-posta", "doğrulama", "kupon", "stok", "kargo"
+]
+
+
+def _sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _timestamp(rng, now):
+    moment = now - timedelta(seconds=rng.randint(0, DAYS * 24 * 3600))
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def generate_dataset(conn, projects=5, scenarios=200, executions=20, bug_ratio=0.5, seed=42):
+    """
+    Veritabanına sentetik veri yaz.
+    projects: proje sayısı, scenarios: proje başına senaryo, executions: senaryo başına
+    execution, bug_ratio: bug raporu açılan başarısız execution oranı.
+    Oluşturulan satır sayılarını döndürür.
+    """
+    rng = random.Random(seed)
+    now = END_DATE
+    statuses = list(STATUS_WEIGHTS)
+    status_weights = list(STATUS_WEIGHTS.values())
+    priorities = list(PRIORITY_WEIGHTS)
+    priority_weights = list(PRIORITY_WEIGHTS.values())
+    counts = {"projects": 0, "scenarios": 0, "executions": 0, "bugs": 0}
+
+    for project_index in range(projects):
+        cursor = conn.execute(
+            "INSERT INTO projects (name, url, description, created_at) VALUES (?, ?, ?, ?)",
+            (f"Proje {project_index + 1}", f"https://example{project_index}.test",
+             _sentence(rng, 12), _timestamp(rng, now))
+        )
+        project_id = cursor.lastrowid
+        counts["projects"] += 1
+
+        scenario_rows = []
+        scenario_steps = []
+        for scenario_index in range(scenarios):
+            scenario_steps.append([_sentence(rng, 6) for _ in range(rng.randint(3, 7))])
+            scenario_rows.append((
+                project_id,
+                f"{_sentence(rng, 3).capitalize()} testi #{scenario_index + 1}",
+                _sentence(rng, 15),
+                rng.choices(priorities, priority_weights)[0],
+                rng.random() < 0.5,
+                _timestamp(rng, now)
+            ))
+        conn.executemany(
+            """INSERT INTO test_scenarios
+               (project_id, title, description, priority, created_by_ai, created_at)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            scenario_rows
+        )
+        counts["scenarios"] += len(scenario_rows)
+
+        scenario_ids = [row[0] for row in conn.execute(
+            "SELECT id FROM test_scenarios WHERE project_id = ? ORDER BY id", (project_id,)
+        )]
+        conn.executemany(
+            "INSERT INTO scenario_steps (scenario_id, ordinal, text) VALUES (?, ?, ?)",
+            [
+                (scenario_id, ordinal, text)
+                for scenario_id, steps in zip(scenario_ids, scenario_steps)
+                for ordinal, text in enumerate(steps, 1)
+            ]
+        )
+        execution_rows = []
+        for scenario_id in scenario_ids:
+            for _ in range(executions):
+                status = rng.choices(statuses, status_weights)[0]
+                notes = _sentence(rng, 8) if status != "pass" else ""
+                execution_rows.append((scenario_id, status, notes, _timestamp(rng, now)))
+        conn.executemany(
+            "INSERT INTO test_executions (scenario_id, status, notes, executed_at) VALUES (?, ?, ?, ?)",
+            execution_rows
+        )
+        counts["executions"] += len(execution_rows)
+
+        failed = conn.execute(
+            """SELECT e.id, e.executed_at FROM test_executions e
+               JOIN test_scenarios s ON s.id = e.scenario_id
+               WHERE s.project_id = ? AND e.status = 'fail'""",
+            (project_id,)
+        ).fetchall()
+        bug_rows = [
+            (execution_id, f"Bug: {_sentence(rng, 4)}", rng.choices(priorities, priority_weights)[0],
+             _sentence(rng, 20), _sentence(rng, 10), _sentence(rng, 6), _sentence(rng, 6),
+             rng.random() < 0.5, executed_at)
+            for execution_id, executed_at in failed
+            if rng.random() < bug_ratio
+        ]
+        conn.executemany(
+            """INSERT INTO bug_reports
+               (execution_id, title, severity, description, steps_to_reproduce,
+                expected_result, actual_result, ai_generated, created_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            bug_rows
+        )
+        counts["bugs"] += len(bug_rows)
+
+    conn.commit()
+    return counts
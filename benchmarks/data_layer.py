@@ -0,0 +1,405 @@
+"""
+Veri katmanı benchmark'ı
+
+Geçici bir veritabanına tohumlu sentetik veri yükler; models.py fonksiyonlarını,
+sayfaların her rerun'da yaptığı veri yüklemelerini ve toplu yazmaları ölçer.
+Okumalar hem soğuk (sorgu önbelleği temiz) hem önbellekten ölçülür. Sonuçlar JSON
+olarak yazılır ve --baseline ile verilen önceki bir sonuçla karşılaştırılabilir;
+eşik aşılırsa çıkış kodu 1 olur.
+
+Kullanım:
+    python -m benchmarks.data_layer --projects 5 --scenarios 200 --executions 20 --output main.json
+    python -m benchmarks.data_layer --output branch.json --baseline main.json --threshold 0.25
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import inspect
+import sqlite3
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime
+from benchmarks.data_generator import generate_dataset, END_DATE
+
+# Ölçümler bu sürenin altındaki farkları regresyon saymaz (gürültü)
+MIN_DELTA_MS = 0.1
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _summary(durations):
+    durations = sorted(durations)
+    return {
+        "median_ms": round(statistics.median(durations), 4),
+        "p95_ms": round(durations[min(len(durations) - 1, int(len(durations) * 0.95))], 4),
+        "min_ms": round(durations[0], 4),
+        "runs": len(durations)
+    }
+
+
+class Runner:
+    """Ölçümleri çalıştırıp sonuçları toplar"""
+
+    def __init__(self, repeat, invalidate_cache):
+        self.repeat = repeat
+        self.invalidate_cache = invalidate_cache
+        self.results = {}
+
+    def measure(self, name, call, setup=None, cached=False):
+        """
+        call'u repeat kez ölç. setup verilirse her ölçümden önce (süreye dahil
+        edilmeden) çağrılır ve dönüş değeri call'a argüman olarak geçilir.
+        cached=True ise ayrıca önbellekten okuma süresi '<ad> [cached]' olarak kaydedilir.
+        """
+        durations = []
+        for _ in range(self.repeat):
+            argument = setup() if setup else None
+            self.invalidate_cache()
+            started = time.perf_counter()
+            call(argument) if setup else call()
+            durations.append((time.perf_counter() - started) * 1000)
+        self.results[name] = _summary(durations)
+
+        if cached:
+            call(argument) if setup else call()
+            durations = []
+            for _ in range(self.repeat):
+                started = time.perf_counter()
+                call(argument) if setup else call()
+                durations.append((time.perf_counter() - started) * 1000)
+            self.results[f"{name} [cached]"] = _summary(durations)
+
+
+def _page_loads(models, project_id):
+    """Sayfaların her rerun'da yaptığı veri yüklemelerini taklit eden fonksiyonlar"""
+
+    def dashboard():
+        models.get_dashboard_stats()
+        models.get_all_projects()
+        models.get_execution_trend(None, days=90, end_date=END_DATE)
+        models.get_priority_trend(None, days=90, end_date=END_DATE)
+
+    def projects_page():
+        for project in models.get_all_projects():
+            models.get_dashboard_stats(project['id'])
+
+    def test_scenarios_page():
+        models.get_all_projects()
+        models.get_project_by_id(project_id)
+        models.get_dashboard_stats(project_id)
+        scenarios = models.get_scenarios_by_project(project_id, limit=26)[:25]
+        models.get_steps_for_scenarios([scenario['id'] for scenario in scenarios])
+        models.get_scenario_health([scenario['id'] for scenario in scenarios])
+
+    def test_execution_page():
+        models.get_all_projects()
+        models.get_project_by_id(project_id)
+        models.get_dashboard_stats(project_id)
+        scenarios = models.get_scenarios_by_project(project_id, limit=26)[:25]
+        models.get_steps_for_scenarios([scenario['id'] for scenario in scenarios])
+        models.get_scenario_health([scenario['id'] for scenario in scenarios])
+        models.get_recent_executions_for_project(
+            project_id, per_scenario=5, scenario_ids=[scenario['id'] for scenario in scenarios]
+        )
+
+    def bug_reports_page():
+        models.get_all_projects()
+        models.get_dashboard_stats(project_id)
+        failed = models.get_failed_executions_by_project(project_id, limit=500)
+        if failed:
+            models.get_scenario_steps(failed[0]['scenario_id'])
+        models.get_dashboard_stats()
+        bugs = models.get_all_bug_reports(limit=11)[:10]
+        models.get_jira_outbox_status([bug['id'] for bug in bugs])
+        models.count_pending_jira_pushes()
+
+    return {
+        "page: dashboard": dashboard,
+        "page: projects": projects_page,
+        "page: test_scenarios": test_scenarios_page,
+        "page: test_execution": test_execution_page,
+        "page: bug_reports": bug_reports_page
+    }
+
+
+def run_benchmarks(models, runner):
+    """Tüm ölçümleri çalıştır; ölçülmeyen public models fonksiyonlarını döndür"""
+    project_id = models.get_all_projects()[0]['id']
+    scenarios = models.get_scenarios_by_project(project_id, limit=50)
+    scenario_id = scenarios[0]['id']
+    counter = {"value": 0}
+
+    def unique(prefix):
+        counter["value"] += 1
+        return f"{prefix} {counter['value']}"
+
+    def new_bug():
+        execution_id = models.create_test_execution(scenario_id, "fail", "benchmark")
+        return models.create_bug_report(execution_id, unique("Bug"), "high", "d", "s", "e", "a")
+
+    covered = set()
+
+    def measure(name, function, call, **kwargs):
+        covered.add(function)
+        runner.measure(name, call, **kwargs)
+
+    # Okumalar
+    bug_page = models.get_all_bug_reports(limit=10)
+    measure("get_all_projects", "get_all_projects", models.get_all_projects, cached=True)
+    measure("get_project_by_id", "get_project_by_id", lambda: models.get_project_by_id(project_id), cached=True)
+    measure("get_scenarios_by_project (all)", "get_scenarios_by_project",
+            lambda: models.get_scenarios_by_project(project_id), cached=True)
+    measure("get_scenarios_by_project (page 25)", "get_scenarios_by_project",
+            lambda: models.get_scenarios_by_project(project_id, limit=25), cached=True)
+    measure("get_scenario_by_id", "get_scenario_by_id", lambda: models.get_scenario_by_id(scenario_id), cached=True)
+    measure("get_steps_for_scenarios (page 25)", "get_steps_for_scenarios",
+            lambda: models.get_steps_for_scenarios([scenario['id'] for scenario in scenarios[:25]]), cached=True)
+    measure("get_scenario_steps", "get_scenario_steps", lambda: models.get_scenario_steps(scenario_id), cached=True)
+    measure("get_scenario_health (page 25)", "get_scenario_health",
+            lambda: models.get_scenario_health([scenario['id'] for scenario in scenarios[:25]]), cached=True)
+    measure("get_scenarios_by_health (flaky page 25)", "get_scenarios_by_health",
+            lambda: models.get_scenarios_by_health(project_id, limit=25, min_flakiness=0.3), cached=True)
+    measure("get_executions_by_scenario (all)", "get_executions_by_scenario",
+            lambda: models.get_executions_by_scenario(scenario_id), cached=True)
+    measure("get_executions_by_scenario (limit 5)", "get_executions_by_scenario",
+            lambda: models.get_executions_by_scenario(scenario_id, limit=5), cached=True)
+    measure("get_recent_executions_for_project (page 25)", "get_recent_executions_for_project",
+            lambda: models.get_recent_executions_for_project(
+                project_id, scenario_ids=[scenario['id'] for scenario in scenarios[:25]]
+            ), cached=True)
+    measure("get_recent_executions_for_project (all)", "get_recent_executions_for_project",
+            lambda: models.get_recent_executions_for_project(project_id), cached=True)
+    measure("get_failed_executions_by_project (limit 500)", "get_failed_executions_by_project",
+            lambda: models.get_failed_executions_by_project(project_id, limit=500), cached=True)
+    measure("get_all_bug_reports (page 10)", "get_all_bug_reports",
+            lambda: models.get_all_bug_reports(limit=10), cached=True)
+    measure("get_all_bug_reports (page 2)", "get_all_bug_reports",
+            lambda: models.get_all_bug_reports(limit=10, cursor=models.get_next_cursor(bug_page)), cached=True)
+    measure("get_next_cursor", "get_next_cursor", lambda: models.get_next_cursor(bug_page))
+    measure("search", "search", lambda: models.search(project_id, "login sepet"), cached=True)
+    measure("get_dashboard_stats (global)", "get_dashboard_stats", models.get_dashboard_stats, cached=True)
+    measure("get_dashboard_stats (project)", "get_dashboard_stats",
+            lambda: models.get_dashboard_stats(project_id), cached=True)
+    measure("get_execution_trend (90 days)", "get_execution_trend",
+            lambda: models.get_execution_trend(None, days=90, end_date=END_DATE), cached=True)
+    measure("get_priority_trend (90 days)", "get_priority_trend",
+            lambda: models.get_priority_trend(project_id, days=90, end_date=END_DATE), cached=True)
+    measure("get_jira_outbox_status (10 bugs)", "get_jira_outbox_status",
+            lambda: models.get_jira_outbox_status([bug['id'] for bug in bug_page]), cached=True)
+    measure("count_pending_jira_pushes", "count_pending_jira_pushes", models.count_pending_jira_pushes, cached=True)
+    measure("get_scenario_titles", "get_scenario_titles", lambda: models.get_scenario_titles(project_id))
+    measure("iter_bug_reports_for_export (all)", "iter_bug_reports_for_export",
+            lambda: sum(1 for _ in models.iter_bug_reports_for_export()))
+    measure("iter_executions_for_export (project)", "iter_executions_for_export",
+            lambda: sum(1 for _ in models.iter_executions_for_export(project_id)))
+
+    # Sayfa veri yüklemeleri (soğuk ve önbellekten rerun)
+    for name, load in _page_loads(models, project_id).items():
+        runner.measure(name, load, cached=True)
+
+    # Tekil yazmalar
+    measure("create_project", "create_project", lambda: models.create_project(unique("Proje"), "", ""))
+    measure("create_test_scenario", "create_test_scenario",
+            lambda: models.create_test_scenario(project_id, unique("Senaryo"), "d", ["a", "b", "c"]))
+    measure("update_test_scenario", "update_test_scenario",
+            lambda: models.update_test_scenario(scenario_id, unique("Senaryo"), "d", ["a", "b"], "high"))
+    measure("update_test_scenario (one step)", "update_test_scenario",
+            lambda: models.update_test_scenario(scenario_id, "Senaryo", "d", ["a", unique("adım")], "high"))
+    measure("create_test_execution", "create_test_execution",
+            lambda: models.create_test_execution(scenario_id, "pass", ""))
+    measure("create_bug_report", "create_bug_report", new_bug)
+
+    # Toplu yazmalar
+    measure("create_test_scenarios_bulk (500)", "create_test_scenarios_bulk",
+            lambda rows: models.create_test_scenarios_bulk(project_id, rows),
+            setup=lambda: [
+                {"title": unique("Toplu"), "description": "d", "steps": ["a", "b"], "priority": "medium"}
+                for _ in range(500)
+            ])
+    measure("import_test_scenarios_chunk (500)", "import_test_scenarios_chunk",
+            lambda rows: models.import_test_scenarios_chunk(project_id, rows),
+            setup=lambda: [(unique("İçe aktarılan"), "d", ["a", "b"], "medium") for _ in range(500)])
+    measure("create_test_executions_bulk (1000)", "create_test_executions_bulk",
+            lambda rows: models.create_test_executions_bulk(rows),
+            setup=lambda: [
+                {"scenario_id": scenarios[index % len(scenarios)]['id'], "status": "fail", "notes": "n"}
+                for index in range(1000)
+            ])
+    measure("create_bug_reports_bulk (100)", "create_bug_reports_bulk",
+            lambda rows: models.create_bug_reports_bulk(rows),
+            setup=lambda: [
+                {"execution_id": row['execution_id'], "title": unique("Bug"), "description": "d",
+                 "steps_to_reproduce": "s"}
+                for row in models.get_failed_executions_by_project(project_id, limit=100)
+            ])
+
+    # Jira outbox
+    measure("enqueue_jira_pushes (50)", "enqueue_jira_pushes",
+            lambda bug_ids: models.enqueue_jira_pushes(bug_ids),
+            setup=lambda: [new_bug() for _ in range(50)])
+
+    def claimable():
+        models.enqueue_jira_pushes([new_bug() for _ in range(50)])
+
+    measure("claim_jira_outbox_batch (50)", "claim_jira_outbox_batch",
+            lambda _: models.claim_jira_outbox_batch(50), setup=claimable)
+
+    def claimed():
+        claimable()
+        return models.claim_jira_outbox_batch(50)
+
+    measure("complete_jira_pushes (50)", "complete_jira_pushes",
+            lambda bugs: models.complete_jira_pushes([
+                {"bug_id": bug['id'], "issue_key": f"B-{bug['id']}", "issue_url": "u"} for bug in bugs
+            ]), setup=claimed)
+    measure("fail_jira_push", "fail_jira_push",
+            lambda bugs: models.fail_jira_push(bugs[0]['id'], "hata", retry_in_seconds=60), setup=claimed)
+    measure("claim_jira_outbox_batch (süresi dolmuş kilit, 50)", "claim_jira_outbox_batch",
+            lambda _: models.claim_jira_outbox_batch(50, lease_seconds=0), setup=claimed)
+
+    # Silmeler (her ölçüm için küçük bir veri seti hazırlanır)
+    def small_project():
+        new_project_id = models.create_project(unique("Silinecek"), "", "")
+        models.create_test_scenarios_bulk(new_project_id, [
+            {"title": unique("S"), "description": "d", "steps": ["a"], "priority": "low"} for _ in range(20)
+        ])
+        return new_project_id
+
+    measure("delete_project (20 scenarios)", "delete_project",
+            lambda new_project_id: models.delete_project(new_project_id), setup=small_project)
+    measure("delete_test_scenario", "delete_test_scenario",
+            lambda new_scenario_id: models.delete_test_scenario(new_scenario_id),
+            setup=lambda: models.create_test_scenario(project_id, unique("Silinecek"), "d", ["a"]))
+
+    public = {
+        name for name, member in inspect.getmembers(models, inspect.isfunction)
+        if member.__module__ == models.__name__ and not name.startswith("_")
+    }
+    return sorted(public - covered)
+
+
+def compare(current, baseline, threshold, metric="median_ms"):
+    """Süresi (metric) baseline'a göre threshold oranından fazla artan ölçümleri döndür"""
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        delta = result[metric] - base[metric]
+        ratio = result[metric] / base[metric] if base[metric] else float("inf")
+        if ratio > 1 + threshold and delta > MIN_DELTA_MS:
+            regressions.append({
+                "name": name,
+                "baseline_ms": base[metric],
+                "current_ms": result[metric],
+                "ratio": round(ratio, 2)
+            })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SmartQA veri katmanı benchmark'ı")
+    parser.add_argument("--projects", type=int, default=5)
+    parser.add_argument("--scenarios", type=int, default=200, help="Proje başına senaryo")
+    parser.add_argument("--executions", type=int, default=20, help="Senaryo başına execution")
+    parser.add_argument("--bug-ratio", type=float, default=0.5, help="Bug açılan başarısız execution oranı")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--baseline", help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument("--threshold", type=float, default=0.25, help="İzin verilen yavaşlama oranı")
+    parser.add_argument("--metric", choices=["median_ms", "min_ms", "p95_ms"], default="median_ms",
+                        help="Karşılaştırmada kullanılan ölçü (gürültülü makinelerde min_ms daha kararlıdır)")
+    args = parser.parse_args()
+
+    # Database modülleri yüklenmeden önce geçici veritabanını seç
+    work_dir = tempfile.mkdtemp(prefix="smartqa_bench_")
+    os.environ["SMARTQA_DB_PATH"] = os.path.join(work_dir, "bench.db")
+
+    try:
+        from database import models
+        from database.db import db_connection, close_all_connections
+        from database.cache import invalidate_cache
+        from database.queries import find_plan_regressions
+
+        started = time.perf_counter()
+        with db_connection() as conn:
+            counts = generate_dataset(
+                conn, args.projects, args.scenarios, args.executions, args.bug_ratio, args.seed
+            )
+            conn.execute("PRAGMA optimize")
+        generation_seconds = time.perf_counter() - started
+
+        # Sıcak sorguların planları gerçek veri dağılımıyla kontrol edilir
+        with db_connection() as conn:
+            plan_regressions = find_plan_regressions(conn)
+
+        runner = Runner(args.repeat, invalidate_cache)
+        uncovered = run_benchmarks(models, runner)
+        close_all_connections()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    current = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "params": {key: value for key, value in vars(args).items()
+                       if key not in ("output", "baseline", "threshold", "metric")},
+            "dataset": counts,
+            "generation_seconds": round(generation_seconds, 2),
+            "uncovered_functions": uncovered,
+            "plan_regressions": plan_regressions
+        },
+        "results": runner.results
+    }
+
+    output = json.dumps(current, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+
+    width = max(len(name) for name in runner.results)
+    for name, result in runner.results.items():
+        print(f"{name:<{width}}  {result['median_ms']:>10.3f} ms  (p95 {result['p95_ms']:.3f})")
+    if uncovered:
+        print(f"\n⚠️ Ölçülmeyen fonksiyonlar: {', '.join(uncovered)}")
+
+    if plan_regressions:
+        print(f"\n❌ {len(plan_regressions)} sıcak sorgu beklenen index'i kullanmıyor:")
+        for item in plan_regressions:
+            print(f"  {item['query']} (beklenen {item['expected_index']}): {item['plan']}")
+        return 1
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"]["params"] != current["meta"]["params"]:
+            print("\n⚠️ Baseline farklı parametrelerle üretilmiş; karşılaştırma yanıltıcı olabilir.")
+        regressions = compare(current, baseline, args.threshold, args.metric)
+        if regressions:
+            print(f"\n❌ {len(regressions)} ölçüm %{args.threshold * 100:.0f} eşiğinden fazla yavaşladı:")
+            for item in regressions:
+                print(f"  {item['name']}: {item['baseline_ms']} → {item['current_ms']} ms (x{item['ratio']})")
+            return 1
+        print(f"\n✅ Baseline'a göre %{args.threshold * 100:.0f} eşiğini aşan yavaşlama yok.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
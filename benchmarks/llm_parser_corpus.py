@@ -0,0 +1,148 @@
+"""
+LLM parser için fuzz/benchmark korpusu
+
+Mock senaryolardan tohumlu (seed) rastgele bozulmalarla yanıtlar üretir: code fence,
+kapanmamış fence, açıklama metni, sondaki virgüller, anahtarsız dizi, metin olarak
+gelen adımlar ve rastgele noktadan kesilme. Her yanıt hem tek seferde hem rastgele
+parçalara bölünerek akış halinde parse edilir; kurtarılan senaryo sayısı beklenenden
+azsa vaka başarısız sayılır.
+
+Kullanım:
+    python -m benchmarks.llm_parser_corpus --cases 1000 --seed 42 --output parser.json
+"""
+import sys
+import json
+import time
+import random
+import argparse
+from services.claude_service import MOCK_SCENARIOS
+from services.llm_parser import IncrementalScenarioParser, extract_scenarios, parse_bug_report
+
+MUTATIONS = ("fence", "open_fence", "prose", "trailing_commas", "bare_array", "string_steps", "truncate")
+
+
+def build_case(rng):
+    """Rastgele bozulmalarla bir yanıt üret; (metin, beklenen_senaryo_sayısı, bozulmalar) döndürür"""
+    mutations = {name for name in MUTATIONS if rng.random() < 0.35}
+    count = rng.randint(1, len(MOCK_SCENARIOS))
+    scenarios = rng.sample(MOCK_SCENARIOS, count)
+
+    objects = []
+    for scenario in scenarios:
+        scenario = dict(scenario)
+        if "string_steps" in mutations:
+            scenario["steps"] = "\n".join(f"{i}. {step}" for i, step in enumerate(scenario["steps"], 1))
+        text = json.dumps(scenario, ensure_ascii=False, indent=rng.choice([None, 2]))
+        if "trailing_commas" in mutations:
+            text = text[:-1].rstrip() + ",\n}"
+        objects.append(text)
+
+    text = "" if "bare_array" in mutations else '{\n  "test_scenarios": '
+    text += "["
+    ends = []
+    for index, obj in enumerate(objects):
+        if index:
+            text += ",\n"
+        text += obj
+        ends.append(len(text))
+    text += ",\n]" if "trailing_commas" in mutations else "]"
+    if "bare_array" not in mutations:
+        text += "\n}"
+
+    if "fence" in mutations or "open_fence" in mutations:
+        text = "```json\n" + text + ("" if "open_fence" in mutations else "\n```")
+        ends = [end + len("```json\n") for end in ends]
+    if "prose" in mutations and "bare_array" not in mutations:
+        prefix = "İşte istediğiniz test senaryoları:\n\n"
+        text = prefix + text + "\n\nBaşka bir şey gerekirse söyleyin."
+        ends = [end + len(prefix) for end in ends]
+
+    expected = count
+    if "truncate" in mutations:
+        cut = rng.randint(1, len(text))
+        text = text[:cut]
+        expected = sum(1 for end in ends if end <= cut)
+
+    return text, expected, sorted(mutations)
+
+
+def _stream(text, rng):
+    parser = IncrementalScenarioParser()
+    scenarios = []
+    index = 0
+    while index < len(text):
+        size = rng.randint(1, 64)
+        scenarios += parser.feed(text[index:index + size])
+        index += size
+    return scenarios + parser.finish()
+
+
+def run(cases=1000, seed=42):
+    """Korpusu çalıştır ve sonuçları sözlük olarak döndür"""
+    rng = random.Random(seed)
+    corpus = [build_case(rng) for _ in range(cases)]
+    failures = []
+    total_bytes = sum(len(text.encode("utf-8")) for text, _, _ in corpus)
+
+    started = time.perf_counter()
+    for index, (text, expected, mutations) in enumerate(corpus):
+        recovered = len(extract_scenarios(text)['scenarios'])
+        # finish() kesik son objeyi kurtarabileceği için en fazla bir fazlası kabul edilir
+        if not expected <= recovered <= expected + 1:
+            failures.append({'case': index, 'mode': 'full', 'mutations': mutations,
+                             'expected': expected, 'recovered': recovered})
+    full_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for index, (text, expected, mutations) in enumerate(corpus):
+        recovered = len(_stream(text, rng))
+        if not expected <= recovered <= expected + 1:
+            failures.append({'case': index, 'mode': 'stream', 'mutations': mutations,
+                             'expected': expected, 'recovered': recovered})
+    stream_elapsed = time.perf_counter() - started
+
+    # Bug raporu: fence, açıklama metni, sondaki virgül ve kesilme
+    bug_report = {
+        "title": "Login butonu çalışmıyor", "severity": "High", "description": "Açıklama",
+        "steps_to_reproduce": "1. Adım", "expected_result": "Giriş", "actual_result": "Hata"
+    }
+    bug_cases = [
+        json.dumps(bug_report, ensure_ascii=False),
+        "```json\n" + json.dumps(bug_report, ensure_ascii=False, indent=2) + "\n```",
+        "Rapor:\n```json\n" + json.dumps(bug_report, ensure_ascii=False)[:-1] + ",}",
+        json.dumps(bug_report, ensure_ascii=False) + "\n\nNot: rapor hazır.",
+        json.dumps(bug_report, ensure_ascii=False)[:-6]
+    ]
+    for index, text in enumerate(bug_cases):
+        try:
+            parse_bug_report(text)
+        except ValueError as e:
+            failures.append({'case': index, 'mode': 'bug_report', 'error': str(e)})
+
+    return {
+        'cases': cases,
+        'seed': seed,
+        'failures': failures,
+        'full_parse_mb_per_s': round(total_bytes / full_elapsed / 1e6, 2),
+        'stream_parse_mb_per_s': round(total_bytes / stream_elapsed / 1e6, 2)
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="LLM parser fuzz/benchmark korpusu")
+    arg_parser.add_argument("--cases", type=int, default=1000)
+    arg_parser.add_argument("--seed", type=int, default=42)
+    arg_parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    args = arg_parser.parse_args()
+
+    results = run(args.cases, args.seed)
+    output = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+    return 1 if results['failures'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
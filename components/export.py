@@ -0,0 +1,81 @@
+import streamlit as st
+from datetime import date, timedelta
+from database.models import get_all_projects
+from services.export_service import EXPORT_DATASETS, EXPORT_FORMATS, build_export
+
+def export_panel(key, datasets, project_id=None):
+    """
+    Dışa aktarma panelini çiz.
+
+    Dosya yalnızca "Hazırla" butonuna basıldığı rerun'da oluşturulur ve indirme
+    butonu o rerun'da gösterilir; sonuç session state'te tutulmaz. project_id
+    verilirse proje seçimi gösterilmez.
+    """
+    with st.expander("📦 Dışa Aktar", expanded=False):
+        col_dataset, col_format = st.columns(2)
+
+        with col_dataset:
+            dataset = st.radio(
+                "Veri",
+                options=datasets,
+                format_func=lambda x: EXPORT_DATASETS[x]['label'],
+                horizontal=True,
+                key=f"{key}_dataset"
+            )
+
+        with col_format:
+            export_format = st.radio(
+                "Format",
+                options=EXPORT_DATASETS[dataset]['formats'],
+                format_func=lambda x: EXPORT_FORMATS[x]['label'],
+                horizontal=True,
+                key=f"{key}_format_{dataset}"
+            )
+
+        col_project, col_dates = st.columns(2)
+
+        with col_project:
+            if project_id is None:
+                projects = {"🌐 Tüm Projeler": None}
+                projects.update({f"📁 {p['name']} (ID: {p['id']})": p['id'] for p in get_all_projects()})
+                project_name = st.selectbox("Proje", options=list(projects.keys()), key=f"{key}_project")
+                export_project_id = projects[project_name]
+            else:
+                export_project_id = project_id
+
+        with col_dates:
+            use_dates = st.checkbox("📅 Tarih aralığı uygula", key=f"{key}_use_dates")
+            since = until = None
+            if use_dates:
+                today = date.today()
+                date_range = st.date_input(
+                    "Tarih aralığı",
+                    value=(today - timedelta(days=30), today),
+                    key=f"{key}_dates"
+                )
+                # Aralığın yalnızca başı seçiliyken tek elemanlı tuple döner
+                if len(date_range) == 2:
+                    since, until = date_range
+                elif len(date_range) == 1:
+                    since = date_range[0]
+
+        if st.button("📦 Dosyayı Hazırla", key=f"{key}_build", type="primary"):
+            with st.spinner("Dışa aktarma dosyası hazırlanıyor..."):
+                result = build_export(dataset, export_format, export_project_id, since, until)
+
+            if isinstance(result, str):
+                st.error(f"❌ {result}")
+            elif result['row_count'] == 0:
+                result['file'].close()
+                st.info("📭 Seçilen filtrelere uyan kayıt yok.")
+            else:
+                st.success(f"✅ {result['row_count']} kayıt hazır.")
+                # Streamlit indirme dosyasını bytes olarak ister; dosya ancak burada tek parça okunur
+                with result['file']:
+                    st.download_button(
+                        label=f"⬇️ {result['file_name']} İndir",
+                        data=result['file'].read(),
+                        file_name=result['file_name'],
+                        mime=result['mime'],
+                        key=f"{key}_download"
+                    )
@@ -0,0 +1,87 @@
+import streamlit as st
+from database.models import get_scenarios_by_project, get_scenarios_by_health
+from components.pagination import keyset_paginator
+
+# Bu skorun üzerindeki senaryolar flaky kabul edilir
+FLAKY_THRESHOLD = 0.3
+
+SORT_OPTIONS = {
+    "created_at": "🕒 En yeni",
+    "flakiness_score": "🎲 En kararsız (flakiness)",
+    "flip_count": "🔁 En çok pass↔fail geçişi"
+}
+
+def scenario_list(key, project_id, paginate=True):
+    """
+    Sıralama/filtre kontrollerini çiz ve seçime göre sayfalanmış senaryoları döndür.
+    Sağlık sıralaması ve filtreleri scenario_health tablosundan okunur; bu modlarda
+    yalnızca en az bir kez çalıştırılmış senaryolar listelenir.
+    paginate=False ise filtreye uyan tüm senaryolar sayfalama olmadan döner.
+    """
+    col_sort, col_flaky, col_rate = st.columns([2, 1, 2])
+
+    with col_sort:
+        order_column = st.selectbox(
+            "↕️ Sıralama",
+            options=list(SORT_OPTIONS.keys()),
+            format_func=lambda x: SORT_OPTIONS[x],
+            key=f"{key}_order"
+        )
+
+    with col_flaky:
+        st.markdown("")
+        only_flaky = st.checkbox(f"Sadece flaky (≥ {FLAKY_THRESHOLD})", key=f"{key}_only_flaky")
+
+    with col_rate:
+        max_pass_rate = st.slider(
+            "En fazla başarı oranı (%)",
+            min_value=0,
+            max_value=100,
+            value=100,
+            step=5,
+            key=f"{key}_max_pass_rate",
+            help="Son çalıştırmalardaki başarı oranı bu değerin altında olan senaryolar"
+        )
+
+    min_flakiness = FLAKY_THRESHOLD if only_flaky else None
+    pass_rate_limit = max_pass_rate / 100 if max_pass_rate < 100 else None
+
+    if order_column == "created_at" and min_flakiness is None and pass_rate_limit is None:
+        fetch_page = lambda limit, cursor: get_scenarios_by_project(project_id, limit=limit, cursor=cursor)
+        if not paginate:
+            return fetch_page(None, None)
+        return keyset_paginator(key, fetch_page)
+
+    if order_column == "created_at":
+        order_column = "flakiness_score"
+    st.caption("ℹ️ Sağlık sıralamasında yalnızca en az bir kez çalıştırılmış senaryolar listelenir.")
+
+    fetch_page = lambda limit, cursor: get_scenarios_by_health(
+        project_id, order_column, limit=limit, cursor=cursor,
+        min_flakiness=min_flakiness, max_pass_rate=pass_rate_limit
+    )
+    if not paginate:
+        return fetch_page(None, None)
+
+    # Filtre değişince sayfalama baştan başlasın
+    return keyset_paginator(
+        f"{key}_{order_column}_{min_flakiness}_{pass_rate_limit}",
+        fetch_page,
+        order_column=order_column
+    )
+
+def health_caption(health):
+    """Senaryonun sağlık özetini tek satır olarak göster"""
+    if health is None:
+        st.caption("🩺 Henüz çalıştırılmadı")
+        return
+
+    parts = [f"🎲 Flakiness: {health['flakiness_score']:.2f}"]
+    if health['pass_rate'] is not None:
+        window = len(health['recent_results'])
+        parts.append(f"✅ Başarı: %{health['pass_rate'] * 100:.0f} (son {window})")
+    parts.append(f"🔁 {health['flip_count']} geçiş")
+    parts.append(f"Son: {health['last_status'].upper()}")
+
+    prefix = "⚠️ **Flaky** · " if health['flakiness_score'] >= FLAKY_THRESHOLD else "🩺 "
+    st.caption(prefix + " · ".join(parts))
@@ -0,0 +1,55 @@
+import streamlit as st
+
+PAGE_SIZE_OPTIONS = [10, 25, 50, 100, 200]
+
+def keyset_paginator(key, fetch_page, order_column="created_at", default_page_size=25):
+    """
+    Keyset (cursor) sayfalama kontrollerini çiz ve mevcut sayfanın satırlarını döndür.
+
+    fetch_page(limit, cursor) çağrısı yeniden eskiye sıralı satırlar döndürmelidir.
+    Her sayfanın başlangıç cursor'ı session state'te tutulur; böylece geri gitmek
+    için OFFSET gerekmez ve her rerun en fazla bir sayfa okur.
+    """
+    cursors_key = f"{key}_cursors"
+    size_key = f"{key}_page_size"
+
+    if cursors_key not in st.session_state:
+        st.session_state[cursors_key] = [None]
+    cursors = st.session_state[cursors_key]
+
+    def reset_pages():
+        st.session_state[cursors_key] = [None]
+
+    col_prev, col_info, col_next, col_size = st.columns([1, 2, 1, 1])
+
+    with col_size:
+        page_size = st.selectbox(
+            "Sayfa başına",
+            options=PAGE_SIZE_OPTIONS,
+            index=PAGE_SIZE_OPTIONS.index(default_page_size),
+            key=size_key,
+            on_change=reset_pages
+        )
+
+    # Sonraki sayfa var mı anlamak için bir satır fazla oku
+    rows = fetch_page(page_size + 1, cursors[-1])
+    has_next = len(rows) > page_size
+    rows = rows[:page_size]
+
+    def go_next():
+        last = rows[-1]
+        st.session_state[cursors_key].append((last[order_column], last['id']))
+
+    def go_prev():
+        st.session_state[cursors_key].pop()
+
+    with col_prev:
+        st.button("⬅️ Önceki", key=f"{key}_prev", disabled=len(cursors) == 1, on_click=go_prev)
+
+    with col_info:
+        st.caption(f"📄 Sayfa {len(cursors)}")
+
+    with col_next:
+        st.button("Sonraki ➡️", key=f"{key}_next", disabled=not has_next, on_click=go_next)
+
+    return rows
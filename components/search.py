@@ -0,0 +1,33 @@
+import streamlit as st
+from database.models import search
+
+KIND_LABELS = {
+    "scenario": "📝 Senaryo",
+    "execution": "✅ Çalıştırma",
+    "bug": "🐛 Bug"
+}
+
+def search_panel(key, project_id, kinds, placeholder="Başlık, adım, not veya açıklamada ara..."):
+    """
+    Arama kutusunu çiz; sorgu girilmişse FTS index'inden gelen sonuçları göster.
+    Arama aktifse True döner, böylece sayfa normal listeyi çizmeyebilir.
+    """
+    query = st.text_input("🔍 Ara", key=f"{key}_query", placeholder=placeholder)
+
+    if not query.strip():
+        return False
+
+    results = search(project_id, query, kinds=kinds, limit=50)
+
+    if len(results) == 0:
+        st.info("🔍 Aramanızla eşleşen sonuç bulunamadı.")
+        return True
+
+    st.caption(f"🔍 {len(results)} sonuç (en alakalı önce)")
+
+    for result in results:
+        st.markdown(f"{KIND_LABELS.get(result['kind'], result['kind'])} **{result['title']}** · ID: {result['ref_id']}")
+        st.caption(result['snippet'])
+
+    st.markdown("---")
+    return True
@@ -0,0 +1,39 @@
+import os
+import streamlit as st
+from database.profiler import enable_capture, take_captured, summarize, get_query_stats
+
+PANEL_ENABLED = os.getenv("SMARTQA_SQL_PROFILE_PANEL", "0") == "1"
+
+if PANEL_ENABLED:
+    enable_capture()
+
+def _stats_table(groups):
+    return [
+        {
+            "Sorgu": group["sql"],
+            "Adet": group["count"],
+            "Toplam ms": round(group["total_ms"], 2),
+            "En uzun ms": round(group["max_ms"], 2),
+            "Satır": group["rows"],
+            "Çağıran": ", ".join(group["callers"])
+        }
+        for group in groups
+    ]
+
+def sql_profiler_panel():
+    """
+    Bu rerun'da çalışan sorguları sidebar'da listele.
+    Sayfanın en sonunda çağrılmalıdır; SMARTQA_SQL_PROFILE_PANEL=1 değilse hiçbir şey çizmez.
+    """
+    records = take_captured()
+    if not PANEL_ENABLED:
+        return
+
+    with st.sidebar.expander("🧪 SQL Profiler"):
+        total_ms = sum(record["ms"] for record in records)
+        st.caption(f"Bu sayfa: {len(records)} sorgu · {total_ms:.1f} ms")
+        if records:
+            st.dataframe(_stats_table(summarize(records)), use_container_width=True, hide_index=True)
+
+        if st.checkbox("Process geneli (son sorgular)", key="sql_profiler_global"):
+            st.dataframe(_stats_table(get_query_stats()), use_container_width=True, hide_index=True)
@@ -0,0 +1,122 @@
+"""
+Model okuma fonksiyonları için LRU sorgu önbelleği
+
+Okuma fonksiyonları @cached_query ile, yazma fonksiyonları @invalidates_cache
+ile işaretlenir. Aynı veritabanını kullanan başka process'lerin yazmaları
+PRAGMA data_version ile fark edilir: bu değer, izleyici bağlantı dışındaki
+herhangi bir bağlantı commit yaptığında değişir.
+"""
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from functools import wraps
+from database import db
+
+CACHE_MAX_ENTRIES = int(os.getenv("SMARTQA_QUERY_CACHE_SIZE", "256"))
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+_state = {
+    'watch_conn': None,
+    'watch_path': None,
+    'data_version': None,
+    'generation': 0,
+    'hits': 0,
+    'misses': 0
+}
+
+def _freeze(value):
+    """Liste/sözlük argümanları önbellek anahtarı için hashlenebilir hale getir"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+def _clear_locked():
+    _cache.clear()
+    _state['generation'] += 1
+
+def _check_data_version_locked():
+    """Başka bir bağlantı commit yaptıysa önbelleği temizle"""
+    conn = _state['watch_conn']
+    if conn is None or _state['watch_path'] != db.DATABASE_PATH:
+        if conn is not None:
+            conn.close()
+        conn = sqlite3.connect(db.DATABASE_PATH, check_same_thread=False)
+        _state['watch_conn'] = conn
+        _state['watch_path'] = db.DATABASE_PATH
+        _state['data_version'] = None
+
+    data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+    if data_version != _state['data_version']:
+        _state['data_version'] = data_version
+        _clear_locked()
+
+def _copy(result):
+    """Çağıranın değiştirebileceği liste/sözlük sonuçlarının kopyasını ver"""
+    if isinstance(result, list):
+        return list(result)
+    if isinstance(result, dict):
+        return dict(result)
+    return result
+
+def cached_query(func):
+    """Okuma fonksiyonunun sonucunu fonksiyon adı ve argümanlara göre önbellekle"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            key = (func.__name__, _freeze(args), _freeze(kwargs))
+            hash(key)
+        except TypeError:
+            return func(*args, **kwargs)
+
+        with _lock:
+            _check_data_version_locked()
+            if key in _cache:
+                _cache.move_to_end(key)
+                _state['hits'] += 1
+                return _copy(_cache[key])
+            _state['misses'] += 1
+            generation = _state['generation']
+
+        result = func(*args, **kwargs)
+
+        with _lock:
+            # Okuma sırasında önbellek temizlendiyse eski olabilecek sonucu saklama
+            if generation == _state['generation']:
+                _cache[key] = result
+                _cache.move_to_end(key)
+                while len(_cache) > CACHE_MAX_ENTRIES:
+                    _cache.popitem(last=False)
+
+        return _copy(result)
+
+    return wrapper
+
+def invalidates_cache(func):
+    """Yazma fonksiyonu tamamlandıktan sonra önbelleği temizle"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            invalidate_cache()
+
+    return wrapper
+
+def invalidate_cache():
+    """Tüm önbelleği temizle"""
+    with _lock:
+        _clear_locked()
+
+def get_cache_stats():
+    """Önbellek isabet/ıskalama sayıları ve boyutu"""
+    with _lock:
+        return {
+            'hits': _state['hits'],
+            'misses': _state['misses'],
+            'size': len(_cache),
+            'max_size': CACHE_MAX_ENTRIES
+        }
@@ -1,81 +1,160 @@
 import sqlite3
+import threading
+import queue
+from contextlib import contextmanager
 from datetime import datetime
 import os
+from database.migrations import apply_migrations
+from database.profiler import PROFILE_ENABLED, ProfiledConnection
 
-DATABASE_PATH = "database/smartqa.db"
+DATABASE_PATH = os.getenv("SMARTQA_DB_PATH", "database/smartqa.db")
+
+# Bağlantı havuzu ayarları
+POOL_SIZE = int(os.getenv("SMARTQA_DB_POOL_SIZE", "8"))
+BUSY_TIMEOUT_MS = 30000
+
+# Her yeni bağlantıda uygulanan PRAGMA'lar
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",        # Okuyucular yazıcıyı bloklamaz
+    "PRAGMA synchronous = NORMAL",      # WAL ile güvenli, commit başına fsync yok
+    "PRAGMA foreign_keys = ON",
+    f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}",
+    "PRAGMA cache_size = -16000",       # ~16 MB sayfa önbelleği
+    "PRAGMA mmap_size = 134217728",     # 128 MB memory-mapped I/O
+    "PRAGMA temp_store = MEMORY",
+)
+
+# Boştaki bağlantılar (en son kullanılan önce verilir)
+_pool = queue.LifoQueue(maxsize=POOL_SIZE)
+# Thread'in o an kullandığı bağlantı (iç içe kullanım için)
+_local = threading.local()
 
 def get_connection():
-    """SQLite bağlantısı oluştur"""
-    conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False)
+    """Yeni, ayarlanmış bir SQLite bağlantısı oluştur"""
+    conn = sqlite3.connect(
+        DATABASE_PATH,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False,
+        # Sorgu süreleri, satır sayıları ve yavaş sorgu logu için
+        factory=ProfiledConnection if PROFILE_ENABLED else sqlite3.Connection
+    )
     conn.row_factory = sqlite3.Row  # Dict gibi erişim için
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
     return conn
 
+def _acquire_connection():
+    """Havuzdan bağlantı al, havuz boşsa yenisini aç"""
+    try:
+        return _pool.get_nowait()
+    except queue.Empty:
+        return get_connection()
+
+def _release_connection(conn):
+    """Bağlantıyı havuza geri koy, havuz doluysa kapat"""
+    try:
+        _pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
+@contextmanager
+def db_connection():
+    """
+    Havuzdan bağlantı ver; blok hatasız biterse commit, hata olursa rollback yap.
+    Aynı thread içindeki iç içe kullanımlar aynı bağlantıyı ve transaction'ı paylaşır.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        yield conn
+        return
+
+    conn = _acquire_connection()
+    _local.conn = conn
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        _local.conn = None
+        _release_connection(conn)
+
+def close_all_connections():
+    """Havuzdaki tüm bağlantıları kapat"""
+    while True:
+        try:
+            _pool.get_nowait().close()
+        except queue.Empty:
+            break
+
 def init_database():
     """Database tablolarını oluştur"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Projects tablosu
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS projects (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            url TEXT,
-            description TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Test Scenarios tablosu
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS test_scenarios (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            project_id INTEGER NOT NULL,
-            title TEXT NOT NULL,
-            description TEXT,
-            steps TEXT,  -- JSON formatında
-            priority TEXT DEFAULT 'medium',  -- low, medium, high
-            status TEXT DEFAULT 'active',  -- draft, active, archived
-            created_by_ai BOOLEAN DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (project_id) REFERENCES projects (id)
-        )
-    ''')
-    
-    # Test Executions tablosu
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS test_executions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            scenario_id INTEGER NOT NULL,
-            status TEXT NOT NULL,  -- pass, fail, blocked, skipped
-            executed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            notes TEXT,
-            FOREIGN KEY (scenario_id) REFERENCES test_scenarios (id)
-        )
-    ''')
-    
-    # Bug Reports tablosu
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS bug_reports (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            execution_id INTEGER NOT NULL,
-            title TEXT NOT NULL,
-            severity TEXT DEFAULT 'medium',  -- low, medium, high, critical
-            description TEXT,
-            steps_to_reproduce TEXT,
-            expected_result TEXT,
-            actual_result TEXT,
-            ai_generated BOOLEAN DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (execution_id) REFERENCES test_executions (id)
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+    with db_connection() as conn:
+        cursor = conn.cursor()
+
+        # Projects tablosu
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS projects (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                url TEXT,
+                description TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        # Test Scenarios tablosu
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS test_scenarios (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                project_id INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                description TEXT,
+                steps TEXT,  -- JSON formatında
+                priority TEXT DEFAULT 'medium',  -- low, medium, high
+                status TEXT DEFAULT 'active',  -- draft, active, archived
+                created_by_ai BOOLEAN DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (project_id) REFERENCES projects (id)
+            )
+        ''')
+
+        # Test Executions tablosu
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS test_executions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                scenario_id INTEGER NOT NULL,
+                status TEXT NOT NULL,  -- pass, fail, blocked, skipped
+                executed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                notes TEXT,
+                FOREIGN KEY (scenario_id) REFERENCES test_scenarios (id)
+            )
+        ''')
+
+        # Bug Reports tablosu
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS bug_reports (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                execution_id INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                severity TEXT DEFAULT 'medium',  -- low, medium, high, critical
+                description TEXT,
+                steps_to_reproduce TEXT,
+                expected_result TEXT,
+                actual_result TEXT,
+                ai_generated BOOLEAN DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (execution_id) REFERENCES test_executions (id)
+            )
+        ''')
+
+        # Index'ler ve sonraki şema değişiklikleri
+        apply_migrations(conn)
+
     print("✅ Database başarıyla oluşturuldu!")
 
 # İlk çalıştırmada database'i oluştur
 if not os.path.exists(DATABASE_PATH):
-    os.makedirs("database", exist_ok=True)
-    init_database()
\ No newline at end of file
+    os.makedirs(os.path.dirname(DATABASE_PATH) or ".", exist_ok=True)
+    init_database()
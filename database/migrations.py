@@ -0,0 +1,578 @@
+"""
+Sıralı şema migration'ları
+
+Her migration (versiyon, açıklama, adımlar) şeklinde tanımlanır. Adımlar SQL
+cümlesi ya da bağlantıyı parametre alan bir fonksiyon olabilir. Uygulanan
+versiyonlar schema_version tablosunda tutulur.
+"""
+import json
+from functools import partial
+
+def rebuild_stats_counters(conn):
+    """stats_counters tablosunu mevcut verilerden yeniden hesapla"""
+    conn.execute("DELETE FROM stats_counters")
+    conn.execute('''
+        INSERT INTO stats_counters (project_id, name, value)
+        SELECT 0, 'projects', COUNT(*) FROM projects
+        UNION ALL
+        SELECT 0, 'scenarios', COUNT(*) FROM test_scenarios
+        UNION ALL
+        SELECT 0, 'executions', COUNT(*) FROM test_executions
+        UNION ALL
+        SELECT 0, 'passed_executions', COUNT(*) FROM test_executions WHERE status = 'pass'
+        UNION ALL
+        SELECT 0, 'bugs', COUNT(*) FROM bug_reports
+        UNION ALL
+        SELECT project_id, 'scenarios', COUNT(*) FROM test_scenarios GROUP BY project_id
+        UNION ALL
+        SELECT s.project_id, 'executions', COUNT(*)
+        FROM test_executions e JOIN test_scenarios s ON s.id = e.scenario_id
+        GROUP BY s.project_id
+        UNION ALL
+        SELECT s.project_id, 'passed_executions', COUNT(*)
+        FROM test_executions e JOIN test_scenarios s ON s.id = e.scenario_id
+        WHERE e.status = 'pass'
+        GROUP BY s.project_id
+        UNION ALL
+        SELECT s.project_id, 'bugs', COUNT(*)
+        FROM bug_reports b
+        JOIN test_executions e ON e.id = b.execution_id
+        JOIN test_scenarios s ON s.id = e.scenario_id
+        GROUP BY s.project_id
+    ''')
+
+def _counter_trigger(name, event, table, counter, delta, project_expr, when=None):
+    """
+    Bir sayaç için hem genel (project_id = 0) hem proje satırını güncelleyen trigger.
+    Projesi bulunamayan eski kayıtlar project_id = -1 altında sayılır.
+    """
+    when_clause = f"WHEN {when}" if when else ""
+    return f'''
+        CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON {table}
+        {when_clause}
+        BEGIN
+            INSERT INTO stats_counters (project_id, name, value)
+            VALUES (0, '{counter}', {delta}), (COALESCE(({project_expr}), -1), '{counter}', {delta})
+            ON CONFLICT (project_id, name) DO UPDATE SET value = value + excluded.value;
+        END
+    '''
+
+_EXECUTION_PROJECT = "SELECT project_id FROM test_scenarios WHERE id = {row}.scenario_id"
+_BUG_PROJECT = '''SELECT s.project_id FROM test_executions e
+                  JOIN test_scenarios s ON s.id = e.scenario_id
+                  WHERE e.id = {row}.execution_id'''
+
+# search_index rowid'si = kaynak id * 4 + tür kodu; güncelleme/silme rowid ile O(log n)
+SEARCH_KIND_CODES = {'scenario': 1, 'execution': 2, 'bug': 3}
+
+# Migration 3'teki hali: adımlar test_scenarios.steps JSON kolonundaydı
+_LEGACY_SCENARIO_DOC = "'scenario', {row}.id, {row}.project_id, {row}.title, " \
+                       "COALESCE({row}.description, '') || ' ' || COALESCE({row}.steps, '')"
+_SCENARIO_DOC = "'scenario', {row}.id, {row}.project_id, {row}.title, " \
+                "COALESCE({row}.description, '') || ' ' || COALESCE((SELECT group_concat(text, ' ') " \
+                "FROM scenario_steps WHERE scenario_id = {row}.id), '')"
+_EXECUTION_DOC = "'execution', {row}.id, " \
+                 "(SELECT project_id FROM test_scenarios WHERE id = {row}.scenario_id), " \
+                 "(SELECT title FROM test_scenarios WHERE id = {row}.scenario_id), {row}.notes"
+_BUG_DOC = "'bug', {row}.id, (" + _BUG_PROJECT + "), {row}.title, " \
+           "COALESCE({row}.description, '') || ' ' || COALESCE({row}.steps_to_reproduce, '') || ' ' || " \
+           "COALESCE({row}.expected_result, '') || ' ' || COALESCE({row}.actual_result, '')"
+
+def _search_triggers(table, kind, document, when=None, columns=None):
+    """
+    Kaynak tabloyu search_index ile senkron tutan insert/update/delete trigger'ları.
+    columns verilirse update trigger'ı yalnızca bu kolonlar değiştiğinde çalışır.
+    """
+    code = SEARCH_KIND_CODES[kind]
+    update_of = f" OF {', '.join(columns)}" if columns else ""
+    insert_when = f"WHEN {when.format(row='NEW')}" if when else ""
+    insert_sql = (
+        "INSERT INTO search_index (rowid, kind, ref_id, project_id, title, body) "
+        f"SELECT NEW.id * 4 + {code}, {document.format(row='NEW')}"
+    )
+    delete_sql = f"DELETE FROM search_index WHERE rowid = OLD.id * 4 + {code}"
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_search_{table}_insert AFTER INSERT ON {table}
+        {insert_when}
+        BEGIN
+            {insert_sql};
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_search_{table}_update AFTER UPDATE{update_of} ON {table}
+        BEGIN
+            {delete_sql};
+            {insert_sql}{f" WHERE {when.format(row='NEW')}" if when else ""};
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_search_{table}_delete AFTER DELETE ON {table}
+        BEGIN
+            {delete_sql};
+        END
+        """,
+    ]
+
+def _scenario_steps_search_triggers():
+    """Adım eklenince/değişince/silinince senaryonun arama dokümanını yenileyen trigger'lar"""
+    code = SEARCH_KIND_CODES['scenario']
+    triggers = []
+    for event, row in (("INSERT", "NEW"), ("UPDATE OF text", "NEW"), ("DELETE", "OLD")):
+        name = event.split()[0].lower()
+        triggers.append(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_search_scenario_steps_{name} AFTER {event} ON scenario_steps
+        BEGIN
+            DELETE FROM search_index WHERE rowid = {row}.scenario_id * 4 + {code};
+            INSERT INTO search_index (rowid, kind, ref_id, project_id, title, body)
+            SELECT s.id * 4 + {code}, {_SCENARIO_DOC.format(row='s')}
+            FROM test_scenarios s WHERE s.id = {row}.scenario_id;
+        END
+        """)
+    return triggers
+
+def _parse_legacy_steps(steps):
+    """Eski JSON kolonundaki adımları listeye çevir; JSON olmayan metin tek adım sayılır"""
+    try:
+        parsed = json.loads(steps)
+    except (TypeError, ValueError):
+        parsed = steps
+    if not isinstance(parsed, list):
+        parsed = [parsed] if parsed else []
+    return [str(step).strip() for step in parsed if str(step).strip()]
+
+def migrate_scenario_steps(conn):
+    """test_scenarios.steps JSON kolonundaki adımları scenario_steps satırlarına taşı"""
+    rows = []
+    for scenario_id, steps in conn.execute("SELECT id, steps FROM test_scenarios"):
+        rows.extend(
+            (scenario_id, ordinal, text)
+            for ordinal, text in enumerate(_parse_legacy_steps(steps), 1)
+        )
+    conn.executemany(
+        "INSERT OR IGNORE INTO scenario_steps (scenario_id, ordinal, text) VALUES (?, ?, ?)",
+        rows
+    )
+
+# Flakiness için bakılan son pass/fail sonucu sayısı
+HEALTH_WINDOW = 20
+
+def _health_window_sql(window):
+    """Pencere metninden ('P'/'F' dizisi) başarı oranı ve flakiness skorunu hesaplayan ifadeler"""
+    flips = f"((length({window}) - length(replace({window}, 'PF', ''))) / 2 + " \
+            f"(length({window}) - length(replace({window}, 'FP', ''))) / 2)"
+    pass_rate = f"CASE WHEN length({window}) > 0 " \
+                f"THEN (length({window}) - length(replace({window}, 'P', ''))) * 1.0 / length({window}) END"
+    flakiness = f"CASE WHEN length({window}) > 1 THEN {flips} * 1.0 / (length({window}) - 1) ELSE 0 END"
+    return pass_rate, flakiness
+
+def _scenario_health_trigger():
+    """Her yeni execution'da senaryonun sağlık satırını geçmişi okumadan güncelleyen trigger"""
+    code = "CASE NEW.status WHEN 'pass' THEN 'P' WHEN 'fail' THEN 'F' ELSE '' END"
+    # UPDATE SET içindeki kolonlar eski değerleri gösterir; yeni pencere burada hesaplanır
+    window = f"substr(recent_results || {code}, -{HEALTH_WINDOW})"
+    insert_pass_rate, insert_flakiness = _health_window_sql(code)
+    pass_rate, flakiness = _health_window_sql(window)
+    return f'''
+        CREATE TRIGGER IF NOT EXISTS trg_scenario_health_insert AFTER INSERT ON test_executions
+        BEGIN
+            INSERT INTO scenario_health
+                (scenario_id, project_id, recent_results, run_count, pass_rate, flip_count,
+                 flakiness_score, last_status, last_executed_at)
+            SELECT NEW.scenario_id, project_id, {code}, 1, {insert_pass_rate}, 0,
+                   {insert_flakiness}, NEW.status, NEW.executed_at
+            FROM test_scenarios WHERE id = NEW.scenario_id
+            ON CONFLICT (scenario_id) DO UPDATE SET
+                recent_results = {window},
+                run_count = run_count + 1,
+                pass_rate = {pass_rate},
+                flip_count = flip_count + ({code} != '' AND substr(recent_results, -1) NOT IN ('', {code})),
+                flakiness_score = {flakiness},
+                last_status = NEW.status,
+                last_executed_at = NEW.executed_at;
+        END
+    '''
+
+def _window_stats(window):
+    """Trigger'daki hesapların Python karşılığı: (başarı oranı, flakiness skoru)"""
+    if not window:
+        return None, 0
+    flips = sum(1 for previous, current in zip(window, window[1:]) if previous != current)
+    return window.count("P") / len(window), (flips / (len(window) - 1) if len(window) > 1 else 0)
+
+def rebuild_scenario_health(conn):
+    """scenario_health tablosunu execution geçmişini baştan oynatarak yeniden hesapla"""
+    conn.execute("DELETE FROM scenario_health")
+    health = {}
+    rows = conn.execute('''
+        SELECT e.scenario_id, s.project_id, e.status, e.executed_at
+        FROM test_executions e JOIN test_scenarios s ON s.id = e.scenario_id
+        ORDER BY e.scenario_id, e.executed_at, e.id
+    ''')
+    for scenario_id, project_id, status, executed_at in rows:
+        item = health.setdefault(scenario_id, {
+            'project_id': project_id, 'window': "", 'runs': 0, 'flips': 0
+        })
+        code = {'pass': "P", 'fail': "F"}.get(status, "")
+        if code and item['window'] and item['window'][-1] != code:
+            item['flips'] += 1
+        item['window'] = (item['window'] + code)[-HEALTH_WINDOW:]
+        item['runs'] += 1
+        item['status'] = status
+        item['executed_at'] = executed_at
+
+    health_rows = []
+    for scenario_id, item in health.items():
+        pass_rate, flakiness = _window_stats(item['window'])
+        health_rows.append((
+            scenario_id, item['project_id'], item['window'], item['runs'], pass_rate,
+            item['flips'], flakiness, item['status'], item['executed_at']
+        ))
+    conn.executemany(
+        '''INSERT INTO scenario_health
+           (scenario_id, project_id, recent_results, run_count, pass_rate, flip_count,
+            flakiness_score, last_status, last_executed_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+        health_rows
+    )
+
+def _rollup_trigger(name, event, row, delta):
+    """Execution'ın gün/öncelik/durum hücresini hem genel (0) hem proje satırında güncelleyen trigger"""
+    select = f"date({row}.executed_at), COALESCE(priority, 'medium'), {row}.status, {delta} " \
+             f"FROM test_scenarios WHERE id = {row}.scenario_id"
+    return f'''
+        CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON test_executions
+        BEGIN
+            INSERT INTO execution_daily_rollups (project_id, day, priority, status, count)
+            SELECT 0, {select}
+            UNION ALL
+            SELECT project_id, {select}
+            ON CONFLICT (project_id, day, priority, status) DO UPDATE SET count = count + excluded.count;
+            {_rollup_cleanup(row) if delta < 0 else ""}
+        END
+    '''
+
+def _rollup_cleanup(row, priority=None):
+    """Azaltma sonrası sıfıra inen rollup hücrelerini silen SQL (proje silinince 0 satırı kalmasın)"""
+    priority_filter = f" AND priority = {priority}" if priority else ""
+    return f'''
+            DELETE FROM execution_daily_rollups
+            WHERE project_id IN (0, (SELECT project_id FROM test_scenarios WHERE id = {row}.scenario_id))
+              AND day = date({row}.executed_at) AND status = {row}.status{priority_filter} AND count <= 0;
+    '''
+
+def _rollup_priority_trigger():
+    """Öncelik değişince senaryonun geçmiş sayılarını yeni öncelik hücrelerine taşıyan trigger"""
+    return '''
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_scenarios_priority AFTER UPDATE OF priority ON test_scenarios
+        WHEN OLD.priority IS NOT NEW.priority
+        BEGIN
+            INSERT INTO execution_daily_rollups (project_id, day, priority, status, count)
+            SELECT target.project_id, history.day, target.priority, history.status, target.sign * history.count
+            FROM (SELECT date(executed_at) AS day, status, COUNT(*) AS count
+                  FROM test_executions WHERE scenario_id = NEW.id GROUP BY 1, 2) AS history
+            CROSS JOIN (SELECT 0 AS project_id, COALESCE(OLD.priority, 'medium') AS priority, -1 AS sign
+                        UNION ALL SELECT NEW.project_id, COALESCE(OLD.priority, 'medium'), -1
+                        UNION ALL SELECT 0, COALESCE(NEW.priority, 'medium'), 1
+                        UNION ALL SELECT NEW.project_id, COALESCE(NEW.priority, 'medium'), 1) AS target
+            WHERE true
+            ON CONFLICT (project_id, day, priority, status) DO UPDATE SET count = count + excluded.count;
+            DELETE FROM execution_daily_rollups
+            WHERE project_id IN (0, NEW.project_id) AND priority = COALESCE(OLD.priority, 'medium') AND count <= 0;
+        END
+    '''
+
+def rebuild_execution_rollups(conn):
+    """execution_daily_rollups tablosunu tüm execution geçmişinden yeniden hesapla"""
+    conn.execute("DELETE FROM execution_daily_rollups")
+    conn.execute('''
+        INSERT INTO execution_daily_rollups (project_id, day, priority, status, count)
+        SELECT s.project_id, date(e.executed_at), COALESCE(s.priority, 'medium'), e.status, COUNT(*)
+        FROM test_executions e JOIN test_scenarios s ON s.id = e.scenario_id
+        GROUP BY 1, 2, 3, 4
+        UNION ALL
+        SELECT 0, date(e.executed_at), COALESCE(s.priority, 'medium'), e.status, COUNT(*)
+        FROM test_executions e JOIN test_scenarios s ON s.id = e.scenario_id
+        GROUP BY 2, 3, 4
+    ''')
+
+def rebuild_search_index(conn, scenario_doc=_SCENARIO_DOC):
+    """search_index tablosunu mevcut verilerden yeniden oluştur"""
+    conn.execute("DELETE FROM search_index")
+    conn.execute(
+        "INSERT INTO search_index (rowid, kind, ref_id, project_id, title, body) "
+        f"SELECT s.id * 4 + {SEARCH_KIND_CODES['scenario']}, {scenario_doc.format(row='s')} "
+        "FROM test_scenarios s"
+    )
+    conn.execute(
+        "INSERT INTO search_index (rowid, kind, ref_id, project_id, title, body) "
+        f"SELECT e.id * 4 + {SEARCH_KIND_CODES['execution']}, {_EXECUTION_DOC.format(row='e')} "
+        "FROM test_executions e WHERE COALESCE(e.notes, '') != ''"
+    )
+    conn.execute(
+        "INSERT INTO search_index (rowid, kind, ref_id, project_id, title, body) "
+        f"SELECT b.id * 4 + {SEARCH_KIND_CODES['bug']}, {_BUG_DOC.format(row='b')} "
+        "FROM bug_reports b"
+    )
+
+MIGRATIONS = [
+    (
+        1,
+        "Sık kullanılan sorgular için index'ler",
+        [
+            "CREATE INDEX IF NOT EXISTS idx_projects_created ON projects (created_at, id)",
+            "CREATE INDEX IF NOT EXISTS idx_scenarios_project_created "
+            "ON test_scenarios (project_id, created_at, id)",
+            "CREATE INDEX IF NOT EXISTS idx_executions_scenario_executed "
+            "ON test_executions (scenario_id, executed_at, id)",
+            "CREATE INDEX IF NOT EXISTS idx_executions_status_scenario "
+            "ON test_executions (status, scenario_id)",
+            "CREATE INDEX IF NOT EXISTS idx_bug_reports_execution ON bug_reports (execution_id)",
+            "CREATE INDEX IF NOT EXISTS idx_bug_reports_created ON bug_reports (created_at, id)",
+        ],
+    ),
+    (
+        2,
+        "Dashboard için trigger ile güncellenen sayaç tablosu",
+        [
+            '''
+            CREATE TABLE IF NOT EXISTS stats_counters (
+                project_id INTEGER NOT NULL,  -- 0: tüm sistem
+                name TEXT NOT NULL,  -- projects, scenarios, executions, passed_executions, bugs
+                value INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (project_id, name)
+            ) WITHOUT ROWID
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS trg_stats_projects_insert AFTER INSERT ON projects
+            BEGIN
+                INSERT INTO stats_counters (project_id, name, value) VALUES (0, 'projects', 1)
+                ON CONFLICT (project_id, name) DO UPDATE SET value = value + 1;
+            END
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS trg_stats_projects_delete AFTER DELETE ON projects
+            BEGIN
+                UPDATE stats_counters SET value = value - 1 WHERE project_id = 0 AND name = 'projects';
+                DELETE FROM stats_counters WHERE project_id = OLD.id;
+            END
+            ''',
+            _counter_trigger("trg_stats_scenarios_insert", "INSERT", "test_scenarios",
+                             "scenarios", 1, "NEW.project_id"),
+            _counter_trigger("trg_stats_scenarios_delete", "DELETE", "test_scenarios",
+                             "scenarios", -1, "OLD.project_id"),
+            _counter_trigger("trg_stats_executions_insert", "INSERT", "test_executions",
+                             "executions", 1, _EXECUTION_PROJECT.format(row="NEW")),
+            _counter_trigger("trg_stats_executions_delete", "DELETE", "test_executions",
+                             "executions", -1, _EXECUTION_PROJECT.format(row="OLD")),
+            _counter_trigger("trg_stats_passed_insert", "INSERT", "test_executions",
+                             "passed_executions", 1, _EXECUTION_PROJECT.format(row="NEW"),
+                             when="NEW.status = 'pass'"),
+            _counter_trigger("trg_stats_passed_delete", "DELETE", "test_executions",
+                             "passed_executions", -1, _EXECUTION_PROJECT.format(row="OLD"),
+                             when="OLD.status = 'pass'"),
+            _counter_trigger("trg_stats_bugs_insert", "INSERT", "bug_reports",
+                             "bugs", 1, _BUG_PROJECT.format(row="NEW")),
+            _counter_trigger("trg_stats_bugs_delete", "DELETE", "bug_reports",
+                             "bugs", -1, _BUG_PROJECT.format(row="OLD")),
+            rebuild_stats_counters,
+        ],
+    ),
+    (
+        3,
+        "Senaryo, execution notu ve bug raporları için FTS5 arama index'i",
+        [
+            '''
+            CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+                kind UNINDEXED,  -- scenario, execution, bug
+                ref_id UNINDEXED,
+                project_id UNINDEXED,
+                title,
+                body,
+                tokenize = 'unicode61 remove_diacritics 2'
+            )
+            ''',
+            *_search_triggers("test_scenarios", "scenario", _LEGACY_SCENARIO_DOC),
+            *_search_triggers("test_executions", "execution", _EXECUTION_DOC,
+                              when="COALESCE({row}.notes, '') != ''"),
+            *_search_triggers("bug_reports", "bug", _BUG_DOC),
+            partial(rebuild_search_index, scenario_doc=_LEGACY_SCENARIO_DOC),
+        ],
+    ),
+    (
+        4,
+        "Jira outbox kuyruğu ve bug raporlarında Jira issue bilgisi",
+        [
+            "ALTER TABLE bug_reports ADD COLUMN jira_issue_key TEXT",
+            "ALTER TABLE bug_reports ADD COLUMN jira_issue_url TEXT",
+            '''
+            CREATE TABLE IF NOT EXISTS jira_outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                bug_id INTEGER NOT NULL UNIQUE,  -- Aynı bug için tek kayıt (idempotency)
+                status TEXT NOT NULL DEFAULT 'pending',  -- pending, sending, done, failed
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                next_attempt_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (bug_id) REFERENCES bug_reports (id) ON DELETE CASCADE
+            )
+            ''',
+            "CREATE INDEX IF NOT EXISTS idx_jira_outbox_due ON jira_outbox (status, next_attempt_at)",
+            # Jira bilgisinin yazılması arama index'ini yeniden oluşturmasın
+            "DROP TRIGGER IF EXISTS trg_search_bug_reports_update",
+            _search_triggers("bug_reports", "bug", _BUG_DOC,
+                             columns=["title", "description", "steps_to_reproduce",
+                                      "expected_result", "actual_result"])[1],
+        ],
+    ),
+    (
+        5,
+        "Test adımları JSON kolonundan scenario_steps tablosuna",
+        [
+            '''
+            CREATE TABLE IF NOT EXISTS scenario_steps (
+                scenario_id INTEGER NOT NULL,
+                ordinal INTEGER NOT NULL,  -- 1'den başlayan adım sırası
+                text TEXT NOT NULL,
+                PRIMARY KEY (scenario_id, ordinal),
+                FOREIGN KEY (scenario_id) REFERENCES test_scenarios (id) ON DELETE CASCADE
+            ) WITHOUT ROWID
+            ''',
+            migrate_scenario_steps,
+            # steps kolonunu kullanan arama trigger'ları kolon silinmeden önce kaldırılmalı
+            "DROP TRIGGER IF EXISTS trg_search_test_scenarios_insert",
+            "DROP TRIGGER IF EXISTS trg_search_test_scenarios_update",
+            "DROP TRIGGER IF EXISTS trg_search_test_scenarios_delete",
+            "ALTER TABLE test_scenarios DROP COLUMN steps",
+            *_search_triggers("test_scenarios", "scenario", _SCENARIO_DOC,
+                              columns=["title", "description"]),
+            *_scenario_steps_search_triggers(),
+            rebuild_search_index,
+        ],
+    ),
+    (
+        6,
+        "Senaryo başına artımlı güncellenen sağlık/flakiness tablosu",
+        [
+            '''
+            CREATE TABLE IF NOT EXISTS scenario_health (
+                scenario_id INTEGER PRIMARY KEY,
+                project_id INTEGER NOT NULL,
+                recent_results TEXT NOT NULL DEFAULT '',  -- Son pass/fail sonuçları ('P'/'F'), eskiden yeniye
+                run_count INTEGER NOT NULL DEFAULT 0,
+                pass_rate REAL,  -- Penceredeki başarı oranı (0-1); pass/fail sonucu yoksa NULL
+                flip_count INTEGER NOT NULL DEFAULT 0,  -- Tüm geçmişteki pass<->fail geçişleri
+                flakiness_score REAL NOT NULL DEFAULT 0,  -- Penceredeki geçiş oranı (0-1)
+                last_status TEXT,
+                last_executed_at TIMESTAMP,
+                FOREIGN KEY (scenario_id) REFERENCES test_scenarios (id) ON DELETE CASCADE
+            )
+            ''',
+            "CREATE INDEX IF NOT EXISTS idx_scenario_health_flakiness "
+            "ON scenario_health (project_id, flakiness_score)",
+            "CREATE INDEX IF NOT EXISTS idx_scenario_health_flips "
+            "ON scenario_health (project_id, flip_count)",
+            _scenario_health_trigger(),
+            rebuild_scenario_health,
+        ],
+    ),
+    (
+        7,
+        "Proje, öncelik ve durum bazında günlük execution özetleri",
+        [
+            '''
+            CREATE TABLE IF NOT EXISTS execution_daily_rollups (
+                project_id INTEGER NOT NULL,  -- 0: tüm sistem
+                day TEXT NOT NULL,  -- YYYY-MM-DD (UTC)
+                priority TEXT NOT NULL,  -- Senaryonun güncel önceliği
+                status TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (project_id, day, priority, status)
+            ) WITHOUT ROWID
+            ''',
+            _rollup_trigger("trg_rollup_executions_insert", "INSERT", "NEW", 1),
+            _rollup_trigger("trg_rollup_executions_delete", "DELETE", "OLD", -1),
+            # Öncelik değişince senaryonun geçmiş sayıları yeni öncelik hücrelerine taşınır
+            _rollup_priority_trigger(),
+            '''
+            CREATE TRIGGER IF NOT EXISTS trg_rollup_projects_delete AFTER DELETE ON projects
+            BEGIN
+                DELETE FROM execution_daily_rollups WHERE project_id = OLD.id;
+            END
+            ''',
+            rebuild_execution_rollups,
+        ],
+    ),
+    (
+        8,
+        "Jira outbox gönderim kilidi (lease) ve doğrulama bayrağı",
+        [
+            "ALTER TABLE jira_outbox ADD COLUMN claimed_at TIMESTAMP",
+            # 1: istek Jira'ya ulaşmış olabilir; tekrar göndermeden önce JQL ile aranır
+            "ALTER TABLE jira_outbox ADD COLUMN needs_verification INTEGER NOT NULL DEFAULT 0",
+            "CREATE INDEX IF NOT EXISTS idx_jira_outbox_claimed ON jira_outbox (status, claimed_at)",
+            # Gönderim sırasında kalmış kayıtların sonucu bilinmiyor
+            """UPDATE jira_outbox SET claimed_at = updated_at, needs_verification = 1
+               WHERE status = 'sending'""",
+        ],
+    ),
+    (
+        9,
+        "Sıfıra inen rollup hücrelerinin silinmesi",
+        [
+            "DROP TRIGGER IF EXISTS trg_rollup_executions_delete",
+            "DROP TRIGGER IF EXISTS trg_rollup_scenarios_priority",
+            _rollup_trigger("trg_rollup_executions_delete", "DELETE", "OLD", -1),
+            _rollup_priority_trigger(),
+            # Önceki trigger'ların bıraktığı boş hücreler
+            "DELETE FROM execution_daily_rollups WHERE count <= 0",
+        ],
+    ),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def get_schema_version(conn):
+    """Veritabanının mevcut şema versiyonunu getir"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+def apply_migrations(conn):
+    """Bekleyen migration'ları sırayla uygula, uygulanan versiyonları döndür"""
+    conn.commit()
+
+    # Hızlı yol: şema güncelse yazma kilidi almadan çık
+    if get_schema_version(conn) >= LATEST_VERSION:
+        return []
+
+    applied = []
+    for version, description, steps in MIGRATIONS:
+        # Aynı anda açılan başka bir process ile çakışmamak için yazma kilidi al
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if version > get_schema_version(conn):
+                for step in steps:
+                    if callable(step):
+                        step(conn)
+                    else:
+                        conn.execute(step)
+                conn.execute(
+                    "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                    (version, description)
+                )
+                applied.append(version)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    if applied:
+        conn.execute("PRAGMA optimize")
+    return applied
@@ -1,217 +1,837 @@
-from database.db import get_connection
-import json
-from datetime import datetime
+from database.db import db_connection
+from database.cache import cached_query, invalidates_cache
+from database.queries import (
+    ALL_PROJECTS_SQL,
+    DASHBOARD_COUNTERS_SQL,
+    EXECUTION_TREND_SQL,
+    PRIORITY_TREND_SQL,
+    CLAIM_JIRA_OUTBOX_SQL,
+    keyset_query,
+    steps_for_scenarios_query,
+    recent_executions_query,
+    failed_executions_query,
+    scenarios_by_health_query,
+    reported_executions_query
+)
+import re
+from datetime import datetime, date, timedelta
+
+PRIORITIES = ("critical", "high", "medium", "low")
+EXECUTION_STATUSES = ("pass", "fail", "blocked", "skipped")
+SEVERITIES = ("critical", "high", "medium", "low")
+SEARCH_KINDS = ("scenario", "execution", "bug")
+HEALTH_ORDER_COLUMNS = ("flakiness_score", "flip_count")
+
+# Yaygın öncelik adlarının bizim seviyelerimize karşılığı
+PRIORITY_ALIASES = {
+    "p0": "critical", "blocker": "critical", "kritik": "critical",
+    "p1": "high", "major": "high", "yüksek": "high", "yuksek": "high",
+    "p2": "medium", "normal": "medium", "orta": "medium",
+    "p3": "low", "p4": "low", "minor": "low", "trivial": "low", "düşük": "low", "dusuk": "low"
+}
+
+_STEP_PREFIX = re.compile(r"^\s*(?:\d+[.)]|[-*•])\s*")
+
+# ============= SAYFALAMA =============
+
+def get_next_cursor(rows, order_column="created_at"):
+    """Sayfanın son satırından bir sonraki sayfanın cursor'ını üret"""
+    if not rows:
+        return None
+    last = rows[-1]
+    return (last[order_column], last['id'])
 
 # ============= PROJECTS =============
 
+@invalidates_cache
 def create_project(name, url, description):
     """Yeni proje oluştur"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO projects (name, url, description) VALUES (?, ?, ?)",
-        (name, url, description)
-    )
-    conn.commit()
-    project_id = cursor.lastrowid
-    conn.close()
-    return project_id
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO projects (name, url, description) VALUES (?, ?, ?)",
+            (name, url, description)
+        )
+        return cursor.lastrowid
 
+@cached_query
 def get_all_projects():
     """Tüm projeleri getir"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM projects ORDER BY created_at DESC")
-    projects = cursor.fetchall()
-    conn.close()
-    return projects
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(ALL_PROJECTS_SQL)
+        return cursor.fetchall()
 
+@cached_query
 def get_project_by_id(project_id):
     """ID'ye göre proje getir"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM projects WHERE id = ?", (project_id,))
-    project = cursor.fetchone()
-    conn.close()
-    return project
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM projects WHERE id = ?", (project_id,))
+        return cursor.fetchone()
 
+@invalidates_cache
 def delete_project(project_id):
-    """Proje sil"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM projects WHERE id = ?", (project_id,))
-    conn.commit()
-    conn.close()
+    """Proje sil (senaryoları, execution'ları ve bug raporlarıyla birlikte)"""
+    with db_connection() as conn:
+        cursor = conn.cursor()
+
+        # Foreign key'ler açık olduğu için önce alt kayıtları sil
+        cursor.execute(
+            """DELETE FROM bug_reports WHERE execution_id IN (
+                   SELECT e.id FROM test_executions e
+                   JOIN test_scenarios s ON s.id = e.scenario_id
+                   WHERE s.project_id = ?)""",
+            (project_id,)
+        )
+        cursor.execute(
+            """DELETE FROM test_executions WHERE scenario_id IN (
+                   SELECT id FROM test_scenarios WHERE project_id = ?)""",
+            (project_id,)
+        )
+        cursor.execute("DELETE FROM test_scenarios WHERE project_id = ?", (project_id,))
+        cursor.execute("DELETE FROM projects WHERE id = ?", (project_id,))
 
 # ============= TEST SCENARIOS =============
 
+def _insert_steps(conn, scenario_id, steps, start=1):
+    """Adımları start sırasından itibaren scenario_steps tablosuna ekle"""
+    conn.executemany(
+        "INSERT INTO scenario_steps (scenario_id, ordinal, text) VALUES (?, ?, ?)",
+        [(scenario_id, ordinal, text) for ordinal, text in enumerate(steps, start)]
+    )
+
+# Çok satırlı INSERT başına satır sayısı (satır başına 5 parametre, SQLite sınırının altında)
+SCENARIO_INSERT_BATCH = 500
+
+def _insert_scenarios(conn, project_id, rows, created_by_ai=False):
+    """
+    Doğrulanmış (title, description, steps, priority) satırlarını çok satırlı
+    INSERT ... RETURNING ile ekle ve eklenen senaryo id'lerini sırasıyla döndür.
+    """
+    scenario_ids = []
+    for start in range(0, len(rows), SCENARIO_INSERT_BATCH):
+        batch = rows[start:start + SCENARIO_INSERT_BATCH]
+        returned = conn.execute(
+            f"""INSERT INTO test_scenarios
+                (project_id, title, description, priority, created_by_ai)
+                VALUES {", ".join("(?, ?, ?, ?, ?)" for _ in batch)}
+                RETURNING id""",
+            [value
+             for title, description, steps, priority in batch
+             for value in (project_id, title, description, priority, created_by_ai)]
+        ).fetchall()
+        # RETURNING sırası garanti değil; AUTOINCREMENT id'leri ise ekleme sırasıyla
+        # artar (ardışık olmaları gerekmez), bu yüzden sıralanan id'ler satırlara denk gelir
+        scenario_ids.extend(sorted(row[0] for row in returned))
+
+    conn.executemany(
+        "INSERT INTO scenario_steps (scenario_id, ordinal, text) VALUES (?, ?, ?)",
+        [
+            (scenario_id, ordinal, text)
+            for scenario_id, (title, description, steps, priority) in zip(scenario_ids, rows)
+            for ordinal, text in enumerate(steps, 1)
+        ]
+    )
+    return scenario_ids
+
+@invalidates_cache
 def create_test_scenario(project_id, title, description, steps, priority="medium", created_by_ai=False):
     """Yeni test senaryosu oluştur"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Steps'i JSON string'e çevir
-    steps_json = json.dumps(steps, ensure_ascii=False)
-    
-    cursor.execute(
-        """INSERT INTO test_scenarios 
-           (project_id, title, description, steps, priority, created_by_ai) 
-           VALUES (?, ?, ?, ?, ?, ?)""",
-        (project_id, title, description, steps_json, priority, created_by_ai)
-    )
-    conn.commit()
-    scenario_id = cursor.lastrowid
-    conn.close()
-    return scenario_id
-
-def get_scenarios_by_project(project_id):
-    """Projeye ait tüm test senaryolarını getir"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT * FROM test_scenarios WHERE project_id = ? ORDER BY created_at DESC",
-        (project_id,)
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """INSERT INTO test_scenarios
+               (project_id, title, description, priority, created_by_ai)
+               VALUES (?, ?, ?, ?, ?)""",
+            (project_id, title, description, priority, created_by_ai)
+        )
+        _insert_steps(conn, cursor.lastrowid, steps)
+        return cursor.lastrowid
+
+def normalize_steps(steps):
+    """
+    Adımları listeye çevir, numara/madde işaretlerini ve boş adımları temizle.
+    Metin verilirse satırlara (tek satırsa '|' işaretine) göre bölünür.
+    """
+    if isinstance(steps, str):
+        steps = steps.splitlines() if "\n" in steps else steps.split("|")
+    if not isinstance(steps, list):
+        return []
+    steps = [_STEP_PREFIX.sub("", str(step)).strip() for step in steps if step is not None]
+    return [step for step in steps if step]
+
+def validate_scenario(scenario):
+    """
+    Senaryo verisini doğrula ve normalize et; (satır, None) veya (None, hata mesajı) döndür.
+    Satır (title, description, steps, priority) şeklindedir; öncelik takma adları
+    (P1, major, yüksek...) PRIORITY_ALIASES ile seviyelere çevrilir.
+    """
+    if not isinstance(scenario, dict):
+        return None, "Senaryo bir sözlük olmalı"
+
+    title = " ".join(str(scenario.get('title') or '').split())
+    if not title:
+        return None, "Başlık zorunludur"
+
+    steps = scenario.get('steps')
+    if not isinstance(steps, (list, str)) or len(steps) == 0:
+        return None, "En az bir test adımı gereklidir"
+    steps = normalize_steps(steps)
+    if len(steps) == 0:
+        return None, "Test adımları boş olamaz"
+
+    priority = str(scenario.get('priority') or 'medium').strip().lower()
+    priority = PRIORITY_ALIASES.get(priority, priority)
+    if priority not in PRIORITIES:
+        return None, f"Geçersiz öncelik: {scenario.get('priority')}"
+
+    description = str(scenario.get('description') or '').strip()
+    return (title, description, steps, priority), None
+
+@invalidates_cache
+def create_test_scenarios_bulk(project_id, scenarios, created_by_ai=False):
+    """
+    Birden fazla test senaryosunu tek transaction'da kaydet.
+    Geçersiz satırlar atlanır ve 'errors' listesinde raporlanır.
+    """
+    rows = []
+    errors = []
+
+    for index, scenario in enumerate(scenarios):
+        row, error = validate_scenario(scenario)
+        if error:
+            title = scenario.get('title') if isinstance(scenario, dict) else None
+            errors.append({'index': index, 'title': title, 'error': error})
+            continue
+
+        rows.append(row)
+
+    if rows:
+        with db_connection() as conn:
+            _insert_scenarios(conn, project_id, rows, created_by_ai)
+
+    return {
+        'saved_count': len(rows),
+        'errors': errors
+    }
+
+def get_scenario_titles(project_id):
+    """Projedeki tüm senaryo başlıklarını getir (içe aktarmada tekrar kontrolü için)"""
+    with db_connection() as conn:
+        rows = conn.execute(
+            "SELECT title FROM test_scenarios WHERE project_id = ?", (project_id,)
+        ).fetchall()
+    return [row['title'] for row in rows]
+
+@invalidates_cache
+def import_test_scenarios_chunk(project_id, rows, created_by_ai=False):
+    """
+    Doğrulanmış (title, description, steps, priority) satırlarını tek transaction'da
+    kaydet ve eklenen senaryo id'lerini sırasıyla döndür.
+    """
+    if not rows:
+        return []
+
+    with db_connection() as conn:
+        return _insert_scenarios(conn, project_id, rows, created_by_ai)
+
+@cached_query
+def get_scenarios_by_project(project_id, limit=None, cursor=None):
+    """
+    Projeye ait test senaryolarını yeniden eskiye getir.
+    limit verilmezse tüm senaryolar döner; cursor için get_next_cursor() kullanılır.
+    """
+    query, params = keyset_query(
+        "test_scenarios", ["project_id = ?"], [project_id],
+        "created_at", limit=limit, cursor=cursor
     )
-    scenarios = cursor.fetchall()
-    conn.close()
-    return scenarios
+    with db_connection() as conn:
+        db_cursor = conn.cursor()
+        db_cursor.execute(query, params)
+        return db_cursor.fetchall()
 
+@cached_query
 def get_scenario_by_id(scenario_id):
     """ID'ye göre test senaryosu getir"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM test_scenarios WHERE id = ?", (scenario_id,))
-    scenario = cursor.fetchone()
-    conn.close()
-    return scenario
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM test_scenarios WHERE id = ?", (scenario_id,))
+        return cursor.fetchone()
+
+@cached_query
+def get_steps_for_scenarios(scenario_ids):
+    """Verilen senaryoların adımlarını tek sorguda {scenario_id: [adım, ...]} olarak getir"""
+    if not scenario_ids:
+        return {}
+    steps = {scenario_id: [] for scenario_id in scenario_ids}
+    with db_connection() as conn:
+        rows = conn.execute(*steps_for_scenarios_query(scenario_ids))
+        for row in rows:
+            steps[row['scenario_id']].append(row['text'])
+    return steps
 
-# ============= TEST SCENARIOS ============= 
+def get_scenario_steps(scenario_id):
+    """Tek bir senaryonun adımlarını sırasıyla getir"""
+    return get_steps_for_scenarios([scenario_id])[scenario_id]
 
+@invalidates_cache
 def update_test_scenario(scenario_id, title, description, steps, priority):
-    """Test senaryosunu güncelle"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Steps'i JSON string'e çevir
-    if isinstance(steps, list):
-        steps_json = json.dumps(steps, ensure_ascii=False)
-    else:
-        steps_json = steps
-    
-    cursor.execute(
-        """UPDATE test_scenarios 
-           SET title = ?, description = ?, steps = ?, priority = ? 
-           WHERE id = ?""",
-        (title, description, steps_json, priority, scenario_id)
-    )
-    conn.commit()
-    conn.close()
+    """
+    Test senaryosunu güncelle.
+    Adımlar mevcutlarla karşılaştırılır; yalnızca değişen adımlar güncellenir,
+    eklenenler eklenir, fazlalar silinir.
+    """
+    with db_connection() as conn:
+        conn.execute(
+            """UPDATE test_scenarios
+               SET title = ?, description = ?, priority = ?
+               WHERE id = ?""",
+            (title, description, priority, scenario_id)
+        )
+
+        current = [
+            row['text'] for row in conn.execute(
+                "SELECT text FROM scenario_steps WHERE scenario_id = ? ORDER BY ordinal",
+                (scenario_id,)
+            )
+        ]
+        conn.executemany(
+            "UPDATE scenario_steps SET text = ? WHERE scenario_id = ? AND ordinal = ?",
+            [
+                (text, scenario_id, ordinal)
+                for ordinal, (old_text, text) in enumerate(zip(current, steps), 1)
+                if old_text != text
+            ]
+        )
+        if len(steps) > len(current):
+            _insert_steps(conn, scenario_id, steps[len(current):], start=len(current) + 1)
+        elif len(steps) < len(current):
+            conn.execute(
+                "DELETE FROM scenario_steps WHERE scenario_id = ? AND ordinal > ?",
+                (scenario_id, len(steps))
+            )
 
+@invalidates_cache
 def delete_test_scenario(scenario_id):
     """Test senaryosunu sil"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # İlk önce bu senaryoya ait execution'ları sil
-    cursor.execute("DELETE FROM test_executions WHERE scenario_id = ?", (scenario_id,))
-    
-    # Sonra senaryoyu sil
-    cursor.execute("DELETE FROM test_scenarios WHERE id = ?", (scenario_id,))
-    
-    conn.commit()
-    conn.close()
+    with db_connection() as conn:
+        cursor = conn.cursor()
+
+        # İlk önce execution'lara bağlı bug raporlarını sil
+        cursor.execute(
+            """DELETE FROM bug_reports WHERE execution_id IN (
+                   SELECT id FROM test_executions WHERE scenario_id = ?)""",
+            (scenario_id,)
+        )
+
+        # Sonra bu senaryoya ait execution'ları sil
+        cursor.execute("DELETE FROM test_executions WHERE scenario_id = ?", (scenario_id,))
+
+        # En son senaryoyu sil
+        cursor.execute("DELETE FROM test_scenarios WHERE id = ?", (scenario_id,))
 
 # ============= TEST EXECUTIONS =============
 
+@invalidates_cache
 def create_test_execution(scenario_id, status, notes=""):
     """Test execution oluştur"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO test_executions (scenario_id, status, notes) VALUES (?, ?, ?)",
-        (scenario_id, status, notes)
-    )
-    conn.commit()
-    execution_id = cursor.lastrowid
-    conn.close()
-    return execution_id
-
-def get_executions_by_scenario(scenario_id):
-    """Senaryoya ait tüm execution'ları getir"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT * FROM test_executions WHERE scenario_id = ? ORDER BY executed_at DESC",
-        (scenario_id,)
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO test_executions (scenario_id, status, notes) VALUES (?, ?, ?)",
+            (scenario_id, status, notes)
+        )
+        return cursor.lastrowid
+
+@invalidates_cache
+def create_test_executions_bulk(results):
+    """
+    Birden fazla test sonucunu tek transaction'da kaydet.
+    results: [{'scenario_id': ..., 'status': ..., 'notes': ...}, ...]
+    """
+    rows = []
+    errors = []
+
+    for index, result in enumerate(results):
+        scenario_id = result.get('scenario_id')
+        status = str(result.get('status') or '').strip().lower()
+
+        if scenario_id is None:
+            errors.append({'index': index, 'scenario_id': None, 'error': "Senaryo ID zorunludur"})
+            continue
+        if status not in EXECUTION_STATUSES:
+            errors.append({'index': index, 'scenario_id': scenario_id, 'error': f"Geçersiz durum: {status}"})
+            continue
+
+        rows.append((scenario_id, status, result.get('notes') or ""))
+
+    if rows:
+        with db_connection() as conn:
+            conn.executemany(
+                "INSERT INTO test_executions (scenario_id, status, notes) VALUES (?, ?, ?)",
+                rows
+            )
+
+    return {
+        'saved_count': len(rows),
+        'errors': errors
+    }
+
+@cached_query
+def get_executions_by_scenario(scenario_id, limit=None, cursor=None):
+    """
+    Senaryoya ait execution'ları yeniden eskiye getir.
+    limit verilmezse tüm geçmiş döner; cursor için get_next_cursor(rows, "executed_at") kullanılır.
+    """
+    query, params = keyset_query(
+        "test_executions", ["scenario_id = ?"], [scenario_id],
+        "executed_at", limit=limit, cursor=cursor
     )
-    executions = cursor.fetchall()
-    conn.close()
+    with db_connection() as conn:
+        db_cursor = conn.cursor()
+        db_cursor.execute(query, params)
+        return db_cursor.fetchall()
+
+@cached_query
+def get_recent_executions_for_project(project_id, per_scenario=5, scenario_ids=None):
+    """
+    Projedeki her senaryonun en yeni per_scenario execution'ını tek sorguda
+    {scenario_id: [satır, ...]} olarak getir (yeniden eskiye).
+    scenario_ids verilirse yalnızca o senaryolar (örn. mevcut sayfa) okunur.
+    """
+    if scenario_ids is not None and not scenario_ids:
+        return {}
+
+    with db_connection() as conn:
+        rows = conn.execute(*recent_executions_query(project_id, per_scenario, scenario_ids)).fetchall()
+
+    executions = {}
+    for row in sorted(rows, key=lambda row: (row['executed_at'], row['id']), reverse=True):
+        executions.setdefault(row['scenario_id'], []).append(row)
     return executions
 
+@cached_query
+def get_failed_executions_by_project(project_id, limit=None, since=None):
+    """
+    Projedeki henüz bug raporu açılmamış başarısız execution'ları tek sorguda getir.
+    Her satır senaryo (scenario_id, title, description, priority) ve
+    execution (execution_id, executed_at, notes) kolonlarını içerir; adımlar
+    get_steps_for_scenarios() ile ayrıca okunur.
+    """
+    query, params = failed_executions_query(project_id, limit=limit, since=since)
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        return cursor.fetchall()
+
+# ============= SENARYO SAĞLIĞI =============
+
+@cached_query
+def get_scenario_health(scenario_ids):
+    """Verilen senaryoların sağlık satırlarını {scenario_id: satır} olarak getir"""
+    if not scenario_ids:
+        return {}
+    placeholders = ", ".join("?" for _ in scenario_ids)
+    with db_connection() as conn:
+        rows = conn.execute(
+            f"SELECT * FROM scenario_health WHERE scenario_id IN ({placeholders})",
+            list(scenario_ids)
+        ).fetchall()
+    return {row['scenario_id']: row for row in rows}
+
+@cached_query
+def get_scenarios_by_health(project_id, order_column="flakiness_score", limit=None, cursor=None,
+                            min_flakiness=None, max_pass_rate=None):
+    """
+    En az bir kez çalıştırılmış senaryoları sağlık bilgileriyle, order_column'a göre
+    büyükten küçüğe getir. Sıralama ve filtreler scenario_health index'inden okunur;
+    cursor için get_next_cursor(rows, order_column) kullanılır.
+    """
+    if order_column not in HEALTH_ORDER_COLUMNS:
+        raise ValueError(f"Geçersiz sıralama kolonu: {order_column}")
+
+    query, params = scenarios_by_health_query(
+        project_id, order_column, limit=limit, cursor=cursor,
+        min_flakiness=min_flakiness, max_pass_rate=max_pass_rate
+    )
+    with db_connection() as conn:
+        return conn.execute(query, params).fetchall()
+
 # ============= BUG REPORTS =============
 
-def create_bug_report(execution_id, title, severity, description, 
+@invalidates_cache
+def create_bug_report(execution_id, title, severity, description,
                      steps_to_reproduce, expected_result, actual_result, ai_generated=False):
     """Bug raporu oluştur"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        """INSERT INTO bug_reports 
-           (execution_id, title, severity, description, steps_to_reproduce, 
-            expected_result, actual_result, ai_generated) 
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-        (execution_id, title, severity, description, steps_to_reproduce, 
-         expected_result, actual_result, ai_generated)
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """INSERT INTO bug_reports
+               (execution_id, title, severity, description, steps_to_reproduce,
+                expected_result, actual_result, ai_generated)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            (execution_id, title, severity, description, steps_to_reproduce,
+             expected_result, actual_result, ai_generated)
+        )
+        return cursor.lastrowid
+
+@invalidates_cache
+def create_bug_reports_bulk(reports, ai_generated=False):
+    """
+    Birden fazla bug raporunu tek transaction'da kaydet.
+    reports: [{'execution_id': ..., 'title': ..., 'severity': ..., 'description': ...,
+               'steps_to_reproduce': ..., 'expected_result': ..., 'actual_result': ...}, ...]
+    Zaten bug raporu olan execution'lar atlanır ve hata olarak döner.
+    """
+    execution_ids = [report.get('execution_id') for report in reports if report.get('execution_id') is not None]
+    rows = []
+    errors = []
+
+    with db_connection() as conn:
+        reported = set()
+        if execution_ids:
+            reported = {row[0] for row in conn.execute(*reported_executions_query(execution_ids))}
+
+        for index, report in enumerate(reports):
+            execution_id = report.get('execution_id')
+            title = str(report.get('title') or '').strip()
+            severity = str(report.get('severity') or 'medium').strip().lower()
+
+            if execution_id is None:
+                errors.append({'index': index, 'execution_id': None, 'error': "Execution ID zorunludur"})
+                continue
+            if execution_id in reported:
+                errors.append({'index': index, 'execution_id': execution_id, 'error': "Bu execution için zaten bug raporu var"})
+                continue
+            if not title or not report.get('description') or not report.get('steps_to_reproduce'):
+                errors.append({'index': index, 'execution_id': execution_id, 'error': "Başlık, açıklama ve adımlar zorunludur"})
+                continue
+            if severity not in SEVERITIES:
+                errors.append({'index': index, 'execution_id': execution_id, 'error': f"Geçersiz severity: {severity}"})
+                continue
+
+            reported.add(execution_id)
+            rows.append((
+                execution_id, title, severity, report['description'], report['steps_to_reproduce'],
+                report.get('expected_result') or "", report.get('actual_result') or "", ai_generated
+            ))
+
+        if rows:
+            conn.executemany(
+                """INSERT INTO bug_reports
+                   (execution_id, title, severity, description, steps_to_reproduce,
+                    expected_result, actual_result, ai_generated)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                rows
+            )
+
+    return {
+        'saved_count': len(rows),
+        'errors': errors
+    }
+
+@cached_query
+def get_all_bug_reports(limit=None, cursor=None):
+    """
+    Bug raporlarını yeniden eskiye getir.
+    limit verilmezse tüm raporlar döner; cursor için get_next_cursor() kullanılır.
+    """
+    query, params = keyset_query(
+        "bug_reports", [], [],
+        "created_at", limit=limit, cursor=cursor
+    )
+    with db_connection() as conn:
+        db_cursor = conn.cursor()
+        db_cursor.execute(query, params)
+        return db_cursor.fetchall()
+
+# ============= DIŞA AKTARMA =============
+
+EXPORT_BATCH_SIZE = 500
+
+def _iter_export_rows(select, alias, project_id, date_column, since, until, batch_size):
+    """
+    Dışa aktarma satırlarını id sırasıyla batch_size'lık keyset sayfalarıyla üret.
+    Her sayfa kendi bağlantısında okunur; bellekte en fazla bir sayfa tutulur.
+    since/until gün (YYYY-MM-DD) olarak verilir, until dahildir.
+    """
+    conditions = []
+    params = []
+    if project_id is not None:
+        conditions.append("s.project_id = ?")
+        params.append(project_id)
+    if since:
+        conditions.append(f"{date_column} >= ?")
+        params.append(str(since))
+    if until:
+        conditions.append(f"{date_column} < date(?, '+1 day')")
+        params.append(str(until))
+
+    last_id = 0
+    while True:
+        query = select + f" WHERE {alias}.id > ?"
+        if conditions:
+            query += " AND " + " AND ".join(conditions)
+        query += f" ORDER BY {alias}.id LIMIT ?"
+
+        with db_connection() as conn:
+            rows = conn.execute(query, [last_id, *params, batch_size]).fetchall()
+
+        yield from rows
+        if len(rows) < batch_size:
+            return
+        last_id = rows[-1]['id']
+
+def iter_bug_reports_for_export(project_id=None, since=None, until=None, batch_size=EXPORT_BATCH_SIZE):
+    """Bug raporlarını proje/senaryo bilgileriyle, oluşturulma tarihine göre filtreleyerek akıt"""
+    return _iter_export_rows(
+        """SELECT b.id, p.name AS project_name, s.title AS scenario_title, b.execution_id,
+                  b.title, b.severity, b.description, b.steps_to_reproduce, b.expected_result,
+                  b.actual_result, b.ai_generated, b.jira_issue_key, b.created_at
+           FROM bug_reports b
+           JOIN test_executions e ON e.id = b.execution_id
+           JOIN test_scenarios s ON s.id = e.scenario_id
+           JOIN projects p ON p.id = s.project_id""",
+        "b", project_id, "b.created_at", since, until, batch_size
+    )
+
+def iter_executions_for_export(project_id=None, since=None, until=None, batch_size=EXPORT_BATCH_SIZE):
+    """Execution'ları proje/senaryo bilgileriyle, çalıştırılma tarihine göre filtreleyerek akıt"""
+    return _iter_export_rows(
+        """SELECT e.id, p.name AS project_name, e.scenario_id, s.title AS scenario_title,
+                  s.priority, e.status, e.notes, e.executed_at
+           FROM test_executions e
+           JOIN test_scenarios s ON s.id = e.scenario_id
+           JOIN projects p ON p.id = s.project_id""",
+        "e", project_id, "e.executed_at", since, until, batch_size
     )
-    conn.commit()
-    bug_id = cursor.lastrowid
-    conn.close()
-    return bug_id
-
-def get_all_bug_reports():
-    """Tüm bug raporlarını getir"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM bug_reports ORDER BY created_at DESC")
-    bugs = cursor.fetchall()
-    conn.close()
-    return bugs
+
+# ============= JIRA OUTBOX =============
+
+@invalidates_cache
+def enqueue_jira_pushes(bug_ids):
+    """
+    Bug raporlarını Jira'ya gönderilmek üzere kuyruğa al.
+    Zaten issue'su olan veya kuyrukta bekleyen bug'lar tekrar eklenmez; başarısız
+    olanlar yeniden denenmek üzere sıfırlanır. Kuyruğa alınan bug sayısını döndürür.
+    """
+    with db_connection() as conn:
+        queued = 0
+        for bug_id in bug_ids:
+            cursor = conn.execute(
+                """INSERT INTO jira_outbox (bug_id)
+                   SELECT id FROM bug_reports WHERE id = ? AND jira_issue_key IS NULL
+                   ON CONFLICT (bug_id) DO UPDATE SET
+                       status = 'pending', attempts = 0, last_error = NULL,
+                       next_attempt_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                   WHERE status = 'failed'""",
+                (bug_id,)
+            )
+            queued += cursor.rowcount
+        return queued
+
+@invalidates_cache
+def claim_jira_outbox_batch(limit=50, lease_seconds=600):
+    """
+    Zamanı gelmiş bekleyen kayıtları 'sending' olarak işaretleyip bug satırlarıyla döndür.
+    Kilidi (claimed_at) lease_seconds'tan eski gönderimler de yeniden alınır; bu
+    kayıtların isteği Jira'ya ulaşmış olabileceğinden needs_verification işaretlenir.
+    Açık bir transaction içinden çağrılırsa (iç içe db_connection) o transaction'a katılır.
+    """
+    with db_connection() as conn:
+        # Seçim ve işaretleme arasında başka bir worker aynı kayıtları almasın
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        bug_ids = [
+            row['bug_id'] for row in conn.execute(
+                CLAIM_JIRA_OUTBOX_SQL, (f"-{int(lease_seconds)} seconds", limit)
+            )
+        ]
+        if not bug_ids:
+            return []
+
+        placeholders = ", ".join("?" for _ in bug_ids)
+        conn.execute(
+            f"""UPDATE jira_outbox SET
+                    needs_verification = CASE WHEN status = 'sending' THEN 1 ELSE needs_verification END,
+                    status = 'sending', attempts = attempts + 1,
+                    claimed_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                WHERE bug_id IN ({placeholders})""",
+            bug_ids
+        )
+        return conn.execute(
+            f"""SELECT b.*, o.attempts, o.needs_verification FROM bug_reports b
+                JOIN jira_outbox o ON o.bug_id = b.id
+                WHERE b.id IN ({placeholders})""",
+            bug_ids
+        ).fetchall()
+
+@invalidates_cache
+def complete_jira_pushes(created):
+    """Oluşturulan issue'ları bug raporlarına yaz ve kuyruk kayıtlarını tamamla"""
+    with db_connection() as conn:
+        conn.executemany(
+            "UPDATE bug_reports SET jira_issue_key = ?, jira_issue_url = ? WHERE id = ?",
+            [(item['issue_key'], item['issue_url'], item['bug_id']) for item in created]
+        )
+        conn.executemany(
+            """UPDATE jira_outbox SET status = 'done', last_error = NULL, claimed_at = NULL,
+                   needs_verification = 0, updated_at = CURRENT_TIMESTAMP
+               WHERE bug_id = ?""",
+            [(item['bug_id'],) for item in created]
+        )
+
+@invalidates_cache
+def fail_jira_push(bug_id, error, retry_in_seconds=None, needs_verification=False):
+    """
+    Gönderim hatasını kaydet; retry_in_seconds verilirse tekrar dene, yoksa 'failed' yap.
+    needs_verification: istek Jira'ya ulaşmış olabilir, tekrar göndermeden önce aranmalı.
+    """
+    with db_connection() as conn:
+        if retry_in_seconds is None:
+            conn.execute(
+                """UPDATE jira_outbox SET status = 'failed', last_error = ?, needs_verification = ?,
+                       claimed_at = NULL, updated_at = CURRENT_TIMESTAMP
+                   WHERE bug_id = ?""",
+                (error, int(needs_verification), bug_id)
+            )
+        else:
+            conn.execute(
+                """UPDATE jira_outbox SET status = 'pending', last_error = ?, needs_verification = ?,
+                       claimed_at = NULL, next_attempt_at = datetime('now', ?), updated_at = CURRENT_TIMESTAMP
+                   WHERE bug_id = ?""",
+                (error, int(needs_verification), f"+{int(retry_in_seconds)} seconds", bug_id)
+            )
+
+@cached_query
+def get_jira_outbox_status(bug_ids):
+    """Verilen bug'ların kuyruk durumlarını {bug_id: satır} olarak getir"""
+    if not bug_ids:
+        return {}
+    placeholders = ", ".join("?" for _ in bug_ids)
+    with db_connection() as conn:
+        rows = conn.execute(
+            f"SELECT * FROM jira_outbox WHERE bug_id IN ({placeholders})",
+            list(bug_ids)
+        ).fetchall()
+    return {row['bug_id']: row for row in rows}
+
+@cached_query
+def count_pending_jira_pushes():
+    """Kuyrukta bekleyen veya gönderilmekte olan kayıt sayısı"""
+    with db_connection() as conn:
+        return conn.execute(
+            "SELECT COUNT(*) FROM jira_outbox WHERE status IN ('pending', 'sending')"
+        ).fetchone()[0]
+
+# ============= ARAMA =============
+
+def _build_match_query(text):
+    """Kullanıcı girdisini güvenli bir FTS5 sorgusuna çevir (her kelime önek araması)"""
+    tokens = re.findall(r"\w+", text or "")
+    return " ".join(f'"{token}"*' for token in tokens)
+
+@cached_query
+def search(project_id, query, kinds=None, limit=20):
+    """
+    Senaryolar, execution notları ve bug raporları içinde tam metin arama yap.
+    Sonuçlar bm25 skoruna göre sıralanır (başlık eşleşmeleri daha ağırlıklı);
+    project_id None ise tüm projelerde arar.
+    """
+    match_query = _build_match_query(query)
+    if not match_query:
+        return []
+
+    sql = """
+        SELECT kind, ref_id, project_id, title,
+               snippet(search_index, 4, '**', '**', '…', 12) AS snippet,
+               bm25(search_index, 0.0, 0.0, 0.0, 5.0, 1.0) AS score
+        FROM search_index
+        WHERE search_index MATCH ?
+    """
+    params = [match_query]
+
+    if project_id is not None:
+        sql += " AND project_id = ?"
+        params.append(project_id)
+
+    if kinds:
+        kinds = [kind for kind in kinds if kind in SEARCH_KINDS]
+        sql += f" AND kind IN ({', '.join('?' for _ in kinds)})"
+        params.extend(kinds)
+
+    sql += " ORDER BY score LIMIT ?"
+    params.append(limit)
+
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        return cursor.fetchall()
 
 # ============= İSTATİSTİKLER =============
 
-def get_dashboard_stats():
-    """Dashboard için istatistikler"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Toplam proje sayısı
-    cursor.execute("SELECT COUNT(*) as count FROM projects")
-    total_projects = cursor.fetchone()['count']
-    
-    # Toplam test senaryosu
-    cursor.execute("SELECT COUNT(*) as count FROM test_scenarios")
-    total_scenarios = cursor.fetchone()['count']
-    
-    # Toplam execution
-    cursor.execute("SELECT COUNT(*) as count FROM test_executions")
-    total_executions = cursor.fetchone()['count']
-    
-    # Pass olan testler
-    cursor.execute("SELECT COUNT(*) as count FROM test_executions WHERE status = 'pass'")
-    passed_tests = cursor.fetchone()['count']
-    
+def _trend_range(days, end_date):
+    """Bitiş günü dahil son 'days' günün (başlangıç, bitiş) tarihlerini YYYY-MM-DD olarak ver"""
+    end = date.fromisoformat(str(end_date)[:10]) if end_date else datetime.utcnow().date()
+    return (end - timedelta(days=days - 1)).isoformat(), end.isoformat()
+
+@cached_query
+def get_execution_trend(project_id=None, days=90, end_date=None):
+    """
+    Günlük execution sayıları ve başarı oranı (yalnızca execution_daily_rollups okunur).
+    project_id verilmezse tüm sistem; end_date verilmezse bugün (UTC) baz alınır.
+    """
+    start, end = _trend_range(days, end_date)
+    with db_connection() as conn:
+        rows = conn.execute(EXECUTION_TREND_SQL, (project_id or 0, start, end)).fetchall()
+
+    return [
+        {
+            **dict(row),
+            'pass_rate': round(row['passed'] / row['total'] * 100, 1) if row['total'] > 0 else None
+        }
+        for row in rows
+    ]
+
+@cached_query
+def get_priority_trend(project_id=None, days=90, end_date=None):
+    """Öncelik bazında günlük başarı oranları (yalnızca execution_daily_rollups okunur)"""
+    start, end = _trend_range(days, end_date)
+    with db_connection() as conn:
+        rows = conn.execute(PRIORITY_TREND_SQL, (project_id or 0, start, end)).fetchall()
+
+    return [
+        {
+            **dict(row),
+            'pass_rate': round(row['passed'] / row['total'] * 100, 1) if row['total'] > 0 else None
+        }
+        for row in rows
+    ]
+
+@cached_query
+def get_dashboard_stats(project_id=None):
+    """
+    Dashboard için istatistikler.
+    Sayılar trigger'larla güncellenen stats_counters tablosundan tek sorguda okunur;
+    project_id verilirse sadece o projenin sayıları döner.
+    """
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(DASHBOARD_COUNTERS_SQL, (project_id or 0,))
+        counters = {row['name']: row['value'] for row in cursor.fetchall()}
+
+    total_executions = counters.get('executions', 0)
+    passed_tests = counters.get('passed_executions', 0)
+
     # Başarı oranı
     success_rate = round((passed_tests / total_executions * 100), 1) if total_executions > 0 else 0
-    
-    # Toplam bug sayısı
-    cursor.execute("SELECT COUNT(*) as count FROM bug_reports")
-    total_bugs = cursor.fetchone()['count']
-    
-    conn.close()
-    
+
     return {
-        'total_projects': total_projects,
-        'total_scenarios': total_scenarios,
+        # Proje sayacı yalnızca sistem geneli için tutulur; proje kapsamında tek proje vardır
+        'total_projects': 1 if project_id else counters.get('projects', 0),
+        'total_scenarios': counters.get('scenarios', 0),
+        'total_executions': total_executions,
         'success_rate': success_rate,
-        'total_bugs': total_bugs
-    }
\ No newline at end of file
+        'total_bugs': counters.get('bugs', 0)
+    }
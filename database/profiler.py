@@ -0,0 +1,217 @@
+"""
+SQL sorgu profilleyicisi
+
+db.get_connection() profilleme açıkken bağlantıları ProfiledConnection ile açar.
+Her sorguya ölçüm maliyeti eklediği için varsayılan olarak kapalıdır;
+SMARTQA_SQL_PROFILE=1 (veya SMARTQA_SQL_PROFILE_PANEL=1) ile açılır.
+Her sorgu için normalize edilmiş SQL, süre (execute + fetch), dönen satır sayısı
+ve sorguyu çağıran fonksiyon kaydedilir. Eşiği aşan sorgular dönen bir log
+dosyasına yazılır. İstenirse o anki script çalıştırmasının (Streamlit rerun)
+sorguları thread bazında toplanıp sidebar panelinde listelenir.
+"""
+import os
+import re
+import sys
+import time
+import logging
+import sqlite3
+import threading
+from collections import deque
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler
+
+# Sidebar paneli açıksa sorguların ölçülmesi de gerekir
+PROFILE_ENABLED = (
+    os.getenv("SMARTQA_SQL_PROFILE", "0") == "1"
+    or os.getenv("SMARTQA_SQL_PROFILE_PANEL", "0") == "1"
+)
+SLOW_QUERY_MS = float(os.getenv("SMARTQA_SLOW_QUERY_MS", "100"))
+SLOW_QUERY_LOG_PATH = os.getenv("SMARTQA_SLOW_QUERY_LOG", "database/slow_queries.log")
+SLOW_QUERY_LOG_MAX_BYTES = 1024 * 1024
+SLOW_QUERY_LOG_BACKUPS = 3
+# İstatistikler için tutulan son sorgu sayısı
+RECENT_QUERY_LIMIT = int(os.getenv("SMARTQA_SQL_PROFILE_HISTORY", "5000"))
+
+_recent = deque(maxlen=RECENT_QUERY_LIMIT)
+_capture = threading.local()
+_capture_enabled = False
+CAPTURE_LIMIT = 1000  # Thread başına tutulan en fazla kayıt
+_slow_logger = None
+_slow_logger_lock = threading.Lock()
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql):
+    """Sabitleri '?' ile değiştirip boşlukları sadeleştirerek sorguları grupla"""
+    text = re.sub(r"--[^\n]*", " ", sql)
+    text = re.sub(r"'(?:[^']|'')*'", "?", text)
+    text = re.sub(r"\b\d+(?:\.\d+)?\b", "?", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    # IN (?, ?, ?) listelerini uzunluktan bağımsız tek gruba indir
+    return re.sub(r"\(\s*\?(?:\s*,\s*\?)+\s*\)", "(?, ...)", text)
+
+def _caller():
+    """Sorguyu başlatan ilk uygulama fonksiyonunu 'modül.fonksiyon' olarak bul"""
+    frame = sys._getframe(3)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module != __name__:
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "?"
+
+def _get_slow_logger():
+    global _slow_logger
+    with _slow_logger_lock:
+        if _slow_logger is None:
+            logger = logging.getLogger("smartqa.slow_queries")
+            logger.setLevel(logging.WARNING)
+            logger.propagate = False
+            os.makedirs(os.path.dirname(SLOW_QUERY_LOG_PATH) or ".", exist_ok=True)
+            handler = RotatingFileHandler(
+                SLOW_QUERY_LOG_PATH,
+                maxBytes=SLOW_QUERY_LOG_MAX_BYTES,
+                backupCount=SLOW_QUERY_LOG_BACKUPS,
+                encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            logger.addHandler(handler)
+            _slow_logger = logger
+        return _slow_logger
+
+class _QueryRecord:
+    """Tek bir sorgu çalıştırmasının ölçümü; fetch'ler süre ve satır ekler"""
+
+    __slots__ = ("sql", "caller", "ms", "rows", "logged")
+
+    def __init__(self, sql, caller):
+        self.sql = sql
+        self.caller = caller
+        self.ms = 0.0
+        self.rows = 0
+        self.logged = False
+
+    def add(self, ms, rows=0):
+        self.ms += ms
+        self.rows += rows
+
+        if not self.logged and SLOW_QUERY_MS > 0 and self.ms >= SLOW_QUERY_MS:
+            self.logged = True
+            _get_slow_logger().warning(
+                "%.1f ms rows=%d caller=%s sql=%s", self.ms, self.rows, self.caller, self.sql
+            )
+
+class ProfiledCursor(sqlite3.Cursor):
+    """execute/executemany ve fetch sürelerini ölçen cursor"""
+
+    _record = None
+
+    def _start(self, sql):
+        record = _QueryRecord(normalize_sql(sql), _caller())
+        _recent.append(record)
+        if _capture_enabled:
+            captured = getattr(_capture, "records", None)
+            if captured is None:
+                captured = _capture.records = deque(maxlen=CAPTURE_LIMIT)
+            captured.append(record)
+        self._record = record
+        return record
+
+    def execute(self, sql, parameters=()):
+        record = self._start(sql)
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            record.add((time.perf_counter() - started) * 1000)
+
+    def executemany(self, sql, seq_of_parameters):
+        record = self._start(sql)
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            record.add((time.perf_counter() - started) * 1000, rows=max(self.rowcount, 0))
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        if self._record is not None:
+            self._record.add((time.perf_counter() - started) * 1000, rows=row is not None)
+        return row
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        if self._record is not None:
+            self._record.add((time.perf_counter() - started) * 1000, rows=len(rows))
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        if self._record is not None:
+            self._record.add((time.perf_counter() - started) * 1000, rows=len(rows))
+        return rows
+
+    def __next__(self):
+        started = time.perf_counter()
+        row = super().__next__()
+        if self._record is not None:
+            self._record.add((time.perf_counter() - started) * 1000, rows=1)
+        return row
+
+class ProfiledConnection(sqlite3.Connection):
+    """Tüm sorguları ProfiledCursor üzerinden çalıştıran bağlantı"""
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+def enable_capture():
+    """Sorguları thread bazında toplamaya başla (Streamlit'te her rerun kendi thread'inde çalışır)"""
+    global _capture_enabled
+    _capture_enabled = True
+
+def _as_dicts(records):
+    return [
+        {"sql": record.sql, "caller": record.caller, "ms": record.ms, "rows": record.rows}
+        for record in records
+    ]
+
+def take_captured():
+    """Bu thread'de toplanan sorguları döndür ve listeyi temizle"""
+    records = getattr(_capture, "records", None) or []
+    _capture.records = None
+    return _as_dicts(records)
+
+def summarize(records, limit=10):
+    """Kayıtları normalize SQL'e göre grupla ve toplam süreye göre sırala"""
+    groups = {}
+    for record in records:
+        group = groups.setdefault(record["sql"], {
+            "sql": record["sql"], "count": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0, "callers": set()
+        })
+        group["count"] += 1
+        group["total_ms"] += record["ms"]
+        group["max_ms"] = max(group["max_ms"], record["ms"])
+        group["rows"] += record["rows"]
+        group["callers"].add(record["caller"])
+
+    ordered = sorted(groups.values(), key=lambda group: group["total_ms"], reverse=True)[:limit]
+    for group in ordered:
+        group["avg_ms"] = group["total_ms"] / group["count"]
+        group["callers"] = sorted(group["callers"])
+    return ordered
+
+def get_query_stats(limit=20):
+    """Son RECENT_QUERY_LIMIT sorgudan en çok süre harcayanlar"""
+    return summarize(_as_dicts(list(_recent)), limit)
+
+def reset_query_stats():
+    """Toplanan istatistikleri sıfırla"""
+    _recent.clear()
@@ -0,0 +1,236 @@
+"""
+Sık çalışan sorgular ve plan kontrolü
+
+Model fonksiyonlarının çalıştırdığı sıcak sorgular burada tek yerde üretilir.
+HOT_QUERIES aynı üreticilerle oluşturulur; böylece find_plan_regressions()
+modellerin gerçekten çalıştırdığı SQL'in planını kontrol eder.
+"""
+
+# ============= SORGU ÜRETİCİLERİ =============
+
+ALL_PROJECTS_SQL = "SELECT * FROM projects ORDER BY created_at DESC"
+
+DASHBOARD_COUNTERS_SQL = "SELECT name, value FROM stats_counters WHERE project_id = ?"
+
+EXECUTION_TREND_SQL = """
+    SELECT day,
+           SUM(count) AS total,
+           SUM(CASE WHEN status = 'pass' THEN count ELSE 0 END) AS passed,
+           SUM(CASE WHEN status = 'fail' THEN count ELSE 0 END) AS failed,
+           SUM(CASE WHEN status = 'blocked' THEN count ELSE 0 END) AS blocked,
+           SUM(CASE WHEN status = 'skipped' THEN count ELSE 0 END) AS skipped
+    FROM execution_daily_rollups
+    WHERE project_id = ? AND day BETWEEN ? AND ?
+    GROUP BY day HAVING total > 0 ORDER BY day
+"""
+
+PRIORITY_TREND_SQL = """
+    SELECT day, priority,
+           SUM(count) AS total,
+           SUM(CASE WHEN status = 'pass' THEN count ELSE 0 END) AS passed
+    FROM execution_daily_rollups
+    WHERE project_id = ? AND day BETWEEN ? AND ?
+    GROUP BY day, priority HAVING total > 0 ORDER BY day, priority
+"""
+
+# Zamanı gelmiş bekleyen kayıtlar ve kilit (lease) süresi dolmuş gönderimler
+CLAIM_JIRA_OUTBOX_SQL = """
+    SELECT bug_id FROM (
+        SELECT bug_id FROM jira_outbox
+        WHERE status = 'sending' AND claimed_at <= datetime('now', ?)
+        UNION ALL
+        SELECT bug_id FROM (
+            SELECT bug_id FROM jira_outbox
+            WHERE status = 'pending' AND next_attempt_at <= CURRENT_TIMESTAMP
+            ORDER BY next_attempt_at
+        )
+    ) LIMIT ?
+"""
+
+def _placeholders(values):
+    return ", ".join("?" for _ in values)
+
+def keyset_query(table, conditions, params, order_column, limit=None, cursor=None):
+    """
+    (order_column, id) üzerinden yeniden eskiye keyset sayfalamalı sorgu oluştur.
+    cursor, bir önceki sayfanın son satırının (order_column, id) değeridir.
+    """
+    conditions = list(conditions)
+    params = list(params)
+
+    if cursor is not None:
+        conditions.append(f"({order_column}, id) < (?, ?)")
+        params.extend(cursor)
+
+    query = f"SELECT * FROM {table}"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += f" ORDER BY {order_column} DESC, id DESC"
+
+    if limit:
+        query += " LIMIT ?"
+        params.append(limit)
+
+    return query, params
+
+def steps_for_scenarios_query(scenario_ids):
+    """Verilen senaryoların adımlarını sırasıyla okuyan sorgu"""
+    return (
+        f"""SELECT scenario_id, text FROM scenario_steps
+            WHERE scenario_id IN ({_placeholders(scenario_ids)}) ORDER BY scenario_id, ordinal""",
+        list(scenario_ids)
+    )
+
+def recent_executions_query(project_id, per_scenario, scenario_ids=None):
+    """Her senaryonun son per_scenario execution'ını okuyan sorgu"""
+    # Her senaryo için index'ten yalnızca son N satır okunur; ROW_NUMBER() ile
+    # pencereleme senaryonun tüm geçmişini taradığı için tercih edilmedi
+    query = """
+        SELECT e.* FROM test_scenarios s
+        JOIN test_executions e ON e.id IN (
+            SELECT id FROM test_executions WHERE scenario_id = s.id
+            ORDER BY executed_at DESC, id DESC LIMIT ?)
+        WHERE s.project_id = ?
+    """
+    params = [per_scenario, project_id]
+
+    if scenario_ids is not None:
+        query += f" AND s.id IN ({_placeholders(scenario_ids)})"
+        params.extend(scenario_ids)
+
+    return query, params
+
+def failed_executions_query(project_id, limit=None, since=None):
+    """Projede bug raporu açılmamış başarısız execution'ları okuyan sorgu"""
+    query = """
+        SELECT e.id AS execution_id, e.status, e.executed_at, e.notes,
+               s.id AS scenario_id, s.title, s.description, s.priority
+        -- INDEXED BY + CROSS JOIN: az projeli veritabanlarında istatistikler tam tarama
+        -- önerse de önce yalnızca projenin senaryoları index'ten okunur
+        FROM test_scenarios s INDEXED BY idx_scenarios_project_created
+        CROSS JOIN test_executions e ON e.scenario_id = s.id AND e.status = 'fail'
+        WHERE s.project_id = ?
+          AND NOT EXISTS (SELECT 1 FROM bug_reports b WHERE b.execution_id = e.id)
+    """
+    params = [project_id]
+
+    if since:
+        query += " AND e.executed_at >= ?"
+        params.append(str(since))
+
+    query += " ORDER BY e.executed_at DESC, e.id DESC LIMIT ?"
+    params.append(limit if limit else -1)
+
+    return query, params
+
+def scenarios_by_health_query(project_id, order_column, limit=None, cursor=None,
+                              min_flakiness=None, max_pass_rate=None):
+    """Senaryoları scenario_health index'inden order_column'a göre okuyan sorgu"""
+    query = """
+        SELECT s.*, h.recent_results, h.run_count, h.pass_rate, h.flip_count,
+               h.flakiness_score, h.last_status, h.last_executed_at
+        FROM scenario_health h
+        JOIN test_scenarios s ON s.id = h.scenario_id
+        WHERE h.project_id = ?
+    """
+    params = [project_id]
+
+    if min_flakiness is not None:
+        query += " AND h.flakiness_score >= ?"
+        params.append(min_flakiness)
+    if max_pass_rate is not None:
+        query += " AND h.pass_rate <= ?"
+        params.append(max_pass_rate)
+    if cursor is not None:
+        query += f" AND (h.{order_column}, h.scenario_id) < (?, ?)"
+        params.extend(cursor)
+
+    query += f" ORDER BY h.{order_column} DESC, h.scenario_id DESC"
+    if limit:
+        query += " LIMIT ?"
+        params.append(limit)
+
+    return query, params
+
+def reported_executions_query(execution_ids):
+    """Verilen execution'lardan bug raporu olanları okuyan sorgu"""
+    return (
+        f"SELECT execution_id FROM bug_reports WHERE execution_id IN ({_placeholders(execution_ids)})",
+        list(execution_ids)
+    )
+
+# ============= PLAN KONTROLÜ =============
+
+_CURSOR = ("2100-01-01 00:00:00", 1)
+
+# Index kullanması gereken sorgular: (ad, (sql, parametreler), beklenen index, sıralamaya izin)
+# Sıralamaya izin yalnızca sonucu zaten sınırlı bir küme olan sorgular için verilir
+HOT_QUERIES = [
+    ("get_all_projects", (ALL_PROJECTS_SQL, ()), "idx_projects_created"),
+    ("get_scenarios_by_project",
+     keyset_query("test_scenarios", ["project_id = ?"], [1], "created_at"),
+     "idx_scenarios_project_created"),
+    ("get_scenarios_by_project_page",
+     keyset_query("test_scenarios", ["project_id = ?"], [1], "created_at", limit=25, cursor=_CURSOR),
+     "idx_scenarios_project_created"),
+    ("get_executions_by_scenario",
+     keyset_query("test_executions", ["scenario_id = ?"], [1], "executed_at"),
+     "idx_executions_scenario_executed"),
+    ("get_executions_by_scenario_page",
+     keyset_query("test_executions", ["scenario_id = ?"], [1], "executed_at", limit=25, cursor=_CURSOR),
+     "idx_executions_scenario_executed"),
+    ("get_all_bug_reports_page",
+     keyset_query("bug_reports", [], [], "created_at", limit=10, cursor=_CURSOR),
+     "idx_bug_reports_created"),
+    ("create_bug_reports_bulk (rapor kontrolü)",
+     reported_executions_query([1, 2, 3]),
+     "idx_bug_reports_execution"),
+    ("get_steps_for_scenarios", steps_for_scenarios_query([1, 2, 3]), "PRIMARY KEY"),
+    ("get_recent_executions_for_project",
+     recent_executions_query(1, 5, scenario_ids=[1, 2, 3]),
+     "idx_executions_scenario_executed"),
+    # Projenin başarısız execution'ları tarihe göre sıralanır; project_id
+    # test_executions'ta olmadığından bu sıralama index'ten okunamaz
+    ("get_failed_executions_by_project",
+     failed_executions_query(1, limit=500),
+     "idx_executions_status_scenario", True),
+    ("get_scenarios_by_health",
+     scenarios_by_health_query(1, "flakiness_score", limit=25, cursor=(1.0, 1), min_flakiness=0.3),
+     "idx_scenario_health_flakiness"),
+    ("get_scenarios_by_health_flips",
+     scenarios_by_health_query(1, "flip_count", limit=25),
+     "idx_scenario_health_flips"),
+    ("get_dashboard_stats", (DASHBOARD_COUNTERS_SQL, (0,)), "PRIMARY KEY"),
+    ("get_execution_trend", (EXECUTION_TREND_SQL, (0, "2025-01-01", "2025-03-31")), "PRIMARY KEY"),
+    ("get_priority_trend", (PRIORITY_TREND_SQL, (0, "2025-01-01", "2025-03-31")), "PRIMARY KEY"),
+    ("claim_jira_outbox_batch", (CLAIM_JIRA_OUTBOX_SQL, ("-600 seconds", 50)), "idx_jira_outbox_due"),
+    ("claim_jira_outbox_batch (lease)", (CLAIM_JIRA_OUTBOX_SQL, ("-600 seconds", 50)), "idx_jira_outbox_claimed"),
+]
+
+def explain_query_plan(conn, sql, params=()):
+    """Sorgunun EXPLAIN QUERY PLAN çıktısını satır listesi olarak getir"""
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    return [row[3] for row in rows]
+
+def _full_scans(plan):
+    """Index kullanmadan tüm tabloyu tarayan plan adımları"""
+    return [step for step in plan if step.startswith("SCAN ") and " USING " not in step]
+
+def find_plan_regressions(conn, hot_queries=None):
+    """
+    Beklenen index'i kullanmayan, tam tablo taraması (SCAN) veya geçici
+    sıralama (TEMP B-TREE) yapan sıcak sorguları bul.
+    """
+    regressions = []
+    for name, (sql, params), index_name, *options in hot_queries or HOT_QUERIES:
+        allow_sort = bool(options and options[0])
+        plan = explain_query_plan(conn, sql, params)
+        plan_text = " | ".join(plan)
+        temp_sort = "TEMP B-TREE" in plan_text and not allow_sort
+        if index_name not in plan_text or temp_sort or _full_scans(plan):
+            regressions.append({
+                'query': name,
+                'expected_index': index_name,
+                'plan': plan_text
+            })
+    return regressions
@@ -0,0 +1,58 @@
+"""
+Türetilmiş tabloları yeniden hesaplama komutu
+
+Rollup, sayaç, sağlık ve arama tabloları trigger'larla güncel tutulur; bu komut
+geçmiş veriyi migration beklemeden yeniden doldurmak veya kaymış bir tabloyu
+düzeltmek içindir.
+
+Kullanım:
+    python -m database.rebuild                # tüm tablolar
+    python -m database.rebuild rollups stats  # sadece seçilenler
+"""
+import sys
+import argparse
+from database.db import db_connection, init_database
+from database.migrations import (
+    rebuild_execution_rollups, rebuild_scenario_health, rebuild_search_index, rebuild_stats_counters
+)
+
+REBUILDERS = {
+    "rollups": rebuild_execution_rollups,
+    "stats": rebuild_stats_counters,
+    "health": rebuild_scenario_health,
+    "search": rebuild_search_index,
+}
+
+def rebuild(targets=None):
+    """Seçilen tabloları tek transaction içinde yeniden hesapla, yenilenen hedefleri döndür"""
+    targets = list(targets or REBUILDERS)
+    unknown = [target for target in targets if target not in REBUILDERS]
+    if unknown:
+        raise ValueError(f"Bilinmeyen hedef: {', '.join(unknown)}")
+
+    with db_connection() as conn:
+        # Yeniden hesaplama sırasında trigger'lı yazmalar araya girmesin
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        for target in targets:
+            REBUILDERS[target](conn)
+    return targets
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Türetilmiş tabloları yeniden hesapla")
+    arg_parser.add_argument("targets", nargs="*",
+                            help=f"Yenilenecek tablolar: {', '.join(REBUILDERS)} (varsayılan: hepsi)")
+    args = arg_parser.parse_args()
+
+    # Şema eski ise önce migration'lar uygulanır
+    init_database()
+    try:
+        targets = rebuild(args.targets)
+    except ValueError as e:
+        arg_parser.error(str(e))
+    for target in targets:
+        print(f"✅ {target} yeniden hesaplandı")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,10 +2,11 @@ import streamlit as st
 from database.models import (
     get_all_projects, 
     get_project_by_id,
-    create_test_scenario
+    create_test_scenarios_bulk
 )
-from services.claude_service import generate_test_scenarios
-import json
+from services.claude_service import stream_test_scenarios, generate_test_scenarios_sharded
+import pandas as pd
+from components.sql_profiler import sql_profiler_panel
 
 st.set_page_config(
     page_title="AI Generator - SmartQA",
@@ -51,111 +52,183 @@ st.markdown("---")
 # Generator Ayarları
 st.subheader("⚙️ Generator Ayarları")
 
+generation_mode = st.radio(
+    "Üretim Modu",
+    options=["stream", "bulk"],
+    format_func=lambda mode: {
+        "stream": "⚡ Hızlı (3-10 senaryo, canlı akış)",
+        "bulk": "📦 Toplu (50-500 senaryo, paralel istekler)"
+    }[mode],
+    horizontal=True,
+    key="generation_mode"
+)
+
 col1, col2 = st.columns([3, 1])
 
 with col1:
-    num_scenarios = st.slider(
-        "Kaç adet test senaryosu oluşturulsun?",
-        min_value=3,
-        max_value=10,
-        value=5,
-        help="Claude AI bu kadar test senaryosu üretecek"
-    )
+    if generation_mode == "bulk":
+        num_scenarios = st.slider(
+            "Kaç adet test senaryosu oluşturulsun?",
+            min_value=50,
+            max_value=500,
+            value=50,
+            step=10,
+            help="İstek, özellik alanlarına bölünüp eşzamanlı olarak Claude AI'a gönderilir"
+        )
+    else:
+        num_scenarios = st.slider(
+            "Kaç adet test senaryosu oluşturulsun?",
+            min_value=3,
+            max_value=10,
+            value=5,
+            help="Claude AI bu kadar test senaryosu üretecek"
+        )
 
 with col2:
     st.markdown("")
     st.markdown("")
     generate_button = st.button("✨ Test Senaryoları Üret", type="primary", use_container_width=True)
+    regenerate_button = st.button(
+        "🔄 Yeniden Üret",
+        use_container_width=True,
+        help="Önbellekteki sonucu kullanmadan Claude'dan yeni senaryolar ister"
+    )
 
 st.markdown("---")
 
+# Toplu test senaryosu üretme
+if (generate_button or regenerate_button) and generation_mode == "bulk":
+    st.subheader("📝 Oluşturulan Test Senaryoları")
+
+    progress_bar = st.progress(0.0, text="🤖 Claude AI test senaryoları oluşturuyor...")
+
+    def update_progress(completed, total):
+        progress_bar.progress(completed / total, text=f"🤖 {completed}/{total} parça tamamlandı...")
+
+    result = generate_test_scenarios_sharded(
+        project_name=selected_project['name'],
+        project_url=selected_project['url'],
+        project_description=selected_project['description'],
+        num_scenarios=num_scenarios,
+        use_cache=not regenerate_button,
+        progress_callback=update_progress
+    )
+    progress_bar.empty()
+
+    for error in result['errors']:
+        st.error(f"❌ Parça {error['shard']} ({error['area']}) üretilemedi: {error['error']}")
+
+    if not result['scenarios']:
+        st.warning("⚠️ Test senaryosu oluşturulamadı. Lütfen tekrar deneyin.")
+    else:
+        save_result = create_test_scenarios_bulk(
+            project_id=selected_project_id,
+            scenarios=result['scenarios'],
+            created_by_ai=True
+        )
+
+        for error in save_result['errors']:
+            st.error(f"❌ Senaryo #{error['index'] + 1} ({error['title']}) kaydedilemedi: {error['error']}")
+
+        st.success(
+            f"✅ {len(result['scenarios'])} adet test senaryosu {result['shard_count']} paralel istekle "
+            f"{result['elapsed']:.1f} saniyede oluşturuldu, {save_result['saved_count']} tanesi database'e kaydedildi!"
+        )
+        if result['duplicate_count']:
+            st.caption(f"🔁 Parçalar arasında tekrar eden {result['duplicate_count']} senaryo ayıklandı.")
+        if len(result['scenarios']) < num_scenarios:
+            st.warning(f"⚠️ İstenen {num_scenarios} senaryodan {len(result['scenarios'])} tanesi üretilebildi.")
+        st.balloons()
+
+        # Çok sayıda senaryo olduğundan expander yerine tablo göster
+        st.dataframe(
+            pd.DataFrame([
+                {
+                    "Başlık": scenario['title'],
+                    "Öncelik": str(scenario.get('priority', 'medium')).upper(),
+                    "Adım Sayısı": len(scenario.get('steps', []))
+                }
+                for scenario in result['scenarios']
+            ]),
+            use_container_width=True,
+            hide_index=True
+        )
+
+        # Bilgilendirme
+        st.markdown("---")
+        st.info("🎯 Test senaryolarınızı **Test Execution** sayfasından çalıştırabilirsiniz!")
+
 # Test senaryoları üretme
-if generate_button:
-    with st.spinner("🤖 Claude AI test senaryoları oluşturuyor... (15-30 saniye sürebilir)"):
-        
-        # Claude'dan test senaryoları al
-        result = generate_test_scenarios(
+elif generate_button or regenerate_button:
+    st.subheader("📝 Oluşturulan Test Senaryoları")
+
+    status_box = st.empty()
+    status_box.info("🤖 Claude AI test senaryoları oluşturuyor... İlk senaryolar birkaç saniye içinde görünecek.")
+
+    priority_colors = {
+        "critical": "🔥",
+        "high": "🔴",
+        "medium": "🟡",
+        "low": "🟢"
+    }
+
+    received_count = 0
+    saved_count = 0
+
+    try:
+        # Her senaryo token akışında tamamlandığı anda gelir
+        for scenario in stream_test_scenarios(
             project_name=selected_project['name'],
             project_url=selected_project['url'],
             project_description=selected_project['description'],
-            num_scenarios=num_scenarios
-        )
-        
-        # Hata kontrolü
-        if result.startswith("Hata:"):
-            st.error(f"❌ {result}")
-            st.stop()
-        
-        try:
-            # JSON parse et
-            # Claude bazen markdown code block içinde döndürür, temizle
-            if "```json" in result:
-                result = result.split("```json")[1].split("```")[0].strip()
-            elif "```" in result:
-                result = result.split("```")[1].split("```")[0].strip()
-            
-            data = json.loads(result)
-            scenarios = data.get("test_scenarios", [])
+            num_scenarios=num_scenarios,
+            use_cache=not regenerate_button
+        ):
+            received_count += 1
             
-            if len(scenarios) == 0:
-                st.warning("⚠️ Test senaryosu oluşturulamadı. Lütfen tekrar deneyin.")
-                st.stop()
+            # Gelen senaryoyu hemen kaydet
+            save_result = create_test_scenarios_bulk(
+                project_id=selected_project_id,
+                scenarios=[scenario],
+                created_by_ai=True
+            )
             
-            # Başarı mesajı
-            st.success(f"✅ {len(scenarios)} adet test senaryosu başarıyla oluşturuldu!")
+            if save_result['errors']:
+                st.error(f"❌ Senaryo #{received_count} kaydedilemedi: {save_result['errors'][0]['error']}")
+                continue
             
-            # Senaryoları database'e kaydet
-            saved_count = 0
-            for scenario in scenarios:
-                try:
-                    create_test_scenario(
-                        project_id=selected_project_id,
-                        title=scenario['title'],
-                        description=scenario['description'],
-                        steps=scenario['steps'],
-                        priority=scenario['priority'],
-                        created_by_ai=True
-                    )
-                    saved_count += 1
-                except Exception as e:
-                    st.error(f"❌ Senaryo kaydedilemedi: {str(e)}")
+            saved_count += 1
+            status_box.info(f"🤖 {received_count}/{num_scenarios} senaryo alındı, üretim devam ediyor...")
             
-            st.info(f"💾 {saved_count} test senaryosu database'e kaydedildi!")
-            st.balloons()
-            
-            # Oluşturulan senaryoları göster
-            st.markdown("---")
-            st.subheader("📝 Oluşturulan Test Senaryoları")
-            
-            for idx, scenario in enumerate(scenarios, 1):
-                with st.expander(f"**Test #{idx}: {scenario['title']}**", expanded=False):
-                    
-                    # Priority badge
-                    priority_colors = {
-                        "high": "🔴",
-                        "medium": "🟡",
-                        "low": "🟢"
-                    }
-                    st.markdown(f"{priority_colors.get(scenario['priority'], '⚪')} **Priority:** {scenario['priority'].upper()}")
-                    
-                    # Description
-                    st.markdown(f"**Açıklama:** {scenario['description']}")
-                    
-                    # Steps
-                    st.markdown("**Test Adımları:**")
-                    for step_idx, step in enumerate(scenario['steps'], 1):
-                        st.markdown(f"{step_idx}. {step}")
-            
-            # Bilgilendirme
-            st.markdown("---")
-            st.info("🎯 Test senaryolarınızı **Test Execution** sayfasından çalıştırabilirsiniz!")
+            with st.expander(f"**Test #{received_count}: {scenario['title']}**", expanded=False):
+
+                # Priority badge
+                priority = str(scenario.get('priority', 'medium')).lower()
+                st.markdown(f"{priority_colors.get(priority, '⚪')} **Priority:** {priority.upper()}")
+
+                # Description
+                st.markdown(f"**Açıklama:** {scenario.get('description', '')}")
+
+                # Steps
+                st.markdown("**Test Adımları:**")
+                for step_idx, step in enumerate(scenario['steps'], 1):
+                    st.markdown(f"{step_idx}. {step}")
+
+    except Exception as e:
+        st.error(f"❌ {str(e)}")
+
+    if received_count == 0:
+        status_box.warning("⚠️ Test senaryosu oluşturulamadı. Lütfen tekrar deneyin.")
+    else:
+        status_box.success(f"✅ {received_count} adet test senaryosu oluşturuldu, {saved_count} tanesi database'e kaydedildi!")
+        st.balloons()
         
-        except json.JSONDecodeError as e:
-            st.error(f"❌ JSON parse hatası: {str(e)}")
-            st.code(result)
-        except Exception as e:
-            st.error(f"❌ Beklenmeyen hata: {str(e)}")
+        # Bilgilendirme
+        st.markdown("---")
+        st.info("🎯 Test senaryolarınızı **Test Execution** sayfasından çalıştırabilirsiniz!")
 
 # Footer
 st.markdown("---")
-st.caption("💡 İpucu: Claude AI, projenizin URL ve açıklamasını analiz ederek ilgili test senaryoları oluşturur.")
\ No newline at end of file
+st.caption("💡 İpucu: Claude AI, projenizin URL ve açıklamasını analiz ederek ilgili test senaryoları oluşturur.")
+
+sql_profiler_panel()
@@ -2,15 +2,24 @@ import streamlit as st
 from database.models import (
     get_all_projects,
     get_project_by_id,
-    get_scenarios_by_project,
     get_scenario_by_id,
-    get_executions_by_scenario,
+    get_scenario_steps,
+    get_failed_executions_by_project,
+    get_dashboard_stats,
     create_bug_report,
-    get_all_bug_reports
+    create_bug_reports_bulk,
+    get_all_bug_reports,
+    get_jira_outbox_status,
+    count_pending_jira_pushes
 )
-from services.claude_service import generate_bug_report
-from services.jira_service import create_jira_issue, test_jira_connection
-import json
+from components.pagination import keyset_paginator
+from components.search import search_panel
+from components.export import export_panel
+from services.claude_service import generate_bug_report, generate_bug_reports_batch
+from services.llm_parser import parse_bug_report
+from services.jira_service import test_jira_connection, get_jira_call_timings
+from services.jira_outbox import queue_jira_pushes, start_jira_worker
+from components.sql_profiler import sql_profiler_panel
 
 st.set_page_config(
     page_title="Bug Reports - SmartQA",
@@ -49,33 +58,75 @@ with tab1:
     
     selected_project_id = project_names[selected_project_name]
     
-    # Test senaryolarını getir
-    scenarios = get_scenarios_by_project(selected_project_id)
-    
-    if len(scenarios) == 0:
+    # Projede senaryo yoksa erken çık
+    if get_dashboard_stats(selected_project_id)['total_scenarios'] == 0:
         st.info("📝 Bu projede henüz test senaryosu yok.")
         st.stop()
     
-    # Sadece fail olan execution'ları bul
-    failed_scenarios = []
-    for scenario in scenarios:
-        executions = get_executions_by_scenario(scenario['id'])
-        for execution in executions:
-            if execution['status'] == 'fail':
-                failed_scenarios.append({
-                    'scenario': scenario,
-                    'execution': execution
-                })
+    # Önceki toplu üretimin sonucu (rerun sonrası gösterilir)
+    batch_result = st.session_state.pop('batch_bug_result', None)
+    if batch_result:
+        if batch_result['saved_count']:
+            st.success(f"✅ {batch_result['saved_count']} bug raporu AI ile oluşturulup kaydedildi!")
+        if batch_result['errors']:
+            st.error(f"❌ {len(batch_result['errors'])} test için bug raporu oluşturulamadı:")
+            for error in batch_result['errors']:
+                st.markdown(f"- **{error['title']}** (#{error['execution_id']}): {error['error']}")
+
+    # Bug raporu açılmamış başarısız execution'ları tek sorguda getir
+    failed_executions = get_failed_executions_by_project(selected_project_id, limit=500)
     
-    if len(failed_scenarios) == 0:
-        st.info("✅ Bu projede başarısız test yok. Bug raporu oluşturmak için önce bir testi 'fail' olarak işaretleyin.")
+    if len(failed_executions) == 0:
+        st.info("✅ Bu projede bug raporu bekleyen başarısız test yok. Bug raporu oluşturmak için önce bir testi 'fail' olarak işaretleyin.")
     else:
         st.markdown("---")
         
+        # Toplu AI bug raporu
+        col1, col2 = st.columns([3, 1])
+
+        with col1:
+            st.markdown("### ⚡ Toplu AI Bug Raporu")
+            st.markdown(f"Bug raporu bekleyen **{len(failed_executions)}** başarısız testin tamamı için Claude AI ile rapor oluşturun.")
+
+        with col2:
+            st.markdown("")
+            st.markdown("")
+            batch_button = st.button("🤖 Tümü İçin AI ile Oluştur", use_container_width=True)
+
+        if batch_button:
+            # Listede gösterilenle sınırlı kalmamak için tüm bekleyenleri getir
+            pending_failures = get_failed_executions_by_project(selected_project_id)
+            progress_bar = st.progress(0.0, text=f"🤖 0/{len(pending_failures)} bug raporu oluşturuldu...")
+
+            def update_progress(completed, total):
+                progress_bar.progress(completed / total, text=f"🤖 {completed}/{total} bug raporu oluşturuldu...")
+
+            generation = generate_bug_reports_batch(pending_failures, progress_callback=update_progress)
+            save_result = create_bug_reports_bulk(generation['reports'], ai_generated=True)
+
+            # Kayıt hatalarını başlıklarıyla birlikte listele
+            titles = {row['execution_id']: row['title'] for row in pending_failures}
+            errors = generation['errors'] + [
+                {
+                    'execution_id': error['execution_id'],
+                    'title': titles.get(error['execution_id'], '-'),
+                    'error': error['error']
+                }
+                for error in save_result['errors']
+            ]
+
+            st.session_state['batch_bug_result'] = {
+                'saved_count': save_result['saved_count'],
+                'errors': errors
+            }
+            st.rerun()
+
+        st.markdown("---")
+
         # Başarısız test seçimi
         failed_test_options = {
-            f"{item['scenario']['title']} - {item['execution']['executed_at'][:16]}": item
-            for item in failed_scenarios
+            f"{row['title']} - {row['executed_at'][:16]} (#{row['execution_id']})": row
+            for row in failed_executions
         }
         
         selected_test_name = st.selectbox(
@@ -84,9 +135,10 @@ with tab1:
             help="Bug raporu oluşturmak istediğiniz başarısız testi seçin"
         )
         
-        selected_item = failed_test_options[selected_test_name]
-        selected_scenario = selected_item['scenario']
-        selected_execution = selected_item['execution']
+        # Satır hem senaryo hem execution kolonlarını içerir
+        selected_scenario = failed_test_options[selected_test_name]
+        selected_execution = selected_scenario
+        selected_steps = get_scenario_steps(selected_scenario['scenario_id'])
         
         # Seçilen test detayları
         with st.expander("📋 Test Detayları", expanded=True):
@@ -94,13 +146,9 @@ with tab1:
             st.markdown(f"**Açıklama:** {selected_scenario['description']}")
             st.markdown(f"**Test Notları:** {selected_execution['notes'] if selected_execution['notes'] else 'Yok'}")
             
-            try:
-                steps = json.loads(selected_scenario['steps'])
-                st.markdown("**Test Adımları:**")
-                for idx, step in enumerate(steps, 1):
-                    st.markdown(f"{idx}. {step}")
-            except:
-                st.markdown(f"**Test Adımları:** {selected_scenario['steps']}")
+            st.markdown("**Test Adımları:**")
+            for idx, step in enumerate(selected_steps, 1):
+                st.markdown(f"{idx}. {step}")
         
         st.markdown("---")
         
@@ -114,35 +162,32 @@ with tab1:
             st.markdown("")
             st.markdown("")
             generate_ai_button = st.button("✨ AI ile Oluştur", type="primary", use_container_width=True)
+            regenerate_ai_button = st.button(
+                "🔄 Yeniden Üret",
+                use_container_width=True,
+                help="Önbellekteki sonucu kullanmadan Claude'dan yeni bir rapor ister"
+            )
         
-        if generate_ai_button:
+        if generate_ai_button or regenerate_ai_button:
             with st.spinner("🤖 Claude AI bug raporu oluşturuyor..."):
                 
                 # Test adımlarını string'e çevir
-                try:
-                    steps = json.loads(selected_scenario['steps'])
-                    steps_text = "\n".join([f"{i+1}. {step}" for i, step in enumerate(steps)])
-                except:
-                    steps_text = selected_scenario['steps']
+                steps_text = "\n".join([f"{i+1}. {step}" for i, step in enumerate(selected_steps)])
                 
                 # AI'dan bug raporu al
                 result = generate_bug_report(
                     test_title=selected_scenario['title'],
                     test_steps=steps_text,
-                    failure_notes=selected_execution['notes'] or "Belirtilmemiş"
+                    failure_notes=selected_execution['notes'] or "Belirtilmemiş",
+                    use_cache=not regenerate_ai_button
                 )
                 
                 if result.startswith("Hata:"):
                     st.error(f"❌ {result}")
                 else:
                     try:
-                        # JSON parse et
-                        if "```json" in result:
-                            result = result.split("```json")[1].split("```")[0].strip()
-                        elif "```" in result:
-                            result = result.split("```")[1].split("```")[0].strip()
-                        
-                        bug_data = json.loads(result)
+                        # JSON parse et (kesik/hatalı yanıtlar onarılır)
+                        bug_data = parse_bug_report(result)
                         
                         # Session state'e kaydet (form için)
                         st.session_state['ai_bug_title'] = bug_data['title']
@@ -226,7 +271,7 @@ with tab1:
                 else:
                     # Bug raporu oluştur
                     bug_id = create_bug_report(
-                        execution_id=selected_execution['id'],
+                        execution_id=selected_execution['execution_id'],
                         title=bug_title,
                         severity=severity,
                         description=description,
@@ -266,15 +311,67 @@ with tab2:
                         st.success(result['message'])
                 else:
                     st.error(result['message'])
+
+                timings = get_jira_call_timings()
+                if timings and not result.get('mock_mode'):
+                    st.caption(f"⏱️ {timings[-1]['elapsed_ms']} ms, {timings[-1]['attempts']} deneme")
     
     st.markdown("---")
     
-    bugs = get_all_bug_reports()
+    search_active = search_panel("bug_search", None, ["bug"])
+
+    # Bug raporlarını ve test sonuçlarını dosya olarak dışa aktar
+    export_panel("bug_export", ["bugs", "executions"])
+
+    total_bugs = get_dashboard_stats()['total_bugs']
     
-    if len(bugs) == 0:
+    if total_bugs == 0:
         st.info("👋 Henüz bug raporu oluşturmadınız.")
-    else:
-        st.markdown(f"**Toplam {len(bugs)} bug raporu bulundu.**")
+    elif not search_active:
+        st.markdown(f"**Toplam {total_bugs} bug raporu bulundu.**")
+
+        # Bug raporlarını sayfa sayfa getir
+        bugs = keyset_paginator(
+            "bug_reports",
+            lambda limit, cursor: get_all_bug_reports(limit=limit, cursor=cursor),
+            default_page_size=10
+        )
+
+        # Jira kuyruk durumları (sayfadaki bug'lar için tek sorgu)
+        outbox = get_jira_outbox_status([bug['id'] for bug in bugs])
+
+        pending_pushes = count_pending_jira_pushes()
+        if pending_pushes:
+            # Önceki bir process'te kuyruğa alınmış kayıtlar da gönderilsin
+            start_jira_worker()
+            col1, col2 = st.columns([4, 1])
+            with col1:
+                st.info(f"⏳ {pending_pushes} bug raporu arka planda Jira'ya gönderiliyor.")
+            with col2:
+                st.button("🔄 Durumu Yenile", key="jira_outbox_refresh", use_container_width=True)
+
+        # Seçilen bug'ları tek işlemde Jira kuyruğuna al
+        with st.expander("🎫 Toplu Jira Aktarımı", expanded=False):
+            bug_options = {
+                bug['id']: bug for bug in bugs
+                if not bug['jira_issue_key']
+                and outbox.get(bug['id'], {'status': None})['status'] not in ('pending', 'sending')
+            }
+            selected_bug_ids = st.multiselect(
+                "Jira'ya aktarılacak bug raporları",
+                options=list(bug_options.keys()),
+                format_func=lambda bug_id: f"#{bug_id} - {bug_options[bug_id]['title']}",
+                key="jira_bulk_select"
+            )
+
+            if st.button("🎫 Seçilenleri Jira'ya Aktar", type="primary", disabled=not selected_bug_ids):
+                queued = queue_jira_pushes(selected_bug_ids)
+                st.session_state['jira_queue_message'] = f"✅ {queued} bug raporu Jira kuyruğuna alındı."
+                st.rerun()
+
+        if 'jira_queue_message' in st.session_state:
+            st.success(st.session_state.pop('jira_queue_message'))
+
         st.markdown("---")
         
         # Her bug için kart
@@ -320,109 +417,29 @@ with tab2:
                 
                 st.markdown("---")
                 
-                # Butonlar - 3 kolon
-                col1, col2, col3 = st.columns([2, 2, 2])
-                
-                with col1:
-                    # TXT indirme butonu
-                    bug_text = f"""
-BUG REPORT #{bug['id']}
-==================
-
-Title: {bug['title']}
-Severity: {bug['severity'].upper()}
-Date: {bug['created_at'][:10]}
-
-Description:
-{bug['description']}
-
-Steps to Reproduce:
-{bug['steps_to_reproduce']}
-
-Expected Result:
-{bug['expected_result']}
-
-Actual Result:
-{bug['actual_result']}
-"""
-                    st.download_button(
-                        label="📄 TXT İndir",
-                        data=bug_text,
-                        file_name=f"bug_report_{bug['id']}.txt",
-                        mime="text/plain",
-                        key=f"download_txt_{bug['id']}"
-                    )
-                
-                with col2:
-                    # Markdown indirme butonu
-                    bug_markdown = f"""# Bug Report #{bug['id']}
-
-## {bug['title']}
-
-**Severity:** {severity_emoji} {bug['severity'].upper()}  
-**Date:** {bug['created_at'][:10]}  
-**AI Generated:** {'Yes' if bug['ai_generated'] else 'No'}
-
----
-
-## 📝 Description
-
-{bug['description']}
-
----
-
-## 🔄 Steps to Reproduce
-```
-{bug['steps_to_reproduce']}
-```
-
----
-
-## ✅ Expected Result
-
-{bug['expected_result']}
-
----
-
-## ❌ Actual Result
-
-{bug['actual_result']}
-
----
-
-*Generated by SmartQA - AI Test Assistant*
-"""
-                    st.download_button(
-                        label="📝 MD İndir",
-                        data=bug_markdown,
-                        file_name=f"bug_report_{bug['id']}.md",
-                        mime="text/markdown",
-                        key=f"download_md_{bug['id']}"
-                    )
+                # JIRA: issue açıldıysa link, kuyruktaysa durum, değilse kuyruğa alma butonu
+                push = outbox.get(bug['id'])
                 
-                with col3:
-                    # JIRA BUTONU
-                    if st.button("🎫 Jira'da Task Aç", key=f"jira_{bug['id']}", type="primary"):
-                        with st.spinner("Jira issue oluşturuluyor..."):
-                            result = create_jira_issue(
-                                bug_title=f"[SmartQA] {bug['title']}",
-                                bug_description=bug['description'],
-                                steps_to_reproduce=bug['steps_to_reproduce'],
-                                expected_result=bug['expected_result'],
-                                actual_result=bug['actual_result'],
-                                severity=bug['severity']
-                            )
-                            
-                            if result['success']:
-                                st.success(result['message'])
-                                
-                                # Issue URL'i göster
-                                if 'issue_url' in result:
-                                    st.markdown(f"**🔗 Jira Link:** [{result['issue_key']}]({result['issue_url']})")
-                                    st.balloons()
-                            else:
-                                st.error(result['message'])
+                if bug['jira_issue_key']:
+                    st.markdown(f"**🔗 Jira:** [{bug['jira_issue_key']}]({bug['jira_issue_url']})")
+                elif push and push['status'] in ('pending', 'sending'):
+                    st.info("⏳ Jira'ya gönderiliyor...")
+                    if push['last_error']:
+                        st.caption(f"Son hata ({push['attempts']}. deneme): {push['last_error']}")
+                elif push and push['status'] == 'failed':
+                    st.error(f"❌ Jira'ya gönderilemedi: {push['last_error']}")
+                    if push['needs_verification']:
+                        st.caption("⚠️ Issue Jira'da açılmış olabilir; tekrar denemede önce Jira'da aranır.")
+                    if st.button("🔁 Tekrar Dene", key=f"jira_retry_{bug['id']}"):
+                        queue_jira_pushes([bug['id']])
+                        st.rerun()
+                elif st.button("🎫 Jira'da Task Aç", key=f"jira_{bug['id']}", type="primary"):
+                    queue_jira_pushes([bug['id']])
+                    st.session_state['jira_queue_message'] = f"✅ Bug #{bug['id']} Jira kuyruğuna alındı."
+                    st.rerun()
 
 # Footer
 st.markdown("---")
-st.caption("💡 **İpucu:** AI ile oluşturulan bug raporlarını istediğiniz gibi düzenleyebilir ve Jira'ya gönderebilirsiniz.")
\ No newline at end of file
+st.caption("💡 **İpucu:** AI ile oluşturulan bug raporlarını istediğiniz gibi düzenleyebilir ve Jira'ya gönderebilirsiniz.")
+
+sql_profiler_panel()
@@ -2,12 +2,20 @@ import streamlit as st
 from database.models import (
     get_all_projects,
     get_project_by_id,
-    get_scenarios_by_project,
     get_scenario_by_id,
+    get_steps_for_scenarios,
+    get_scenario_health,
     create_test_execution,
-    get_executions_by_scenario
+    create_test_executions_bulk,
+    get_executions_by_scenario,
+    get_recent_executions_for_project,
+    get_dashboard_stats
 )
-import json
+from components.health import scenario_list, health_caption
+from components.pagination import keyset_paginator
+from components.search import search_panel
+from components.sql_profiler import sql_profiler_panel
+import pandas as pd
 from datetime import datetime
 
 st.set_page_config(
@@ -40,135 +48,262 @@ selected_project_name = st.selectbox(
 selected_project_id = project_names[selected_project_name]
 selected_project = get_project_by_id(selected_project_id)
 
-# Test senaryolarını getir
-scenarios = get_scenarios_by_project(selected_project_id)
+# Projedeki senaryo sayısı (sayaç tablosundan)
+total_scenarios = get_dashboard_stats(selected_project_id)['total_scenarios']
 
-if len(scenarios) == 0:
+if total_scenarios == 0:
     st.info("📝 Bu projede henüz test senaryosu yok. **AI Generator** sayfasından test senaryoları oluşturabilirsiniz.")
     st.stop()
 
 st.markdown("---")
 
-# Test senaryoları listesi
-st.subheader(f"📋 Test Senaryoları ({len(scenarios)} adet)")
+# Senaryo ve execution notlarında arama
+search_active = search_panel("execution_search", selected_project_id, ["scenario", "execution"])
 
-# Her senaryo için kart
-for scenario in scenarios:
-    with st.expander(f"**{scenario['title']}**", expanded=False):
+if search_active:
+    run_mode = None
+else:
+    # Çalıştırma modu seçimi
+    run_mode = st.radio(
+        "🧭 Çalıştırma Modu",
+        options=["single", "batch"],
+        format_func=lambda x: {
+            "single": "📋 Tekli Çalıştırma",
+            "batch": "🧪 Toplu Koşum"
+        }[x],
+        horizontal=True,
+        key="execution_run_mode",
+        help="Toplu koşumda seçilen tüm senaryoların sonuçları tek seferde kaydedilir"
+    )
+
+    # Test senaryolarını seçilen sıralama/filtreye göre getir; toplu koşum tüm
+    # koşunun tek seferde kaydedilebilmesi için sayfalanmamış listeyi kullanır
+    scenarios = scenario_list(
+        f"execution_scenarios_{selected_project_id}", selected_project_id,
+        paginate=(run_mode == "single")
+    )
+    health_by_scenario = get_scenario_health([scenario['id'] for scenario in scenarios])
+
+if run_mode == "batch":
+    st.subheader("🧪 Toplu Test Koşumu")
+
+    # Bir önceki kaydın sonucu
+    if 'batch_run_result' in st.session_state:
+        batch_result = st.session_state.pop('batch_run_result')
+        st.success(f"✅ {batch_result['saved_count']} test sonucu tek seferde kaydedildi!")
+        for error in batch_result['errors']:
+            st.error(f"❌ Satır #{error['index'] + 1} kaydedilemedi: {error['error']}")
+
+    scenario_options = {f"{s['title']} (ID: {s['id']})": s for s in scenarios}
+    selected_scenario_names = st.multiselect(
+        "Koşuma dahil edilecek senaryolar",
+        options=list(scenario_options.keys()),
+        default=list(scenario_options.keys())
+    )
+
+    if len(selected_scenario_names) == 0:
+        st.info("📝 Koşum için en az bir senaryo seçin.")
+    else:
+        flakiness = {scenario_id: health['flakiness_score'] for scenario_id, health in health_by_scenario.items()}
+        run_grid = pd.DataFrame([
+            {
+                "scenario_id": scenario_options[name]['id'],
+                "Senaryo": scenario_options[name]['title'],
+                "Öncelik": scenario_options[name]['priority'],
+                "Flakiness": flakiness.get(scenario_options[name]['id']),
+                "Durum": None,
+                "Notlar": ""
+            }
+            for name in selected_scenario_names
+        ])
         
-        # Priority badge
-        priority_colors = {
-            "high": "🔴",
-            "medium": "🟡",
-            "low": "🟢"
-        }
-        priority_emoji = priority_colors.get(scenario['priority'], '⚪')
+        with st.form("batch_run_form"):
+            st.caption("Durumu boş bırakılan senaryolar kaydedilmez.")
+
+            edited_grid = st.data_editor(
+                run_grid,
+                column_config={
+                    "scenario_id": None,  # Gizli kolon
+                    "Durum": st.column_config.SelectboxColumn(
+                        "Durum",
+                        options=["pass", "fail", "blocked", "skipped"]
+                    ),
+                    "Flakiness": st.column_config.NumberColumn("Flakiness", format="%.2f"),
+                    "Notlar": st.column_config.TextColumn("Notlar", width="large")
+                },
+                disabled=["Senaryo", "Öncelik", "Flakiness"],
+                hide_index=True,
+                use_container_width=True
+            )
+
+            batch_submit = st.form_submit_button("💾 Tüm Sonuçları Kaydet", type="primary")
         
-        col1, col2 = st.columns([3, 1])
+        if batch_submit:
+            results = [
+                {
+                    'scenario_id': int(row['scenario_id']),
+                    'status': row['Durum'],
+                    'notes': row['Notlar'] or ""
+                }
+                for row in edited_grid.to_dict('records')
+                if row['Durum']
+            ]
+
+            if len(results) == 0:
+                st.warning("⚠️ Kaydedilecek sonuç yok. En az bir senaryonun durumunu seçin.")
+            else:
+                st.session_state['batch_run_result'] = create_test_executions_bulk(results)
+                st.rerun()
+
+elif run_mode == "single":
+    # Test senaryoları listesi
+    st.subheader(f"📋 Test Senaryoları ({total_scenarios} adet)")
+
+    # Sayfadaki tüm senaryoların adımlarını ve son 5 çalıştırmasını tek sorguda getir
+    page_scenario_ids = [scenario['id'] for scenario in scenarios]
+    steps_by_scenario = get_steps_for_scenarios(page_scenario_ids)
+    recent_executions = get_recent_executions_for_project(
+        selected_project_id, per_scenario=5, scenario_ids=page_scenario_ids
+    )
+
+    # Her senaryo için kart
+    for scenario in scenarios:
+        with st.expander(f"**{scenario['title']}**", expanded=False):
+
+            # Priority badge
+            priority_colors = {
+                "high": "🔴",
+                "medium": "🟡",
+                "low": "🟢"
+            }
+            priority_emoji = priority_colors.get(scenario['priority'], '⚪')
         
-        with col1:
-            st.markdown(f"{priority_emoji} **Priority:** {scenario['priority'].upper()}")
-            st.markdown(f"**Açıklama:** {scenario['description']}")
+            col1, col2 = st.columns([3, 1])
+
+            with col1:
+                st.markdown(f"{priority_emoji} **Priority:** {scenario['priority'].upper()}")
+                st.markdown(f"**Açıklama:** {scenario['description']}")
             
-            if scenario['created_by_ai']:
-                st.caption("🤖 AI tarafından oluşturuldu")
+                if scenario['created_by_ai']:
+                    st.caption("🤖 AI tarafından oluşturuldu")
+                health_caption(health_by_scenario.get(scenario['id']))
         
-        with col2:
-            st.caption(f"📅 {scenario['created_at'][:10]}")
+            with col2:
+                st.caption(f"📅 {scenario['created_at'][:10]}")
         
-        st.markdown("---")
+            st.markdown("---")
         
-        # Test adımlarını göster
-        st.markdown("**📝 Test Adımları:**")
+            # Test adımlarını göster
+            st.markdown("**📝 Test Adımları:**")
         
-        try:
-            steps = json.loads(scenario['steps'])
-            for idx, step in enumerate(steps, 1):
+            for idx, step in enumerate(steps_by_scenario[scenario['id']], 1):
                 st.markdown(f"{idx}. {step}")
-        except:
-            st.markdown(scenario['steps'])
         
-        st.markdown("---")
+            st.markdown("---")
         
-        # Test execution formu
-        st.markdown("**🎯 Test Sonucu Kaydet**")
+            # Test execution formu
+            st.markdown("**🎯 Test Sonucu Kaydet**")
         
-        with st.form(f"execution_form_{scenario['id']}"):
-            col1, col2, col3 = st.columns(3)
+            with st.form(f"execution_form_{scenario['id']}"):
+                col1, col2, col3 = st.columns(3)
             
-            with col1:
-                status = st.selectbox(
-                    "Test Durumu",
-                    options=["pass", "fail", "blocked", "skipped"],
-                    format_func=lambda x: {
-                        "pass": "✅ Pass (Başarılı)",
-                        "fail": "❌ Fail (Başarısız)",
-                        "blocked": "🚫 Blocked (Engellendi)",
-                        "skipped": "⏭️ Skipped (Atlandı)"
-                    }[x],
-                    key=f"status_{scenario['id']}"
-                )
+                with col1:
+                    status = st.selectbox(
+                        "Test Durumu",
+                        options=["pass", "fail", "blocked", "skipped"],
+                        format_func=lambda x: {
+                            "pass": "✅ Pass (Başarılı)",
+                            "fail": "❌ Fail (Başarısız)",
+                            "blocked": "🚫 Blocked (Engellendi)",
+                            "skipped": "⏭️ Skipped (Atlandı)"
+                        }[x],
+                        key=f"status_{scenario['id']}"
+                    )
             
-            with col2:
-                st.markdown("")  # Spacing
+                with col2:
+                    st.markdown("")  # Spacing
             
-            with col3:
-                st.markdown("")  # Spacing
+                with col3:
+                    st.markdown("")  # Spacing
             
-            notes = st.text_area(
-                "Test Notları",
-                placeholder="Test sırasında dikkat çeken noktalar, hatalar veya gözlemler...",
-                height=100,
-                key=f"notes_{scenario['id']}"
-            )
+                notes = st.text_area(
+                    "Test Notları",
+                    placeholder="Test sırasında dikkat çeken noktalar, hatalar veya gözlemler...",
+                    height=100,
+                    key=f"notes_{scenario['id']}"
+                )
             
-            submit_button = st.form_submit_button("💾 Sonucu Kaydet", type="primary")
+                submit_button = st.form_submit_button("💾 Sonucu Kaydet", type="primary")
             
-            if submit_button:
-                # Test execution kaydet
-                execution_id = create_test_execution(
-                    scenario_id=scenario['id'],
-                    status=status,
-                    notes=notes
-                )
+                if submit_button:
+                    # Test execution kaydet
+                    execution_id = create_test_execution(
+                        scenario_id=scenario['id'],
+                        status=status,
+                        notes=notes
+                    )
                 
-                st.success(f"✅ Test sonucu kaydedildi! (Execution ID: {execution_id})")
+                    st.success(f"✅ Test sonucu kaydedildi! (Execution ID: {execution_id})")
                 
-                # Eğer fail ise bug report önerisi
-                if status == "fail":
-                    st.warning("⚠️ Test başarısız oldu! **Bug Reports** sayfasından bug raporu oluşturabilirsiniz.")
+                    # Eğer fail ise bug report önerisi
+                    if status == "fail":
+                        st.warning("⚠️ Test başarısız oldu! **Bug Reports** sayfasından bug raporu oluşturabilirsiniz.")
                 
-                st.rerun()
+                    st.rerun()
         
-        # Geçmiş execution'ları göster
-        executions = get_executions_by_scenario(scenario['id'])
+            # Son 5 execution'ı göster
+            executions = recent_executions.get(scenario['id'], [])
         
-        if len(executions) > 0:
-            st.markdown("---")
-            st.markdown(f"**📊 Geçmiş Çalıştırmalar ({len(executions)} adet)**")
+            if len(executions) > 0:
+                st.markdown("---")
+                st.markdown("**📊 Son Çalıştırmalar**")
             
-            for exe in executions[:5]:  # Son 5 execution
-                status_emoji = {
-                    "pass": "✅",
-                    "fail": "❌",
-                    "blocked": "🚫",
-                    "skipped": "⏭️"
-                }
+                for exe in executions:
+                    status_emoji = {
+                        "pass": "✅",
+                        "fail": "❌",
+                        "blocked": "🚫",
+                        "skipped": "⏭️"
+                    }
                 
-                exe_emoji = status_emoji.get(exe['status'], '❓')
+                    exe_emoji = status_emoji.get(exe['status'], '❓')
                 
-                col1, col2, col3 = st.columns([2, 2, 3])
+                    col1, col2, col3 = st.columns([2, 2, 3])
                 
-                with col1:
-                    st.caption(f"{exe_emoji} {exe['status'].upper()}")
+                    with col1:
+                        st.caption(f"{exe_emoji} {exe['status'].upper()}")
                 
-                with col2:
-                    st.caption(f"📅 {exe['executed_at'][:16]}")
+                    with col2:
+                        st.caption(f"📅 {exe['executed_at'][:16]}")
                 
-                with col3:
-                    if exe['notes']:
-                        st.caption(f"💬 {exe['notes'][:50]}...")
+                    with col3:
+                        if exe['notes']:
+                            st.caption(f"💬 {exe['notes'][:50]}...")
+
+                # Tüm geçmiş yalnızca istenirse sayfa sayfa okunur
+                if st.toggle("📜 Tüm Geçmişi Göster", key=f"show_history_{scenario['id']}"):
+                    history = keyset_paginator(
+                        f"history_{scenario['id']}",
+                        lambda limit, cursor: get_executions_by_scenario(scenario['id'], limit=limit, cursor=cursor),
+                        order_column="executed_at"
+                    )
+                    st.dataframe(
+                        pd.DataFrame(
+                            [
+                                {
+                                    "Durum": exe['status'].upper(),
+                                    "Tarih": exe['executed_at'][:16],
+                                    "Notlar": exe['notes'] or ""
+                                }
+                                for exe in history
+                            ]
+                        ),
+                        use_container_width=True,
+                        hide_index=True
+                    )
 
 # Footer
 st.markdown("---")
-st.caption("💡 İpucu: Başarısız testler için Bug Reports sayfasından detaylı bug raporu oluşturabilirsiniz.")
\ No newline at end of file
+st.caption("💡 İpucu: Başarısız testler için Bug Reports sayfasından detaylı bug raporu oluşturabilirsiniz.")
+
+sql_profiler_panel()
@@ -2,13 +2,19 @@ import streamlit as st
 from database.models import (
     get_all_projects,
     get_project_by_id,
-    get_scenarios_by_project,
     get_scenario_by_id,
+    get_steps_for_scenarios,
+    get_scenario_health,
     create_test_scenario,
     update_test_scenario,
-    delete_test_scenario
+    delete_test_scenario,
+    get_dashboard_stats
 )
-import json
+from components.health import scenario_list, health_caption
+from components.search import search_panel
+from components.sql_profiler import sql_profiler_panel
+from services.import_service import IMPORT_EXTENSIONS, import_scenarios
+import pandas as pd
 
 st.set_page_config(
     page_title="Test Scenarios - SmartQA",
@@ -44,17 +50,26 @@ selected_project = get_project_by_id(selected_project_id)
 st.markdown("---")
 
 # Tab yapısı
-tab1, tab2 = st.tabs(["📋 Mevcut Senaryolar", "➕ Yeni Senaryo Ekle"])
+tab1, tab2, tab3 = st.tabs(["📋 Mevcut Senaryolar", "➕ Yeni Senaryo Ekle", "📥 İçe Aktar"])
 
 # ============= TAB 1: Mevcut Senaryolar =============
 with tab1:
-    scenarios = get_scenarios_by_project(selected_project_id)
+    search_active = search_panel("scenario_search", selected_project_id, ["scenario"])
+    total_scenarios = get_dashboard_stats(selected_project_id)['total_scenarios']
     
-    if len(scenarios) == 0:
+    if total_scenarios == 0:
         st.info("📝 Bu projede henüz test senaryosu yok. **'Yeni Senaryo Ekle'** sekmesinden manuel olarak ekleyebilir veya **AI Generator** sayfasından otomatik oluşturabilirsiniz.")
-    else:
-        st.subheader(f"📋 Test Senaryoları ({len(scenarios)} adet)")
+    elif not search_active:
+        st.subheader(f"📋 Test Senaryoları ({total_scenarios} adet)")
+
+        # Senaryoları seçilen sıralama/filtreye göre sayfa sayfa getir
+        scenarios = scenario_list(f"scenarios_{selected_project_id}", selected_project_id)
         
+        # Sayfadaki tüm senaryoların adımlarını ve sağlık bilgilerini tek sorguda getir
+        scenario_ids = [scenario['id'] for scenario in scenarios]
+        steps_by_scenario = get_steps_for_scenarios(scenario_ids)
+        health_by_scenario = get_scenario_health(scenario_ids)
+
         for scenario in scenarios:
             with st.expander(f"**{scenario['title']}**", expanded=False):
                 
@@ -73,6 +88,7 @@ with tab1:
                     st.markdown(f"{priority_emoji} **Priority:** {scenario['priority'].upper()}")
                     if scenario['created_by_ai']:
                         st.caption("🤖 AI tarafından oluşturuldu")
+                    health_caption(health_by_scenario.get(scenario['id']))
                 
                 with col2:
                     st.caption(f"📅 {scenario['created_at'][:10]}")
@@ -89,15 +105,9 @@ with tab1:
                 # Session state için key
                 session_key = f"edit_steps_{scenario['id']}"
                 
-                # Steps'i parse et ve session state'e yükle
-                try:
-                    current_steps = json.loads(scenario['steps'])
-                except:
-                    current_steps = [scenario['steps']]
-                
-                # İlk yüklemede session state'e kaydet
+                # İlk yüklemede adımları session state'e kaydet
                 if session_key not in st.session_state:
-                    st.session_state[session_key] = current_steps.copy()
+                    st.session_state[session_key] = list(steps_by_scenario[scenario['id']])
                 
                 # Düzenleme formu
                 st.markdown("### ✏️ Senaryoyu Düzenle")
@@ -283,6 +293,67 @@ with tab2:
         **Öncelik:** High
         """)
 
+# ============= TAB 3: İçe Aktar =============
+with tab3:
+    st.subheader("📥 Test Senaryolarını İçe Aktar")
+    st.markdown("""
+    Mevcut test senaryolarınızı **CSV**, **JSON/JSONL** veya **Gherkin (.feature)** dosyasından toplu olarak aktarın.
+    Projede aynı başlıkla bulunan senaryolar atlanır, hatalı kayıtlar raporlanır.
+    """)
+
+    uploaded_file = st.file_uploader(
+        "Dosya seçin",
+        type=list(IMPORT_EXTENSIONS.keys()),
+        key=f"import_file_{selected_project_id}"
+    )
+
+    if st.button("📥 İçe Aktarmayı Başlat", type="primary", disabled=uploaded_file is None):
+        progress_bar = st.progress(0.0, text="📥 Senaryolar içe aktarılıyor...")
+
+        def update_progress(read_bytes, total_bytes):
+            fraction = read_bytes / total_bytes if total_bytes else 1.0
+            progress_bar.progress(fraction, text=f"📥 Senaryolar içe aktarılıyor... %{int(fraction * 100)}")
+
+        result = import_scenarios(selected_project_id, uploaded_file, uploaded_file.name, update_progress)
+        progress_bar.empty()
+
+        if isinstance(result, str):
+            st.error(f"❌ {result}")
+        else:
+            st.success(f"✅ {result['saved_count']} test senaryosu içe aktarıldı.")
+            if result['duplicate_count']:
+                st.info(f"🔁 Projede zaten bulunan {result['duplicate_count']} senaryo atlandı.")
+
+            if result['errors']:
+                st.warning(f"⚠️ {len(result['errors'])} kayıt aktarılamadı.")
+                errors_df = pd.DataFrame(result['errors']).rename(columns={
+                    "line": "Satır / Kayıt", "title": "Başlık", "error": "Hata"
+                })
+                st.dataframe(errors_df, use_container_width=True, hide_index=True)
+                st.download_button(
+                    label="📄 Hata Raporunu İndir",
+                    data=errors_df.to_csv(index=False).encode("utf-8-sig"),
+                    file_name="import_errors.csv",
+                    mime="text/csv",
+                    key="import_errors_download"
+                )
+
+    with st.expander("💡 İpucu: Dosya Formatları", expanded=False):
+        st.markdown("""
+        **CSV:** `title`, `description`, `steps`, `priority` kolonları. Adımlar hücrede satır satır
+        ya da `|` ile ayrılarak veya `Step 1`, `Step 2`... kolonlarında verilebilir.
+
+        **JSON / JSONL:** Her kayıt `{"title": ..., "description": ..., "steps": [...], "priority": ...}` biçiminde;
+        JSON dosyası bir dizi veya `test_scenarios` anahtarlı bir obje olabilir.
+
+        **Gherkin (.feature):** Her `Scenario` bir test senaryosudur. `Background` adımları her senaryoya eklenir,
+        `@critical`, `@high`, `@p1` gibi etiketler önceliği belirler.
+
+        **Öncelik:** critical / high / medium / low (P0-P3, blocker, major, minor da kabul edilir). Boşsa medium.
+        """)
+
 # Footer
 st.markdown("---")
-st.caption("💡 **İpucu:** AI Generator ile otomatik senaryolar oluşturabilir, buradan manuel olarak düzenleyebilirsiniz.")
\ No newline at end of file
+st.caption("💡 **İpucu:** AI Generator ile otomatik senaryolar oluşturabilir, buradan manuel olarak düzenleyebilirsiniz.")
+
+sql_profiler_panel()
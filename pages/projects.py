@@ -3,9 +3,10 @@ from database.models import (
     create_project, 
     get_all_projects, 
     delete_project,
-    get_scenarios_by_project
+    get_dashboard_stats
 )
 from datetime import datetime
+from components.sql_profiler import sql_profiler_panel
 
 # Sayfa konfigürasyonu
 st.set_page_config(
@@ -48,8 +49,8 @@ with tab1:
                         st.markdown(f"_{project['description']}_")
                     
                     # Test senaryosu sayısı
-                    scenarios = get_scenarios_by_project(project['id'])
-                    st.caption(f"📊 {len(scenarios)} test senaryosu")
+                    project_stats = get_dashboard_stats(project['id'])
+                    st.caption(f"📊 {project_stats['total_scenarios']} test senaryosu")
                 
                 with col2:
                     st.caption(f"📅 {project['created_at'][:10]}")
@@ -108,4 +109,6 @@ with tab2:
 
 # Footer
 st.markdown("---")
-st.caption("💡 İpucu: Projelerinizi organize tutmak için açıklayıcı isimler kullanın.")
\ No newline at end of file
+st.caption("💡 İpucu: Projelerinizi organize tutmak için açıklayıcı isimler kullanın.")
+
+sql_profiler_panel()
@@ -1,6 +1,14 @@
 import os
+import re
 import json
+import time
+import math
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
+from services.llm_cache import make_cache_key, get_cached_response, store_response
+from services.llm_parser import IncrementalScenarioParser, extract_scenarios, parse_bug_report
+from database.models import get_steps_for_scenarios
 
 # .env dosyasını yükle
 load_dotenv()
@@ -8,173 +16,276 @@ load_dotenv()
 # DEMO MODE: API key yoksa veya krediniz bittiyse mock data kullan
 USE_MOCK_AI = True  # False yapınca gerçek API kullanır
 
-def generate_test_scenarios(project_name, project_url, project_description, num_scenarios=5):
+CLAUDE_MODEL = "claude-sonnet-4-20250514"
+
+# Toplu (parçalı) üretim ayarları
+SHARD_SIZE = 25  # Tek istekte istenen senaryo sayısı
+SHARD_MAX_TOKENS = 8000
+MAX_CONCURRENT_REQUESTS = int(os.getenv("SMARTQA_LLM_CONCURRENCY", "5"))
+
+# Parçaların bölüştürüldüğü özellik alanları
+FEATURE_AREAS = [
+    "Kimlik doğrulama ve hesap yönetimi",
+    "Arama, listeleme ve filtreleme",
+    "Form girişleri ve veri doğrulama",
+    "Sepet, ödeme ve sipariş akışları",
+    "Yetkilendirme ve güvenlik",
+    "Hata durumları ve sınır değerler",
+    "Performans ve eşzamanlı kullanım",
+    "Responsive tasarım ve erişilebilirlik",
+    "Bildirimler, e-posta ve mesajlaşma",
+    "Entegrasyonlar, API ve veri dışa aktarma"
+]
+
+def _get_client():
+    """Anthropic client oluştur; API key yoksa None döndür"""
+    from anthropic import Anthropic
+
+    api_key = os.getenv("ANTHROPIC_API_KEY")
+    if not api_key:
+        return None
+
+    try:
+        return Anthropic(api_key=api_key)
+    except TypeError:
+        import anthropic
+        return anthropic.Client(api_key=api_key)
+
+def _call_claude(prompt, max_tokens, use_cache=True):
     """
-    Proje bilgilerine göre test senaryoları üret
+    Claude API'yi çağır. Aynı model, prompt ve parametreler için daha önce alınmış
+    yanıt varsa API'ye gitmeden önbellekten döndürür; use_cache=False önbelleği atlar.
     """
+    cache_key = make_cache_key(CLAUDE_MODEL, prompt, max_tokens=max_tokens)
+
+    if use_cache:
+        cached = get_cached_response(cache_key)
+        if cached is not None:
+            return cached
+
+    client = _get_client()
+    if client is None:
+        return "Hata: ANTHROPIC_API_KEY bulunamadı!"
+
+    try:
+        response = client.messages.create(
+            model=CLAUDE_MODEL,
+            max_tokens=max_tokens,
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        )
+
+        result = response.content[0].text
+        # max_tokens'ta kesilen yanıt TTL boyunca tekrar kullanılmasın
+        if response.stop_reason != "max_tokens":
+            store_response(cache_key, CLAUDE_MODEL, result)
+        return result
+
+    except Exception as e:
+        return f"Hata: {str(e)}"
+
+def _stream_claude(prompt, max_tokens, use_cache=True):
+    """
+    Claude yanıtını metin parçaları halinde akıtan generator.
+    Önbellekte yanıt varsa tek parça olarak döner; akış tamamlanınca yanıt önbelleğe yazılır.
+    ANTHROPIC_BASE_URL ortam değişkeni ile yerel bir test sunucusuna yönlendirilebilir.
+    """
+    cache_key = make_cache_key(CLAUDE_MODEL, prompt, max_tokens=max_tokens)
     
-    if USE_MOCK_AI:
-        # MOCK DATA - Demo için
-        mock_scenarios = [
-            {
-                "title": "Kullanıcı Kayıt İşlemi Testi",
-                "description": "Yeni kullanıcının başarılı bir şekilde kayıt olabilmesini doğrular",
-                "steps": [
-                    "Ana sayfada 'Kayıt Ol' butonuna tıkla",
-                    "Gerekli bilgileri doldur (ad, email, şifre)",
-                    "Şartlar ve koşulları kabul et checkbox'ını işaretle",
-                    "'Hesap Oluştur' butonuna tıkla",
-                    "Email doğrulama mesajının geldiğini kontrol et",
-                    "Başarılı kayıt mesajının göründüğünü doğrula"
-                ],
-                "priority": "high"
-            },
-            {
-                "title": "Login Fonksiyonelliği Testi",
-                "description": "Kayıtlı kullanıcının sisteme giriş yapabilmesini test eder",
-                "steps": [
-                    "Login sayfasına git",
-                    "Geçerli email ve şifre gir",
-                    "'Giriş Yap' butonuna tıkla",
-                    "Dashboard sayfasına yönlendirildiğini doğrula",
-                    "Kullanıcı adının header'da göründüğünü kontrol et"
-                ],
-                "priority": "high"
-            },
-            {
-                "title": "Ürün Arama Fonksiyonu Testi",
-                "description": "Kullanıcının ürün arayabilmesini ve sonuçları görebilmesini test eder",
-                "steps": [
-                    "Ana sayfadaki arama kutusuna bir ürün adı yaz",
-                    "Enter tuşuna bas veya ara butonuna tıkla",
-                    "Arama sonuçlarının yüklendiğini bekle",
-                    "İlgili ürünlerin listelendiğini doğrula",
-                    "Sonuç sayısının gösterildiğini kontrol et"
-                ],
-                "priority": "medium"
-            },
-            {
-                "title": "Sepete Ürün Ekleme Testi",
-                "description": "Ürünlerin sepete eklenebilmesini ve sepet içeriğinin doğru gösterilmesini test eder",
-                "steps": [
-                    "Bir ürün detay sayfasına git",
-                    "Ürün miktarını seç",
-                    "'Sepete Ekle' butonuna tıkla",
-                    "Sepet ikonundaki sayının arttığını doğrula",
-                    "Sepet sayfasına git",
-                    "Eklenen ürünün sepette göründüğünü kontrol et"
-                ],
-                "priority": "high"
-            },
-            {
-                "title": "Şifre Sıfırlama Testi",
-                "description": "Kullanıcının unutulan şifresini sıfırlayabilmesini test eder",
-                "steps": [
-                    "Login sayfasında 'Şifremi Unuttum' linkine tıkla",
-                    "Kayıtlı email adresini gir",
-                    "'Sıfırlama Linki Gönder' butonuna tıkla",
-                    "Email'in geldiğini kontrol et",
-                    "Email'deki linke tıkla",
-                    "Yeni şifre oluştur ve kaydet",
-                    "Yeni şifre ile login olabildiğini doğrula"
-                ],
-                "priority": "medium"
-            },
-            {
-                "title": "Ödeme İşlemi Testi",
-                "description": "Kullanıcının sepetteki ürünleri satın alabilmesini test eder",
-                "steps": [
-                    "Sepete en az bir ürün ekle",
-                    "'Ödemeye Geç' butonuna tıkla",
-                    "Teslimat adresini doldur",
-                    "Ödeme yöntemi seç (Kredi Kartı)",
-                    "Kart bilgilerini gir",
-                    "'Siparişi Tamamla' butonuna tıkla",
-                    "Sipariş onay sayfasının göründüğünü doğrula"
-                ],
-                "priority": "critical"
-            },
-            {
-                "title": "Ürün Filtreleme Testi",
-                "description": "Kategori ve fiyat filtrelerinin doğru çalıştığını test eder",
-                "steps": [
-                    "Ürün listesi sayfasına git",
-                    "Bir kategori seç (örn: Elektronik)",
-                    "Sadece seçilen kategorideki ürünlerin göründüğünü doğrula",
-                    "Fiyat aralığı belirle (örn: 100-500 TL)",
-                    "Filtrelerin uygulandığını ve sonuçların değiştiğini kontrol et"
-                ],
-                "priority": "medium"
-            },
-            {
-                "title": "Profil Bilgileri Güncelleme Testi",
-                "description": "Kullanıcının profil bilgilerini güncelleyebilmesini test eder",
-                "steps": [
-                    "Profil sayfasına git",
-                    "'Bilgilerimi Düzenle' butonuna tıkla",
-                    "Ad, telefon gibi bilgileri güncelle",
-                    "'Kaydet' butonuna tıkla",
-                    "Başarı mesajının göründüğünü doğrula",
-                    "Güncellemelerin kaydedildiğini kontrol et"
-                ],
-                "priority": "low"
-            },
-            {
-                "title": "Responsive Tasarım Testi",
-                "description": "Web sitesinin mobil cihazlarda düzgün görüntülendiğini test eder",
-                "steps": [
-                    "Tarayıcıyı mobil görünüme al (veya gerçek mobil cihaz kullan)",
-                    "Ana sayfanın düzgün yüklendiğini kontrol et",
-                    "Menünün hamburger ikon olarak göründüğünü doğrula",
-                    "Sayfa içi elementlerin mobilde okunabilir olduğunu kontrol et",
-                    "Butonların tıklanabilir boyutta olduğunu test et"
-                ],
-                "priority": "medium"
-            },
-            {
-                "title": "Logout İşlemi Testi",
-                "description": "Kullanıcının güvenli bir şekilde çıkış yapabilmesini test eder",
-                "steps": [
-                    "Login olmuş bir kullanıcı ile devam et",
-                    "Kullanıcı menüsünden 'Çıkış Yap' seçeneğine tıkla",
-                    "Login sayfasına yönlendirildiğini doğrula",
-                    "Tarayıcı back tuşu ile geri gidildiğinde korumalı sayfalara erişilemediğini kontrol et"
-                ],
-                "priority": "high"
-            }
-        ]
-        
-        # Kullanıcının istediği kadar senaryo döndür
-        selected_scenarios = mock_scenarios[:num_scenarios]
-        
-        result = {
-            "test_scenarios": selected_scenarios
-        }
-        
-        return json.dumps(result, ensure_ascii=False, indent=2)
+    if use_cache:
+        cached = get_cached_response(cache_key)
+        if cached is not None:
+            yield cached
+            return
     
-    else:
-        # GERÇEK API KULLANIMI
-        from anthropic import Anthropic
-        
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if not api_key:
-            return "Hata: ANTHROPIC_API_KEY bulunamadı!"
-        
-        try:
-            client = Anthropic(api_key=api_key)
-        except TypeError:
-            import anthropic
-            client = anthropic.Client(api_key=api_key)
-        
-        prompt = f"""
+    client = _get_client()
+    if client is None:
+        raise RuntimeError("Hata: ANTHROPIC_API_KEY bulunamadı!")
+
+    collected = []
+    try:
+        with client.messages.stream(
+            model=CLAUDE_MODEL,
+            max_tokens=max_tokens,
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        ) as stream:
+            for text in stream.text_stream:
+                collected.append(text)
+                yield text
+            stop_reason = stream.get_final_message().stop_reason
+    except Exception as e:
+        raise RuntimeError(f"Hata: {str(e)}") from e
+
+    # max_tokens'ta kesilen yanıt (ör. büyük bir parça) önbelleğe yazılmaz
+    if stop_reason != "max_tokens":
+        store_response(cache_key, CLAUDE_MODEL, "".join(collected))
+
+# MOCK DATA - Demo için
+MOCK_SCENARIOS = [
+    {
+        "title": "Kullanıcı Kayıt İşlemi Testi",
+        "description": "Yeni kullanıcının başarılı bir şekilde kayıt olabilmesini doğrular",
+        "steps": [
+            "Ana sayfada 'Kayıt Ol' butonuna tıkla",
+            "Gerekli bilgileri doldur (ad, email, şifre)",
+            "Şartlar ve koşulları kabul et checkbox'ını işaretle",
+            "'Hesap Oluştur' butonuna tıkla",
+            "Email doğrulama mesajının geldiğini kontrol et",
+            "Başarılı kayıt mesajının göründüğünü doğrula"
+        ],
+        "priority": "high"
+    },
+    {
+        "title": "Login Fonksiyonelliği Testi",
+        "description": "Kayıtlı kullanıcının sisteme giriş yapabilmesini test eder",
+        "steps": [
+            "Login sayfasına git",
+            "Geçerli email ve şifre gir",
+            "'Giriş Yap' butonuna tıkla",
+            "Dashboard sayfasına yönlendirildiğini doğrula",
+            "Kullanıcı adının header'da göründüğünü kontrol et"
+        ],
+        "priority": "high"
+    },
+    {
+        "title": "Ürün Arama Fonksiyonu Testi",
+        "description": "Kullanıcının ürün arayabilmesini ve sonuçları görebilmesini test eder",
+        "steps": [
+            "Ana sayfadaki arama kutusuna bir ürün adı yaz",
+            "Enter tuşuna bas veya ara butonuna tıkla",
+            "Arama sonuçlarının yüklendiğini bekle",
+            "İlgili ürünlerin listelendiğini doğrula",
+            "Sonuç sayısının gösterildiğini kontrol et"
+        ],
+        "priority": "medium"
+    },
+    {
+        "title": "Sepete Ürün Ekleme Testi",
+        "description": "Ürünlerin sepete eklenebilmesini ve sepet içeriğinin doğru gösterilmesini test eder",
+        "steps": [
+            "Bir ürün detay sayfasına git",
+            "Ürün miktarını seç",
+            "'Sepete Ekle' butonuna tıkla",
+            "Sepet ikonundaki sayının arttığını doğrula",
+            "Sepet sayfasına git",
+            "Eklenen ürünün sepette göründüğünü kontrol et"
+        ],
+        "priority": "high"
+    },
+    {
+        "title": "Şifre Sıfırlama Testi",
+        "description": "Kullanıcının unutulan şifresini sıfırlayabilmesini test eder",
+        "steps": [
+            "Login sayfasında 'Şifremi Unuttum' linkine tıkla",
+            "Kayıtlı email adresini gir",
+            "'Sıfırlama Linki Gönder' butonuna tıkla",
+            "Email'in geldiğini kontrol et",
+            "Email'deki linke tıkla",
+            "Yeni şifre oluştur ve kaydet",
+            "Yeni şifre ile login olabildiğini doğrula"
+        ],
+        "priority": "medium"
+    },
+    {
+        "title": "Ödeme İşlemi Testi",
+        "description": "Kullanıcının sepetteki ürünleri satın alabilmesini test eder",
+        "steps": [
+            "Sepete en az bir ürün ekle",
+            "'Ödemeye Geç' butonuna tıkla",
+            "Teslimat adresini doldur",
+            "Ödeme yöntemi seç (Kredi Kartı)",
+            "Kart bilgilerini gir",
+            "'Siparişi Tamamla' butonuna tıkla",
+            "Sipariş onay sayfasının göründüğünü doğrula"
+        ],
+        "priority": "critical"
+    },
+    {
+        "title": "Ürün Filtreleme Testi",
+        "description": "Kategori ve fiyat filtrelerinin doğru çalıştığını test eder",
+        "steps": [
+            "Ürün listesi sayfasına git",
+            "Bir kategori seç (örn: Elektronik)",
+            "Sadece seçilen kategorideki ürünlerin göründüğünü doğrula",
+            "Fiyat aralığı belirle (örn: 100-500 TL)",
+            "Filtrelerin uygulandığını ve sonuçların değiştiğini kontrol et"
+        ],
+        "priority": "medium"
+    },
+    {
+        "title": "Profil Bilgileri Güncelleme Testi",
+        "description": "Kullanıcının profil bilgilerini güncelleyebilmesini test eder",
+        "steps": [
+            "Profil sayfasına git",
+            "'Bilgilerimi Düzenle' butonuna tıkla",
+            "Ad, telefon gibi bilgileri güncelle",
+            "'Kaydet' butonuna tıkla",
+            "Başarı mesajının göründüğünü doğrula",
+            "Güncellemelerin kaydedildiğini kontrol et"
+        ],
+        "priority": "low"
+    },
+    {
+        "title": "Responsive Tasarım Testi",
+        "description": "Web sitesinin mobil cihazlarda düzgün görüntülendiğini test eder",
+        "steps": [
+            "Tarayıcıyı mobil görünüme al (veya gerçek mobil cihaz kullan)",
+            "Ana sayfanın düzgün yüklendiğini kontrol et",
+            "Menünün hamburger ikon olarak göründüğünü doğrula",
+            "Sayfa içi elementlerin mobilde okunabilir olduğunu kontrol et",
+            "Butonların tıklanabilir boyutta olduğunu test et"
+        ],
+        "priority": "medium"
+    },
+    {
+        "title": "Logout İşlemi Testi",
+        "description": "Kullanıcının güvenli bir şekilde çıkış yapabilmesini test eder",
+        "steps": [
+            "Login olmuş bir kullanıcı ile devam et",
+            "Kullanıcı menüsünden 'Çıkış Yap' seçeneğine tıkla",
+            "Login sayfasına yönlendirildiğini doğrula",
+            "Tarayıcı back tuşu ile geri gidildiğinde korumalı sayfalara erişilemediğini kontrol et"
+        ],
+        "priority": "high"
+    }
+]
+
+# Mock akış: parça boyutu (karakter) ve parçalar arası bekleme (saniye)
+MOCK_STREAM_CHUNK_SIZE = 40
+MOCK_STREAM_DELAY = 0.01
+
+def _mock_scenarios_json(num_scenarios):
+    """Mock senaryoları Claude yanıtı formatında JSON string olarak döndür"""
+    result = {
+        "test_scenarios": MOCK_SCENARIOS[:num_scenarios]
+    }
+    return json.dumps(result, ensure_ascii=False, indent=2)
+
+def _mock_stream(text):
+    """Metni token akışı gibi küçük parçalar halinde ver"""
+    for index in range(0, len(text), MOCK_STREAM_CHUNK_SIZE):
+        time.sleep(MOCK_STREAM_DELAY)
+        yield text[index:index + MOCK_STREAM_CHUNK_SIZE]
+
+def _build_scenarios_prompt(project_name, project_url, project_description, num_scenarios, focus=None):
+    """Test senaryosu üretimi için prompt oluştur; focus verilirse senaryolar o alana odaklanır"""
+    focus_text = ""
+    if focus:
+        focus_text = f"""
+ODAK ALANI:
+Senaryoların tamamı yalnızca şu alanı kapsasın: {focus}
+"""
+    return f"""
 Sen bir profesyonel Software Test Engineer'sın. Aşağıdaki proje için test senaryoları oluştur.
 
 PROJE BİLGİLERİ:
 - Proje Adı: {project_name}
 - URL: {project_url if project_url else 'Belirtilmemiş'}
 - Açıklama: {project_description if project_description else 'Belirtilmemiş'}
-
+{focus_text}
 GÖREV:
 {num_scenarios} adet detaylı test senaryosu oluştur. Her test senaryosu için:
 - Açıklayıcı bir başlık
@@ -201,25 +312,161 @@ GÖREV:
 Sadece JSON formatında yanıt ver, başka açıklama ekleme.
 """
 
-        try:
-            response = client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=2000,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            
-            result = response.content[0].text
-            return result
-        
-        except Exception as e:
-            return f"Hata: {str(e)}"
+def generate_test_scenarios(project_name, project_url, project_description, num_scenarios=5, use_cache=True):
+    """
+    Proje bilgilerine göre test senaryoları üret
+    use_cache=False ise önbellekteki yanıt yerine yeni bir üretim yapılır
+    """
+
+    if USE_MOCK_AI:
+        # MOCK DATA - Demo için
+        return _mock_scenarios_json(num_scenarios)
+
+    else:
+        # GERÇEK API KULLANIMI
+        prompt = _build_scenarios_prompt(project_name, project_url, project_description, num_scenarios)
+        return _call_claude(prompt, max_tokens=2000, use_cache=use_cache)
 
 
-def generate_bug_report(test_title, test_steps, failure_notes):
+def stream_test_scenarios(project_name, project_url, project_description, num_scenarios=5, use_cache=True):
+    """
+    Test senaryolarını üretildikçe tek tek döndüren generator.
+    Her senaryo, JSON objesi token akışında tamamlanır tamamlanmaz yield edilir.
+    Hata durumunda RuntimeError fırlatır.
+    """
+    parser = IncrementalScenarioParser()
+
+    if USE_MOCK_AI:
+        # MOCK: Gerçek akışı taklit etmek için JSON'u küçük parçalar halinde ver
+        text_chunks = _mock_stream(_mock_scenarios_json(num_scenarios))
+    else:
+        prompt = _build_scenarios_prompt(project_name, project_url, project_description, num_scenarios)
+        text_chunks = _stream_claude(prompt, max_tokens=2000, use_cache=use_cache)
+
+    for chunk in text_chunks:
+        for scenario in parser.feed(chunk):
+            yield scenario
+
+    # Yanıt max_tokens sınırında kesildiyse son objeden kurtarılabileni ver
+    for scenario in parser.finish():
+        yield scenario
+
+
+def _normalize_title(title):
+    """Tekrar tespiti için başlığı sadeleştir (büyük/küçük harf, aksan, noktalama)"""
+    text = unicodedata.normalize("NFKD", str(title).casefold().replace("ı", "i"))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+def _plan_shards(num_scenarios):
+    """Toplam senaryo sayısını özellik alanlarına dağıtılmış parçalara böl"""
+    shard_count = max(1, math.ceil(num_scenarios / SHARD_SIZE))
+    base, extra = divmod(num_scenarios, shard_count)
+
+    shards = []
+    for index in range(shard_count):
+        area = FEATURE_AREAS[index % len(FEATURE_AREAS)]
+        # Aynı alan birden fazla parçaya düştüyse kaçıncı grup olduğunu belirt
+        group = index // len(FEATURE_AREAS) + 1
+        focus = area if group == 1 else f"{area} (bu alandaki {group}. grup; daha önce üretilmiş olabilecek temel senaryolardan farklı, ileri seviye senaryolar üret)"
+        shards.append({
+            'index': index,
+            'area': area,
+            'focus': focus,
+            'count': base + (1 if index < extra else 0)
+        })
+    return shards
+
+def _mock_shard(shard):
+    """MOCK: Parça için alan adıyla çeşitlendirilmiş senaryolar üret"""
+    time.sleep(MOCK_STREAM_DELAY * 50)  # Ağ gecikmesini taklit et
+    scenarios = []
+    for offset in range(shard['count']):
+        base = MOCK_SCENARIOS[(shard['index'] + offset) % len(MOCK_SCENARIOS)]
+        title = f"{base['title']} - {shard['area']}"
+        variation = offset // len(MOCK_SCENARIOS)
+        if variation:
+            title += f" (Varyasyon {variation + 1})"
+        scenarios.append({**base, "title": title})
+    return scenarios
+
+def _generate_shard(project_name, project_url, project_description, shard, use_cache):
+    """Tek bir parçayı üret ve tamamlanmış senaryo objelerini liste olarak döndür"""
+    if USE_MOCK_AI:
+        return _mock_shard(shard)
+
+    prompt = _build_scenarios_prompt(
+        project_name, project_url, project_description, shard['count'], focus=shard['focus']
+    )
+    result = _call_claude(prompt, max_tokens=SHARD_MAX_TOKENS, use_cache=use_cache)
+    if result.startswith("Hata:"):
+        raise RuntimeError(result)
+
+    # Yanıt kesik olsa bile tamamlanmış senaryoları kurtar
+    scenarios = extract_scenarios(result)['scenarios']
+    if not scenarios:
+        raise RuntimeError("Hata: Yanıtta test senaryosu bulunamadı")
+    return scenarios
+
+def generate_test_scenarios_sharded(project_name, project_url, project_description, num_scenarios=50,
+                                    use_cache=True, progress_callback=None):
+    """
+    Çok sayıda test senaryosunu özellik alanlarına bölünmüş eşzamanlı isteklerle üret.
+    En fazla MAX_CONCURRENT_REQUESTS istek aynı anda çalışır; sonuçlar parça sırasıyla
+    birleştirilir ve parçalar arası tekrar eden başlıklar ayıklanır.
+    progress_callback(tamamlanan_parça, toplam_parça) çağıran thread'de çağrılır.
+    """
+    started = time.time()
+    shards = _plan_shards(num_scenarios)
+    shard_results = {}
+    errors = []
+
+    with ThreadPoolExecutor(max_workers=max(1, min(MAX_CONCURRENT_REQUESTS, len(shards)))) as executor:
+        futures = {
+            executor.submit(
+                _generate_shard, project_name, project_url, project_description, shard, use_cache
+            ): shard
+            for shard in shards
+        }
+
+        for completed, future in enumerate(as_completed(futures), 1):
+            shard = futures[future]
+            try:
+                shard_results[shard['index']] = future.result()
+            except Exception as e:
+                errors.append({'shard': shard['index'] + 1, 'area': shard['area'], 'error': str(e)})
+
+            if progress_callback:
+                progress_callback(completed, len(shards))
+
+    scenarios = []
+    seen_titles = set()
+    duplicate_count = 0
+    for index in sorted(shard_results):
+        for scenario in shard_results[index]:
+            if not isinstance(scenario, dict):
+                continue
+            key = _normalize_title(scenario.get('title', ''))
+            if key in seen_titles:
+                duplicate_count += 1
+                continue
+            seen_titles.add(key)
+            scenarios.append(scenario)
+
+    return {
+        'scenarios': scenarios[:num_scenarios],
+        'errors': sorted(errors, key=lambda error: error['shard']),
+        'duplicate_count': duplicate_count,
+        'shard_count': len(shards),
+        'elapsed': time.time() - started
+    }
+
+
+def generate_bug_report(test_title, test_steps, failure_notes, use_cache=True):
     """
     Başarısız test için bug raporu üret
+    use_cache=False ise önbellekteki yanıt yerine yeni bir üretim yapılır
     """
     
     if USE_MOCK_AI:
@@ -237,18 +484,6 @@ def generate_bug_report(test_title, test_steps, failure_notes):
     
     else:
         # GERÇEK API KULLANIMI
-        from anthropic import Anthropic
-        
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if not api_key:
-            return "Hata: ANTHROPIC_API_KEY bulunamadı!"
-        
-        try:
-            client = Anthropic(api_key=api_key)
-        except TypeError:
-            import anthropic
-            client = anthropic.Client(api_key=api_key)
-        
         prompt = f"""
 Sen bir profesyonel Software Test Engineer'sın. Başarısız olan bir test için detaylı bug raporu oluştur.
 
@@ -273,17 +508,68 @@ Profesyonel bir bug raporu oluştur. Aşağıdaki bilgileri içermeli:
 Sadece JSON formatında yanıt ver, başka açıklama ekleme.
 """
 
-        try:
-            response = client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=1500,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            
-            result = response.content[0].text
-            return result
-        
-        except Exception as e:
-            return f"Hata: {str(e)}"
\ No newline at end of file
+        return _call_claude(prompt, max_tokens=1500, use_cache=use_cache)
+
+
+def _steps_to_text(steps):
+    """Test adımlarını numaralı metne çevir"""
+    return "\n".join([f"{i+1}. {step}" for i, step in enumerate(steps)])
+
+def _generate_bug_report_for(failure, steps, use_cache):
+    """Tek bir başarısız execution için bug raporu üret ve execution ID ile döndür"""
+    result = generate_bug_report(
+        test_title=failure['title'],
+        test_steps=_steps_to_text(steps),
+        failure_notes=failure['notes'] or "Belirtilmemiş",
+        use_cache=use_cache
+    )
+    if result.startswith("Hata:"):
+        raise RuntimeError(result)
+
+    report = parse_bug_report(result)
+    report['execution_id'] = failure['execution_id']
+    return report
+
+def generate_bug_reports_batch(failures, use_cache=True, progress_callback=None):
+    """
+    Birden fazla başarısız execution için eşzamanlı bug raporu üret.
+    failures: get_failed_executions_by_project() satırları
+    En fazla MAX_CONCURRENT_REQUESTS istek aynı anda çalışır; bir raporun hatası
+    diğerlerini etkilemez. progress_callback(tamamlanan, toplam) çağıran thread'de çağrılır.
+    """
+    reports = {}
+    errors = []
+
+    if not failures:
+        return {'reports': [], 'errors': []}
+
+    # Tüm senaryoların adımlarını tek sorguda oku
+    steps_by_scenario = get_steps_for_scenarios(list({failure['scenario_id'] for failure in failures}))
+
+    with ThreadPoolExecutor(max_workers=max(1, min(MAX_CONCURRENT_REQUESTS, len(failures)))) as executor:
+        futures = {
+            executor.submit(
+                _generate_bug_report_for, failure, steps_by_scenario[failure['scenario_id']], use_cache
+            ): index
+            for index, failure in enumerate(failures)
+        }
+
+        for completed, future in enumerate(as_completed(futures), 1):
+            index = futures[future]
+            try:
+                reports[index] = future.result()
+            except Exception as e:
+                errors.append({
+                    'index': index,
+                    'execution_id': failures[index]['execution_id'],
+                    'title': failures[index]['title'],
+                    'error': str(e)
+                })
+
+            if progress_callback:
+                progress_callback(completed, len(failures))
+
+    return {
+        'reports': [reports[index] for index in sorted(reports)],
+        'errors': sorted(errors, key=lambda error: error['index'])
+    }
@@ -0,0 +1,166 @@
+"""
+Dışa aktarma servisi
+
+Bug raporları ve execution'lar veritabanından generator'larla sayfa sayfa okunur ve
+doğrudan CSV, JSONL veya Markdown zip dosyasına yazılır. Dosya SpooledTemporaryFile
+üzerinde oluşturulur; küçük dosyalar bellekte kalır, büyükleri diske taşar. Böylece
+satır sayısından bağımsız olarak bellekte en fazla bir sayfa satır tutulur.
+"""
+import csv
+import io
+import json
+import tempfile
+import zipfile
+from database.models import iter_bug_reports_for_export, iter_executions_for_export
+
+SPOOL_MAX_SIZE = 8 * 1024 * 1024  # byte; aşılırsa geçici dosya diske yazılır
+
+EXPORT_DATASETS = {
+    "bugs": {
+        "label": "🐛 Bug Raporları",
+        "rows": iter_bug_reports_for_export,
+        "columns": [
+            "id", "project_name", "scenario_title", "execution_id", "title", "severity",
+            "description", "steps_to_reproduce", "expected_result", "actual_result",
+            "ai_generated", "jira_issue_key", "created_at"
+        ],
+        "formats": ["csv", "jsonl", "md_zip"]
+    },
+    "executions": {
+        "label": "✅ Test Sonuçları",
+        "rows": iter_executions_for_export,
+        "columns": [
+            "id", "project_name", "scenario_id", "scenario_title", "priority",
+            "status", "notes", "executed_at"
+        ],
+        "formats": ["csv", "jsonl"]
+    }
+}
+
+EXPORT_FORMATS = {
+    "csv": {"label": "📊 CSV", "extension": "csv", "mime": "text/csv"},
+    "jsonl": {"label": "🧾 JSONL", "extension": "jsonl", "mime": "application/x-ndjson"},
+    "md_zip": {"label": "📝 Markdown (zip)", "extension": "zip", "mime": "application/zip"}
+}
+
+SEVERITY_EMOJIS = {
+    "critical": "🔥",
+    "high": "🔴",
+    "medium": "🟡",
+    "low": "🟢"
+}
+
+def bug_to_markdown(bug):
+    """Tek bir bug raporunu Markdown metnine çevir"""
+    severity_emoji = SEVERITY_EMOJIS.get(bug['severity'], '⚪')
+
+    return f"""# Bug Report #{bug['id']}
+
+## {bug['title']}
+
+**Project:** {bug['project_name']}
+**Scenario:** {bug['scenario_title']}
+**Severity:** {severity_emoji} {bug['severity'].upper()}
+**Date:** {bug['created_at'][:10]}
+**AI Generated:** {'Yes' if bug['ai_generated'] else 'No'}
+
+---
+
+## 📝 Description
+
+{bug['description']}
+
+---
+
+## 🔄 Steps to Reproduce
+```
+{bug['steps_to_reproduce']}
+```
+
+---
+
+## ✅ Expected Result
+
+{bug['expected_result']}
+
+---
+
+## ❌ Actual Result
+
+{bug['actual_result']}
+
+---
+
+*Generated by SmartQA - AI Test Assistant*
+"""
+
+def _write_csv(rows, columns, output):
+    """Satırları CSV olarak yaz, yazılan satır sayısını döndür"""
+    # Excel'in UTF-8'i tanıması için BOM ile başla
+    text = io.TextIOWrapper(output, encoding="utf-8-sig", newline="")
+    writer = csv.writer(text)
+    writer.writerow(columns)
+
+    count = 0
+    for row in rows:
+        writer.writerow([row[column] for column in columns])
+        count += 1
+
+    text.flush()
+    text.detach()
+    return count
+
+def _write_jsonl(rows, columns, output):
+    """Satırları her satırda bir JSON nesnesi olacak şekilde yaz"""
+    count = 0
+    for row in rows:
+        line = json.dumps({column: row[column] for column in columns}, ensure_ascii=False)
+        output.write(line.encode("utf-8") + b"\n")
+        count += 1
+    return count
+
+def _write_markdown_zip(rows, columns, output):
+    """Her bug raporunu ayrı bir .md dosyası olarak zip arşivine yaz"""
+    count = 0
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for row in rows:
+            archive.writestr(f"bug_report_{row['id']}.md", bug_to_markdown(row))
+            count += 1
+    return count
+
+_WRITERS = {
+    "csv": _write_csv,
+    "jsonl": _write_jsonl,
+    "md_zip": _write_markdown_zip
+}
+
+def build_export(dataset, export_format, project_id=None, since=None, until=None):
+    """
+    Seçilen veri setini filtreleyerek dışa aktarma dosyası oluştur.
+
+    Dönen dict: file (başa sarılmış dosya nesnesi), file_name, mime, row_count.
+    Geçersiz veri seti/format kombinasyonunda "Hata:" ile başlayan metin döner.
+    """
+    spec = EXPORT_DATASETS.get(dataset)
+    if spec is None or export_format not in spec['formats']:
+        return f"Hata: {dataset} için {export_format} formatı desteklenmiyor"
+
+    rows = spec['rows'](project_id=project_id, since=since, until=until)
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+
+    try:
+        row_count = _WRITERS[export_format](rows, spec['columns'], output)
+    except Exception as e:
+        output.close()
+        return f"Hata: Dışa aktarma dosyası oluşturulamadı - {str(e)}"
+
+    output.seek(0)
+
+    file_format = EXPORT_FORMATS[export_format]
+    scope = f"project_{project_id}" if project_id is not None else "all"
+    return {
+        "file": output,
+        "file_name": f"smartqa_{dataset}_{scope}.{file_format['extension']}",
+        "mime": file_format['mime'],
+        "row_count": row_count
+    }
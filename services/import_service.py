@@ -0,0 +1,370 @@
+"""
+Test senaryosu içe aktarma servisi
+
+CSV, JSON/JSONL ve Gherkin (.feature) dosyaları akış olarak okunur. Her kayıt
+doğrulanır, öncelik ve adımlar normalize edilir, projede (veya dosyada) aynı başlıkla
+zaten bulunan senaryolar atlanır. Geçerli kayıtlar IMPORT_CHUNK_SIZE'lık parçalar
+halinde executemany ile yazılır; bellekte en fazla bir parça tutulur.
+"""
+import io
+import re
+import csv
+import json
+from database.models import (
+    PRIORITIES,
+    PRIORITY_ALIASES,
+    get_scenario_titles,
+    import_test_scenarios_chunk,
+    normalize_steps,
+    validate_scenario
+)
+
+IMPORT_CHUNK_SIZE = 500
+JSON_READ_SIZE = 64 * 1024  # karakter
+JSON_MAX_ELEMENT_SIZE = 1024 * 1024  # karakter; tek bir JSON kaydı için tampon sınırı
+
+IMPORT_EXTENSIONS = {
+    "csv": "csv",
+    "json": "json",
+    "jsonl": "jsonl",
+    "ndjson": "jsonl",
+    "feature": "gherkin"
+}
+
+# CSV başlıklarının alan adlarına karşılığı (küçük harfe çevrilerek aranır)
+CSV_COLUMNS = {
+    "title": ("title", "başlık", "baslik", "name", "summary", "senaryo"),
+    "description": ("description", "açıklama", "aciklama", "desc"),
+    "steps": ("steps", "adımlar", "adimlar", "test steps"),
+    "priority": ("priority", "öncelik", "oncelik")
+}
+
+_JSON_SCENARIO_ARRAY = re.compile(r'(?<!\\)"(?:test_scenarios|scenarios)"\s*:\s*\[')
+_STEP_COLUMN = re.compile(r"^(?:step|adım|adim)\s*_?\s*(\d+)$")
+_GHERKIN_STEP = re.compile(r"^(Given|When|Then|And|But|\*|Diyelim ki|Eğer ki|O zaman|Ve|Fakat)\s+", re.IGNORECASE)
+_GHERKIN_SCENARIO = re.compile(r"^(Scenario Outline|Scenario Template|Scenario|Example|Senaryo taslağı|Senaryo):\s*(.*)$", re.IGNORECASE)
+_GHERKIN_FEATURE = re.compile(r"^(Feature|Özellik):\s*(.*)$", re.IGNORECASE)
+_GHERKIN_BACKGROUND = re.compile(r"^(Background|Geçmiş):", re.IGNORECASE)
+_GHERKIN_EXAMPLES = re.compile(r"^(Examples|Scenarios|Örnekler):", re.IGNORECASE)
+_GHERKIN_RULE = re.compile(r"^(Rule|Kural):", re.IGNORECASE)
+
+def _title_key(title):
+    """Tekrar kontrolü için başlığı büyük/küçük harf ve boşluktan bağımsız hale getir"""
+    return " ".join(title.split()).casefold()
+
+def _iter_csv(text):
+    """CSV satırlarını (satır no, kayıt) olarak üret"""
+    reader = csv.DictReader(text)
+    columns = {}
+    step_columns = []
+    for column in reader.fieldnames or []:
+        name = column.strip().lower()
+        for field, aliases in CSV_COLUMNS.items():
+            if name in aliases and field not in columns:
+                columns[field] = column
+        match = _STEP_COLUMN.match(name)
+        if match:
+            step_columns.append((int(match.group(1)), column))
+    step_columns.sort()
+
+    if "title" not in columns:
+        yield 1, ValueError("CSV dosyasında başlık (title) kolonu bulunamadı")
+        return
+
+    for row in reader:
+        record = {field: row.get(column) for field, column in columns.items()}
+        # "Step 1", "Step 2" ... şeklinde ayrı kolonlarda verilen adımlar
+        if step_columns:
+            steps = [row.get(column) or "" for _, column in step_columns]
+            record['steps'] = normalize_steps(record.get('steps')) + steps
+        yield reader.line_num, record
+
+def _iter_jsonl(text):
+    """JSONL satırlarını (satır no, kayıt) olarak üret; bozuk satır hata olarak döner"""
+    for line_number, line in enumerate(text, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, ValueError(f"Geçersiz JSON: {e.msg}")
+
+def _skip_json_element(buffer, text):
+    """
+    Tamponun başındaki dizi elemanını okuyarak atla; elemandan sonraki kısmı döndürür.
+    Tampon büyütülmez, dosya parça parça okunur. Dosya biterse None döner.
+    """
+    depth = 0
+    in_string = False
+    escape = False
+    while buffer:
+        for position, char in enumerate(buffer):
+            if in_string:
+                if escape:
+                    escape = False
+                elif char == "\\":
+                    escape = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in "{[":
+                depth += 1
+            elif char in "}]":
+                depth -= 1
+                if depth < 0:
+                    return buffer[position:]
+            elif char == "," and depth == 0:
+                return buffer[position:]
+        buffer = text.read(JSON_READ_SIZE)
+    return None
+
+def _iter_json(text):
+    """
+    Üst seviyesi dizi olan JSON dosyasını nesne nesne oku; tamamını belleğe almaz.
+    Üst seviye obje ise "test_scenarios"/"scenarios" dizisi bulunup aynı şekilde
+    okunur; dizi yoksa obje tek senaryo kabul edilir. JSON_MAX_ELEMENT_SIZE'ı
+    aşan kayıtlar atlanır ve hata olarak döner.
+    """
+    decoder = json.JSONDecoder()
+    buffer = text.read(JSON_READ_SIZE).lstrip()
+
+    if buffer.startswith("{"):
+        match = _JSON_SCENARIO_ARRAY.search(buffer)
+        while match is None and len(buffer) <= JSON_MAX_ELEMENT_SIZE:
+            chunk = text.read(JSON_READ_SIZE)
+            if not chunk:
+                break
+            buffer += chunk
+            match = _JSON_SCENARIO_ARRAY.search(buffer)
+
+        if match is None:
+            if len(buffer) > JSON_MAX_ELEMENT_SIZE:
+                yield 1, ValueError(
+                    f"JSON objesinde senaryo dizisi bulunamadı ve obje {JSON_MAX_ELEMENT_SIZE} karakter sınırını aşıyor"
+                )
+                return
+            try:
+                document = json.loads(buffer)
+            except json.JSONDecodeError as e:
+                yield 1, ValueError(f"Geçersiz JSON: {e.msg}")
+                return
+            records = document.get('test_scenarios', document.get('scenarios', [document]))
+            yield from enumerate(records if isinstance(records, list) else [records], 1)
+            return
+        buffer = buffer[match.end() - 1:]
+
+    if not buffer.startswith("["):
+        yield 1, ValueError("JSON dosyası bir dizi ya da obje ile başlamalı")
+        return
+
+    position = 1
+    index = 0
+    eof = False
+    while True:
+        # Ayraçları atla; işlenen kısmı tampondan at
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        buffer = buffer[position:]
+        position = 0
+
+        if not buffer:
+            if eof:
+                yield index + 1, ValueError("JSON dizisi kapanmadan dosya bitti")
+                return
+            chunk = text.read(JSON_READ_SIZE)
+            eof = not chunk
+            buffer += chunk
+            continue
+        if buffer[0] == "]":
+            return
+
+        try:
+            record, position = decoder.raw_decode(buffer)
+        except json.JSONDecodeError as e:
+            if eof:
+                yield index + 1, ValueError(f"Geçersiz JSON: {e.msg}")
+                return
+            if len(buffer) > JSON_MAX_ELEMENT_SIZE:
+                # Bozuk ya da çok büyük kayıt; tampon daha fazla büyütülmez
+                index += 1
+                yield index, ValueError(
+                    f"Kayıt {JSON_MAX_ELEMENT_SIZE} karakter sınırını aşıyor veya geçersiz, atlandı"
+                )
+                buffer = _skip_json_element(buffer, text)
+                if buffer is None:
+                    yield index + 1, ValueError("JSON dizisi kapanmadan dosya bitti")
+                    return
+                continue
+            # Nesne tampon sonunda yarım kalmış olabilir; devamını oku
+            chunk = text.read(JSON_READ_SIZE)
+            eof = not chunk
+            buffer += chunk
+            continue
+
+        index += 1
+        yield index, record
+
+def _iter_gherkin(text):
+    """
+    .feature dosyasındaki her Scenario'yu (satır no, kayıt) olarak üret.
+    Background adımları her senaryonun başına eklenir; @critical/@high/@p1 gibi
+    etiketler önceliği belirler. Tablo ve Examples satırları son adıma eklenir.
+    """
+    feature = ""
+    background = []
+    tags = []
+    current = None
+    current_line = 0
+    section = None  # "background", "scenario", "examples"
+    in_doc_string = False
+
+    def finish(scenario):
+        priority = next(
+            (tag for tag in scenario['tags'] if tag in PRIORITIES or tag in PRIORITY_ALIASES),
+            None
+        )
+        description = " ".join(scenario['description'])
+        if feature:
+            description = f"{feature} - {description}" if description else feature
+        return {
+            'title': scenario['title'],
+            'description': description,
+            'steps': background + scenario['steps'],
+            'priority': priority
+        }
+
+    for line_number, raw_line in enumerate(text, 1):
+        line = raw_line.strip()
+
+        if line.startswith('"""') or line.startswith("```"):
+            in_doc_string = not in_doc_string
+            continue
+        target = current['steps'] if section in ("scenario", "examples") and current else background
+        if in_doc_string or line.startswith("|"):
+            if target:
+                target[-1] += "\n" + line
+            continue
+        if not line or line.startswith("#"):
+            continue
+
+        if line.startswith("@"):
+            tags.extend(tag.lstrip("@").lower() for tag in line.split())
+            continue
+
+        feature_match = _GHERKIN_FEATURE.match(line)
+        scenario_match = _GHERKIN_SCENARIO.match(line)
+
+        if feature_match:
+            feature = feature_match.group(2).strip()
+            background = []
+            tags = []
+            section = None
+        elif _GHERKIN_RULE.match(line):
+            tags = []
+            section = None
+        elif _GHERKIN_BACKGROUND.match(line):
+            background = []
+            section = "background"
+        elif scenario_match:
+            if current:
+                yield current_line, finish(current)
+            current = {'title': scenario_match.group(2).strip(), 'description': [], 'steps': [], 'tags': tags}
+            current_line = line_number
+            tags = []
+            section = "scenario"
+        elif _GHERKIN_EXAMPLES.match(line) and current:
+            current['steps'].append(line)
+            section = "examples"
+        elif _GHERKIN_STEP.match(line):
+            target.append(line)
+        elif section == "scenario" and current and not current['steps']:
+            # Scenario başlığı ile ilk adım arasındaki serbest metin açıklamadır
+            current['description'].append(line)
+
+    if current:
+        yield current_line, finish(current)
+
+_READERS = {
+    "csv": _iter_csv,
+    "json": _iter_json,
+    "jsonl": _iter_jsonl,
+    "gherkin": _iter_gherkin
+}
+
+def detect_format(file_name):
+    """Dosya uzantısından içe aktarma formatını bul; desteklenmiyorsa None"""
+    extension = file_name.rsplit(".", 1)[-1].lower() if "." in file_name else ""
+    return IMPORT_EXTENSIONS.get(extension)
+
+def import_scenarios(project_id, file, file_name, progress_callback=None):
+    """
+    Yüklenen dosyadaki senaryoları projeye aktar.
+
+    file ikili (binary) okunabilir bir dosya nesnesidir. progress_callback(okunan_byte,
+    toplam_byte) her parça yazıldıktan sonra çağrılır. Dönen dict: saved_count,
+    duplicate_count, errors ([{'line', 'title', 'error'}]). Desteklenmeyen dosyada
+    "Hata:" ile başlayan metin döner.
+    """
+    import_format = detect_format(file_name)
+    if import_format is None:
+        return f"Hata: Desteklenmeyen dosya türü: {file_name}"
+
+    file.seek(0, io.SEEK_END)
+    total_bytes = file.tell()
+    file.seek(0)
+
+    # newline="" CSV içindeki çok satırlı hücreler için gereklidir
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="" if import_format == "csv" else None)
+
+    existing_titles = {_title_key(title) for title in get_scenario_titles(project_id)}
+    saved_count = 0
+    duplicate_count = 0
+    errors = []
+    chunk = []
+
+    def flush():
+        nonlocal saved_count
+        import_test_scenarios_chunk(project_id, chunk)
+        saved_count += len(chunk)
+        chunk.clear()
+        if progress_callback:
+            progress_callback(min(file.tell(), total_bytes), total_bytes)
+
+    try:
+        for line, raw in _READERS[import_format](text):
+            if isinstance(raw, Exception):
+                errors.append({'line': line, 'title': None, 'error': str(raw)})
+                continue
+
+            row, error = validate_scenario(raw)
+            if error:
+                title = raw.get('title') if isinstance(raw, dict) else None
+                errors.append({'line': line, 'title': title, 'error': error})
+                continue
+
+            key = _title_key(row[0])
+            if key in existing_titles:
+                duplicate_count += 1
+                continue
+            existing_titles.add(key)
+
+            chunk.append(row)
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                flush()
+    except (UnicodeDecodeError, csv.Error) as e:
+        errors.append({'line': None, 'title': None, 'error': f"Dosya okunamadı: {str(e)}"})
+
+    # Okuma hatasına kadar doğrulanan kayıtlar da yazılır
+    if chunk:
+        flush()
+    text.detach()
+
+    if progress_callback:
+        progress_callback(total_bytes, total_bytes)
+
+    return {
+        'saved_count': saved_count,
+        'duplicate_count': duplicate_count,
+        'errors': errors
+    }
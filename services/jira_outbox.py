@@ -0,0 +1,130 @@
+"""
+Jira outbox işleyicisi
+
+Bug raporlarının Jira'ya gönderimi jira_outbox tablosuna yazılır ve arka plandaki
+tek bir worker thread tarafından bulk-create ile gönderilir. Böylece Streamlit
+arayüzü Jira'yı beklemez; ağ hataları tekrar denenir ve aynı bug için ikinci bir
+issue açılmaz (bug_id UNIQUE, issue key bug_reports'a yazılır). Sonucu belirsiz
+kalan gönderimler (okuma zaman aşımı, 502/504, kilidi dolmuş kayıt) tekrar
+gönderilmeden önce smartqa-bug-<id> etiketiyle Jira'da aranır.
+"""
+import os
+import random
+import logging
+import threading
+from database.models import (
+    enqueue_jira_pushes,
+    claim_jira_outbox_batch,
+    complete_jira_pushes,
+    fail_jira_push
+)
+from services.jira_service import create_jira_issues_bulk, find_jira_issues_for_bugs, JIRA_BULK_LIMIT
+
+OUTBOX_POLL_INTERVAL = float(os.getenv("SMARTQA_JIRA_OUTBOX_POLL", "5"))  # saniye
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("SMARTQA_JIRA_OUTBOX_MAX_ATTEMPTS", "6"))
+# Bu süreden uzun 'sending' kalan kayıtların worker'ı öldü kabul edilir ve kayıt yeniden alınır
+OUTBOX_LEASE_SECONDS = int(os.getenv("SMARTQA_JIRA_OUTBOX_LEASE", "600"))
+OUTBOX_RETRY_BASE = 10  # saniye; her denemede iki katına çıkar
+OUTBOX_RETRY_MAX = 3600
+
+logger = logging.getLogger("smartqa.jira_outbox")
+
+_worker = None
+_worker_lock = threading.Lock()
+_wake = threading.Event()
+
+def _retry_delay(attempts):
+    """Kuyruk seviyesinde tekrar deneme gecikmesi (üstel, jitter'lı)"""
+    delay = min(OUTBOX_RETRY_MAX, OUTBOX_RETRY_BASE * (2 ** (attempts - 1)))
+    return delay * random.uniform(0.5, 1.0)
+
+def _record_failure(bug_id, error, attempts, ambiguous=False):
+    """Hatayı kayda yaz ve logla; deneme hakkı bittiyse kaydı 'failed' yap"""
+    logger.warning("Jira gönderimi başarısız (bug #%s, %s. deneme): %s", bug_id, attempts, error)
+    if attempts >= OUTBOX_MAX_ATTEMPTS:
+        fail_jira_push(bug_id, error, needs_verification=ambiguous)
+    else:
+        fail_jira_push(bug_id, error, retry_in_seconds=_retry_delay(attempts), needs_verification=ambiguous)
+
+def _verify_pushes(bugs, attempts):
+    """
+    Gönderimi belirsiz kalmış bug'ları Jira'da ara; bulunanları tamamla.
+    Tekrar gönderilebilecek bug'ları döndürür; arama başarısızsa hiçbiri gönderilmez.
+    """
+    to_verify = [bug['id'] for bug in bugs if bug['needs_verification']]
+    if not to_verify:
+        return bugs
+
+    lookup = find_jira_issues_for_bugs(to_verify)
+    found = lookup['found']
+    if found:
+        complete_jira_pushes(list(found.values()))
+
+    if not lookup['success']:
+        for bug_id in to_verify:
+            if bug_id not in found:
+                _record_failure(bug_id, lookup['message'], attempts[bug_id], ambiguous=True)
+        return [bug for bug in bugs if not bug['needs_verification']]
+
+    return [bug for bug in bugs if bug['id'] not in found]
+
+def process_outbox_once():
+    """Zamanı gelmiş bir grup kaydı Jira'ya gönder; işlenen kayıt sayısını döndür"""
+    bugs = claim_jira_outbox_batch(JIRA_BULK_LIMIT, lease_seconds=OUTBOX_LEASE_SECONDS)
+    if not bugs:
+        return 0
+
+    attempts = {bug['id']: bug['attempts'] for bug in bugs}
+    to_send = _verify_pushes(bugs, attempts)
+    if not to_send:
+        return len(bugs)
+
+    try:
+        result = create_jira_issues_bulk(to_send)
+    except Exception as e:
+        # Beklenmeyen hata: istek gönderilmiş olabilir
+        logger.exception("Jira bulk gönderimi beklenmeyen hatayla bitti")
+        result = {
+            'created': [],
+            'errors': [
+                {'bug_id': bug['id'], 'error': f"Beklenmeyen hata: {str(e)}", 'ambiguous': True}
+                for bug in to_send
+            ]
+        }
+
+    if result['created']:
+        complete_jira_pushes(result['created'])
+
+    for error in result['errors']:
+        _record_failure(error['bug_id'], error['error'], attempts[error['bug_id']],
+                        ambiguous=error.get('ambiguous', False))
+
+    return len(bugs)
+
+def _run():
+    # Yarıda kalmış gönderimler kilit süresi dolunca claim_jira_outbox_batch ile yeniden alınır
+    while True:
+        try:
+            processed = process_outbox_once()
+        except Exception:
+            logger.exception("Jira outbox işlenemedi")
+            processed = 0
+
+        if not processed:
+            _wake.wait(OUTBOX_POLL_INTERVAL)
+            _wake.clear()
+
+def start_jira_worker():
+    """Arka plan worker thread'ini (çalışmıyorsa) başlat"""
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, name="jira-outbox", daemon=True)
+            _worker.start()
+
+def queue_jira_pushes(bug_ids):
+    """Bug'ları Jira kuyruğuna ekle ve worker'ı uyandır; kuyruğa alınan sayıyı döndürür"""
+    queued = enqueue_jira_pushes(bug_ids)
+    start_jira_worker()
+    _wake.set()
+    return queued
@@ -1,7 +1,12 @@
 import os
+import time
+import random
+import threading
+from collections import deque
+from email.utils import parsedate_to_datetime
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
-import base64
 
 load_dotenv()
 
@@ -14,6 +19,173 @@ JIRA_PROJECT_KEY = os.getenv("JIRA_PROJECT_KEY", "")  # örn: TEST
 # Mock mode - Jira bilgileri yoksa demo modu
 USE_MOCK_JIRA = not (JIRA_URL and JIRA_EMAIL and JIRA_API_TOKEN and JIRA_PROJECT_KEY)
 
+# HTTP bağlantı havuzu ve yeniden deneme ayarları
+JIRA_POOL_SIZE = int(os.getenv("SMARTQA_JIRA_POOL_SIZE", "10"))
+JIRA_TIMEOUT = (5, 30)  # (bağlantı, okuma) saniye
+JIRA_MAX_RETRIES = int(os.getenv("SMARTQA_JIRA_MAX_RETRIES", "4"))
+JIRA_BACKOFF_BASE = 0.5  # saniye
+JIRA_BACKOFF_MAX = 30  # saniye; Retry-After da bu değerle sınırlanır
+
+# Her durumda tekrar denenebilen durum kodları; 502/504 yalnızca GET için
+# (POST'ta istek işlenmiş olabileceğinden mükerrer issue riski var)
+RETRY_STATUSES = {429, 503}
+RETRY_STATUSES_IDEMPOTENT = {502, 504}
+# POST sonrası bu durumlarda issue'ların oluşup oluşmadığı bilinemez
+AMBIGUOUS_STATUSES = {500, 502, 504}
+
+_session = None
+_session_lock = threading.Lock()
+_call_timings = deque(maxlen=200)
+
+def _get_session():
+    """Keep-alive bağlantı havuzlu, kimlik bilgileri hazır paylaşılan Session"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.auth = (JIRA_EMAIL, JIRA_API_TOKEN)
+            session.headers.update({
+                "Content-Type": "application/json",
+                "Accept": "application/json"
+            })
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=JIRA_POOL_SIZE, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+def _retry_after_seconds(response):
+    """Retry-After başlığını (saniye veya HTTP tarihi) saniyeye çevir"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0), JIRA_BACKOFF_MAX)
+
+def _backoff_seconds(attempt):
+    """Üstel bekleme süresi, full jitter ile"""
+    return random.uniform(0, min(JIRA_BACKOFF_MAX, JIRA_BACKOFF_BASE * (2 ** attempt)))
+
+def _request(method, path, **kwargs):
+    """
+    Jira API'ye istek at; geçici hatalarda üstel bekleme ve jitter ile tekrar dener,
+    429/503 yanıtlarında Retry-After başlığına uyar. Son yanıtı döndürür,
+    tüm denemeler bağlantı hatasıyla biterse son hatayı fırlatır.
+    """
+    idempotent = method.upper() == "GET"
+    retry_statuses = (RETRY_STATUSES | RETRY_STATUSES_IDEMPOTENT) if idempotent else RETRY_STATUSES
+    # POST gönderildikten sonra okuma zaman aşımı mükerrer issue yaratabilir
+    retry_errors = (requests.ConnectionError, requests.Timeout) if idempotent else (requests.ConnectionError,)
+
+    session = _get_session()
+    kwargs.setdefault("timeout", JIRA_TIMEOUT)
+    started = time.perf_counter()
+    status = None
+
+    try:
+        for attempt in range(JIRA_MAX_RETRIES + 1):
+            try:
+                response = session.request(method, f"{JIRA_URL}{path}", **kwargs)
+            except retry_errors:
+                if attempt == JIRA_MAX_RETRIES:
+                    raise
+                time.sleep(_backoff_seconds(attempt))
+                continue
+
+            status = response.status_code
+            if status not in retry_statuses or attempt == JIRA_MAX_RETRIES:
+                return response
+
+            retry_after = _retry_after_seconds(response)
+            time.sleep(retry_after if retry_after is not None else _backoff_seconds(attempt))
+    finally:
+        _call_timings.append({
+            "method": method.upper(),
+            "path": path,
+            "status": status,
+            "attempts": attempt + 1,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+        })
+
+def get_jira_call_timings():
+    """Son Jira çağrılarının süreleri (en yeni sonda)"""
+    return list(_call_timings)
+
+# Priority mapping
+PRIORITY_MAP = {
+    "critical": "Highest",
+    "high": "High",
+    "medium": "Medium",
+    "low": "Low"
+}
+
+# Jira bulk-create endpoint'inin tek istekte kabul ettiği issue sayısı
+JIRA_BULK_LIMIT = 50
+
+def _build_issue_fields(bug_title, bug_description, steps_to_reproduce, expected_result, actual_result, severity):
+    """Jira issue 'fields' gövdesini oluştur"""
+    description_text = f"""
+h2. Bug Açıklaması
+{bug_description}
+
+h2. Yeniden Üretme Adımları
+{steps_to_reproduce}
+
+h2. Beklenen Sonuç
+{expected_result}
+
+h2. Gerçekleşen Sonuç
+{actual_result}
+
+---
+_Bu issue SmartQA - AI Test Assistant tarafından otomatik oluşturulmuştur._
+"""
+
+    return {
+        "project": {
+            "key": JIRA_PROJECT_KEY
+        },
+        "summary": bug_title,
+        "description": description_text,
+        "issuetype": {
+            "name": "Bug"
+        },
+        "priority": {
+            "name": PRIORITY_MAP.get(severity, "Medium")
+        },
+        "labels": ["smartqa", "automated"]
+    }
+
+def _bug_label(bug_id):
+    """Issue'yu bug raporuna bağlayan etiket; gönderimi belirsiz kalan bug'lar bununla aranır"""
+    return f"smartqa-bug-{bug_id}"
+
+def _bug_issue_fields(bug):
+    """bug_reports satırından Jira issue alanlarını oluştur"""
+    fields = _build_issue_fields(
+        bug_title=f"[SmartQA] {bug['title']}",
+        bug_description=bug['description'],
+        steps_to_reproduce=bug['steps_to_reproduce'],
+        expected_result=bug['expected_result'],
+        actual_result=bug['actual_result'],
+        severity=bug['severity']
+    )
+    fields["labels"] = fields["labels"] + [_bug_label(bug['id'])]
+    return fields
+
+def _element_error_text(error):
+    """Bulk yanıtındaki elementErrors içeriğini okunabilir metne çevir"""
+    element_errors = error.get("elementErrors", {})
+    messages = list(element_errors.get("errorMessages", []))
+    messages += [f"{field}: {message}" for field, message in element_errors.get("errors", {}).items()]
+    return "; ".join(messages) or f"HTTP {error.get('status', '?')}"
+
 def create_jira_issue(bug_title, bug_description, steps_to_reproduce, expected_result, actual_result, severity):
     """
     Jira'da bug issue oluştur
@@ -21,7 +193,6 @@ def create_jira_issue(bug_title, bug_description, steps_to_reproduce, expected_r
     
     if USE_MOCK_JIRA:
         # MOCK MODE - Demo için
-        import random
         mock_issue_key = f"BUG-{random.randint(1000, 9999)}"
         mock_url = f"https://demo.atlassian.net/browse/{mock_issue_key}"
         
@@ -35,66 +206,15 @@ def create_jira_issue(bug_title, bug_description, steps_to_reproduce, expected_r
     else:
         # GERÇEK JIRA ENTEGRASYONU
         try:
-            # Basic Auth için credentials
-            auth_string = f"{JIRA_EMAIL}:{JIRA_API_TOKEN}"
-            auth_bytes = auth_string.encode('ascii')
-            auth_base64 = base64.b64encode(auth_bytes).decode('ascii')
-            
-            headers = {
-                "Authorization": f"Basic {auth_base64}",
-                "Content-Type": "application/json"
-            }
-            
-            # Priority mapping
-            priority_map = {
-                "critical": "Highest",
-                "high": "High",
-                "medium": "Medium",
-                "low": "Low"
-            }
-            
-            # Issue body
-            description_text = f"""
-h2. Bug Açıklaması
-{bug_description}
-
-h2. Yeniden Üretme Adımları
-{steps_to_reproduce}
-
-h2. Beklenen Sonuç
-{expected_result}
-
-h2. Gerçekleşen Sonuç
-{actual_result}
-
----
-_Bu issue SmartQA - AI Test Assistant tarafından otomatik oluşturulmuştur._
-"""
-            
             payload = {
-                "fields": {
-                    "project": {
-                        "key": JIRA_PROJECT_KEY
-                    },
-                    "summary": bug_title,
-                    "description": description_text,
-                    "issuetype": {
-                        "name": "Bug"
-                    },
-                    "priority": {
-                        "name": priority_map.get(severity, "Medium")
-                    },
-                    "labels": ["smartqa", "automated"]
-                }
+                "fields": _build_issue_fields(
+                    bug_title, bug_description, steps_to_reproduce,
+                    expected_result, actual_result, severity
+                )
             }
             
-            # API request
-            response = requests.post(
-                f"{JIRA_URL}/rest/api/3/issue",
-                json=payload,
-                headers=headers,
-                timeout=10
-            )
+            # API request (paylaşılan session, geçici hatalarda tekrar dener)
+            response = _request("POST", "/rest/api/3/issue", json=payload)
             
             if response.status_code == 201:
                 issue_data = response.json()
@@ -120,6 +240,136 @@ _Bu issue SmartQA - AI Test Assistant tarafından otomatik oluşturulmuştur._
             }
 
 
+def create_jira_issues_bulk(bugs):
+    """
+    Birden fazla bug raporu için Jira issue'larını bulk-create endpoint'i ile oluştur.
+    bugs: bug_reports satırları (id, title, description, ... alanları)
+    İstekler JIRA_BULK_LIMIT'lik parçalara bölünür; kısmi hatalar bug ID'lerine eşlenir.
+    {'success', 'created': [{'bug_id', 'issue_key', 'issue_url'}], 'errors': [{'bug_id', 'error'}], 'message'}
+    """
+    created = []
+    errors = []
+
+    for start in range(0, len(bugs), JIRA_BULK_LIMIT):
+        chunk = bugs[start:start + JIRA_BULK_LIMIT]
+
+        if USE_MOCK_JIRA:
+            # MOCK MODE - Demo için
+            for bug in chunk:
+                mock_issue_key = f"BUG-{random.randint(1000, 9999)}"
+                created.append({
+                    "bug_id": bug['id'],
+                    "issue_key": mock_issue_key,
+                    "issue_url": f"https://demo.atlassian.net/browse/{mock_issue_key}"
+                })
+            continue
+
+        # ambiguous: istek Jira'ya ulaşmış olabilir; tekrar göndermeden önce aranmalı
+        try:
+            payload = {"issueUpdates": [{"fields": _bug_issue_fields(bug)} for bug in chunk]}
+            response = _request("POST", "/rest/api/3/issue/bulk", json=payload)
+        except Exception as e:
+            # Bağlantı kurulamadıysa istek gönderilmemiştir; okuma zaman aşımında bilinmez
+            ambiguous = not isinstance(e, requests.ConnectionError)
+            errors += [
+                {"bug_id": bug['id'], "error": f"Bağlantı hatası: {str(e)}", "ambiguous": ambiguous}
+                for bug in chunk
+            ]
+            continue
+
+        if response.status_code not in (200, 201):
+            ambiguous = response.status_code in AMBIGUOUS_STATUSES
+            errors += [
+                {"bug_id": bug['id'], "error": f"Jira API hatası: {response.status_code} - {response.text}",
+                 "ambiguous": ambiguous}
+                for bug in chunk
+            ]
+            continue
+
+        try:
+            data = response.json()
+        except ValueError:
+            errors += [
+                {"bug_id": bug['id'], "error": f"Jira yanıtı okunamadı: {response.text[:200]}", "ambiguous": True}
+                for bug in chunk
+            ]
+            continue
+
+        failed = {}
+        for error in data.get("errors", []):
+            failed[error.get("failedElementNumber")] = _element_error_text(error)
+
+        # Başarılı issue'lar, başarısız olanlar çıkarıldıktan sonraki sırayla döner
+        issues = iter(data.get("issues", []))
+        for index, bug in enumerate(chunk):
+            if index in failed:
+                errors.append({"bug_id": bug['id'], "error": failed[index], "ambiguous": False})
+                continue
+            issue = next(issues, None)
+            if issue is None:
+                errors.append({"bug_id": bug['id'], "error": "Jira yanıtında issue bulunamadı", "ambiguous": True})
+                continue
+            created.append({
+                "bug_id": bug['id'],
+                "issue_key": issue['key'],
+                "issue_url": f"{JIRA_URL}/browse/{issue['key']}"
+            })
+
+    if errors:
+        message = f"⚠️ {len(created)} Jira issue oluşturuldu, {len(errors)} bug aktarılamadı"
+    else:
+        message = f"✅ {len(created)} Jira issue başarıyla oluşturuldu"
+    if USE_MOCK_JIRA:
+        message += " (Demo mode: simülasyon)"
+
+    return {
+        "success": not errors,
+        "created": created,
+        "errors": errors,
+        "message": message
+    }
+
+
+def find_jira_issues_for_bugs(bug_ids):
+    """
+    Bug'lar için daha önce açılmış issue'ları smartqa-bug-<id> etiketiyle JQL'de ara.
+    Gönderim sonucu belirsiz kalan bug'lar tekrar gönderilmeden önce kontrol edilir.
+    {'success', 'found': {bug_id: {'bug_id', 'issue_key', 'issue_url'}}, 'message'}
+    """
+    if USE_MOCK_JIRA:
+        return {"success": True, "found": {}, "message": "Demo mode: arama yapılmadı"}
+
+    labels = {_bug_label(bug_id): bug_id for bug_id in bug_ids}
+    found = {}
+    label_list = list(labels)
+
+    for start in range(0, len(label_list), JIRA_BULK_LIMIT):
+        chunk = label_list[start:start + JIRA_BULK_LIMIT]
+        jql = f'project = "{JIRA_PROJECT_KEY}" AND labels in ({", ".join(chunk)})'
+        try:
+            response = _request("GET", "/rest/api/3/search", params={
+                "jql": jql, "fields": "labels", "maxResults": len(chunk) * 2
+            })
+            if response.status_code != 200:
+                return {"success": False, "found": found,
+                        "message": f"Jira arama hatası: {response.status_code} - {response.text}"}
+            issues = response.json().get("issues", [])
+        except Exception as e:
+            return {"success": False, "found": found, "message": f"Jira arama hatası: {str(e)}"}
+
+        for issue in issues:
+            for label in issue.get("fields", {}).get("labels", []):
+                if label in labels:
+                    bug_id = labels[label]
+                    found[bug_id] = {
+                        "bug_id": bug_id,
+                        "issue_key": issue['key'],
+                        "issue_url": f"{JIRA_URL}/browse/{issue['key']}"
+                    }
+
+    return {"success": True, "found": found, "message": f"{len(found)} issue bulundu"}
+
+
 def test_jira_connection():
     """
     Jira bağlantısını test et
@@ -133,20 +383,7 @@ def test_jira_connection():
         }
     
     try:
-        auth_string = f"{JIRA_EMAIL}:{JIRA_API_TOKEN}"
-        auth_bytes = auth_string.encode('ascii')
-        auth_base64 = base64.b64encode(auth_bytes).decode('ascii')
-        
-        headers = {
-            "Authorization": f"Basic {auth_base64}",
-            "Content-Type": "application/json"
-        }
-        
-        response = requests.get(
-            f"{JIRA_URL}/rest/api/3/myself",
-            headers=headers,
-            timeout=10
-        )
+        response = _request("GET", "/rest/api/3/myself")
         
         if response.status_code == 200:
             user_data = response.json()
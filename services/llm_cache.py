@@ -0,0 +1,137 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+
+# LLM yanıt önbelleği ayarları
+LLM_CACHE_PATH = os.getenv("SMARTQA_LLM_CACHE_PATH", "database/llm_cache.db")
+LLM_CACHE_TTL_SECONDS = int(os.getenv("SMARTQA_LLM_CACHE_TTL", str(7 * 24 * 3600)))  # 7 gün
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("SMARTQA_LLM_CACHE_MAX_ENTRIES", "500"))
+# Tek bir yanıt yüzlerce KB olabildiğinden toplam boyut da sınırlanır
+LLM_CACHE_MAX_BYTES = int(os.getenv("SMARTQA_LLM_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+
+_lock = threading.Lock()
+_conn = None
+
+def _get_connection():
+    """Önbellek veritabanı bağlantısını (gerekirse oluşturarak) getir"""
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(LLM_CACHE_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(LLM_CACHE_PATH, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,  -- sha256(model + prompt + parametreler)
+                model TEXT,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL DEFAULT 0,  -- yanıtın UTF-8 byte boyutu
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL
+            )
+        ''')
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(llm_cache)")]
+        if "size" not in columns:
+            # size kolonundan önce oluşturulmuş önbellek dosyası
+            conn.execute("ALTER TABLE llm_cache ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+            conn.execute("UPDATE llm_cache SET size = length(CAST(response AS BLOB))")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used_at)")
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS llm_cache_stats (
+                name TEXT PRIMARY KEY,  -- hits, misses
+                value INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        conn.commit()
+        _conn = conn
+    return _conn
+
+def _count(conn, name):
+    conn.execute(
+        """INSERT INTO llm_cache_stats (name, value) VALUES (?, 1)
+           ON CONFLICT (name) DO UPDATE SET value = value + 1""",
+        (name,)
+    )
+
+def make_cache_key(model, prompt, **params):
+    """Model, prompt ve parametrelerden içerik tabanlı önbellek anahtarı üret"""
+    payload = json.dumps(
+        {"model": model, "prompt": prompt, "params": params},
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def get_cached_response(key):
+    """Önbellekteki yanıtı getir; yoksa veya süresi dolduysa None döndür"""
+    now = time.time()
+    with _lock:
+        conn = _get_connection()
+        row = conn.execute(
+            "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None or now - row[1] > LLM_CACHE_TTL_SECONDS:
+            if row is not None:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            _count(conn, 'misses')
+            conn.commit()
+            return None
+
+        conn.execute("UPDATE llm_cache SET last_used_at = ? WHERE key = ?", (now, key))
+        _count(conn, 'hits')
+        conn.commit()
+        return row[0]
+
+def store_response(key, model, response):
+    """
+    Yanıtı önbelleğe yaz; süresi dolanları temizle. Kayıt sayısı LLM_CACHE_MAX_ENTRIES'ı
+    veya toplam boyut LLM_CACHE_MAX_BYTES'ı aşarsa en uzun süredir kullanılmayanlar atılır.
+    """
+    now = time.time()
+    size = len(response.encode("utf-8"))
+    with _lock:
+        conn = _get_connection()
+        conn.execute(
+            """INSERT OR REPLACE INTO llm_cache (key, model, response, size, created_at, last_used_at)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (key, model, response, size, now, now)
+        )
+        conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - LLM_CACHE_TTL_SECONDS,))
+        # En son kullanılandan geriye doğru sayı ve boyut sınırına sığmayanları at
+        conn.execute(
+            """DELETE FROM llm_cache WHERE key IN (
+                   SELECT key FROM (
+                       SELECT key,
+                              ROW_NUMBER() OVER recent AS position,
+                              SUM(size) OVER recent AS total_size
+                       FROM llm_cache
+                       WINDOW recent AS (ORDER BY last_used_at DESC, key)
+                   )
+                   WHERE position > ? OR total_size > ?)""",
+            (LLM_CACHE_MAX_ENTRIES, LLM_CACHE_MAX_BYTES)
+        )
+        conn.commit()
+
+def get_llm_cache_stats():
+    """Önbellek isabet/ıskalama sayıları, kayıt sayısı ve toplam boyut (byte)"""
+    with _lock:
+        conn = _get_connection()
+        stats = dict(conn.execute("SELECT name, value FROM llm_cache_stats").fetchall())
+        entries, total_bytes = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+    return {
+        'hits': stats.get('hits', 0),
+        'misses': stats.get('misses', 0),
+        'entries': entries,
+        'bytes': total_bytes
+    }
+
+def clear_llm_cache():
+    """Tüm önbelleği temizle"""
+    with _lock:
+        conn = _get_connection()
+        conn.execute("DELETE FROM llm_cache")
+        conn.commit()
@@ -0,0 +1,350 @@
+"""
+LLM çıktısından JSON çıkarma
+
+Model yanıtları çoğu zaman markdown code fence içinde, başında açıklama metniyle,
+sonu kesik ya da sondaki virgül gibi küçük hatalarla gelir. Buradaki fonksiyonlar
+bu yanıtlardan kurtarılabilen her şeyi çıkarır ve alanları şemaya göre doğrular.
+"""
+import re
+import json
+from database.models import PRIORITIES, SEVERITIES, PRIORITY_ALIASES, normalize_steps
+
+# Alan adı: (tip, zorunlu mu)
+SCENARIO_SCHEMA = {
+    "title": (str, True),
+    "description": (str, False),
+    "steps": (list, True),
+    "priority": (str, False)
+}
+
+BUG_REPORT_SCHEMA = {
+    "title": (str, True),
+    "severity": (str, False),
+    "description": (str, True),
+    "steps_to_reproduce": (str, True),
+    "expected_result": (str, False),
+    "actual_result": (str, False)
+}
+
+_CLOSING_AHEAD = re.compile(r"\s*[}\]]")
+_FIRST_BRACKET = re.compile(r"[\[{]")
+
+def strip_code_fences(text):
+    """Markdown code fence'lerini kaldır; kapanmamış fence'i de kabul eder"""
+    match = re.search(r"```[a-zA-Z]*\s*\n?", text)
+    if not match:
+        return text
+    body = text[match.end():]
+    closing = body.find("```")
+    return body if closing == -1 else body[:closing]
+
+def _remove_trailing_commas(text):
+    """String dışındaki '}' ve ']' öncesi fazladan virgülleri sil"""
+    result = []
+    in_string = False
+    escape = False
+    for index, char in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == ",":
+            if _CLOSING_AHEAD.match(text, index + 1):
+                continue
+        result.append(char)
+    return "".join(result)
+
+def _close_truncated(text):
+    """Kesik JSON'un açık kalan string ve parantezlerini kapat"""
+    stack = []
+    in_string = False
+    escape = False
+    for char in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+
+    if escape:
+        text = text[:-1]
+    if in_string:
+        text += '"'
+    # Yarım kalmış "anahtar": veya sondaki virgülü at
+    text = re.sub(r'(,\s*"[^"]*"\s*:\s*|,\s*|:\s*)$', "", text.rstrip())
+    return text + "".join(reversed(stack))
+
+def _complete_members(text):
+    """
+    Kesik bir JSON objesini yalnızca tamamlanmış üyeleriyle kapat.
+    Akış bittiğinde açık kalan değer (yarım string, kapanmamış liste, eksik literal)
+    tamamlanmış sayılmaz ve atılır. (obje_metni, atılan_üye_var_mı) döndürür.
+    """
+    depth = 0
+    in_string = False
+    escape = False
+    last_comma = None
+    for index, char in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+        elif char == "," and depth == 1:
+            last_comma = index
+
+    if not in_string and depth == 1:
+        candidate = re.sub(r",\s*$", "", text.rstrip()) + "}"
+        try:
+            json.loads(_remove_trailing_commas(candidate), strict=False)
+            return candidate, False
+        except json.JSONDecodeError:
+            pass
+
+    if last_comma is None:
+        return "{}", True
+    return text[:last_comma] + "}", True
+
+def repair_json(text):
+    """Yaygın LLM çıktı hatalarını düzelterek JSON'u parse et; başarısız olursa ValueError fırlatır"""
+    text = strip_code_fences(text).strip()
+
+    # Baştaki/sondaki açıklama metnini at
+    starts = [index for index in (text.find("{"), text.find("[")) if index != -1]
+    if not starts:
+        raise ValueError("Yanıtta JSON bulunamadı")
+    text = text[min(starts):]
+
+    for candidate in (text, _remove_trailing_commas(text)):
+        try:
+            return json.loads(candidate, strict=False)
+        except json.JSONDecodeError:
+            pass
+
+        # Sonda fazladan metin varsa ilk geçerli JSON değerini al
+        try:
+            return json.JSONDecoder(strict=False).raw_decode(candidate)[0]
+        except json.JSONDecodeError:
+            pass
+
+    try:
+        return json.loads(_remove_trailing_commas(_close_truncated(text)), strict=False)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"JSON onarılamadı: {e}") from e
+
+def validate(obj, schema):
+    """
+    Objeyi şemaya göre doğrula ve normalize et.
+    (normalize_edilmiş_obje, hata_mesajı) döndürür; geçerliyse hata None olur.
+    """
+    if not isinstance(obj, dict):
+        return None, "Obje bekleniyordu"
+
+    normalized = {}
+    for field, (field_type, required) in schema.items():
+        value = obj.get(field)
+
+        if field_type is list and isinstance(value, (str, list)):
+            # "1. adım\n2. adım" şeklinde metin olarak gelen adımlar da listeye çevrilir
+            value = normalize_steps(value)
+        if field_type is str and isinstance(value, list):
+            # ["1. adım", "2. adım"] şeklinde gelen metin alanlarını satır satır birleştir
+            value = "\n".join(str(item).strip() for item in value if str(item).strip())
+        elif field_type is str and value is not None and not isinstance(value, str):
+            value = str(value)
+        if isinstance(value, str):
+            value = value.strip()
+
+        if required and not value:
+            return None, f"'{field}' alanı zorunludur"
+        normalized[field] = value if value is not None else field_type()
+
+    for field, levels in (("priority", PRIORITIES), ("severity", SEVERITIES)):
+        if field in schema:
+            level = normalized[field].lower()
+            level = PRIORITY_ALIASES.get(level, level)
+            normalized[field] = level if level in levels else "medium"
+
+    return normalized, None
+
+class IncrementalScenarioParser:
+    """
+    Token akışından gelen metni parça parça işleyip "test_scenarios" dizisindeki
+    her senaryo objesini, kapanış parantezi gelir gelmez doğrulanmış olarak döndürür.
+    Markdown code fence'leri ve dizi öncesindeki açıklama metni yok sayılır; anahtar
+    olmadan doğrudan dizi olarak gelen yanıtlar da kabul edilir.
+    Onarılamayan veya şemaya uymayan objeler self.errors listesinde toplanır.
+    """
+
+    ARRAY_KEY = '"test_scenarios"'
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._in_array = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._object_start = None
+        self.errors = []
+
+    @property
+    def truncated(self):
+        """Dizi kapanmadan akış bittiyse True (finish() sonrası anlamlıdır)"""
+        return self._in_array and not self._done
+
+    def _find_array_start(self, text):
+        key_index = text.find(self.ARRAY_KEY)
+        if key_index != -1:
+            return text.find("[", key_index + len(self.ARRAY_KEY))
+
+        # Anahtar yoksa ve yanıt doğrudan dizi ile başlıyorsa onu kullan
+        body_start = 0
+        fence = re.match(r"\s*```[a-zA-Z]*\s*", text)
+        if fence:
+            body_start = fence.end()
+        match = _FIRST_BRACKET.search(text, body_start)
+        if match and match.group() == "[" and not text[body_start:match.start()].strip():
+            return match.start()
+        return -1
+
+    def _emit(self, raw, completed):
+        try:
+            obj = json.loads(raw, strict=False)
+        except json.JSONDecodeError:
+            try:
+                obj = repair_json(raw)
+            except ValueError as e:
+                self.errors.append(str(e))
+                return
+
+        scenario, error = validate(obj, SCENARIO_SCHEMA)
+        if error:
+            self.errors.append(error)
+        else:
+            completed.append(scenario)
+
+    def feed(self, chunk):
+        """Yeni metin parçasını ekle, tamamlanan senaryoları liste olarak döndür"""
+        self.text += chunk
+        completed = []
+
+        if self._done:
+            return completed
+
+        text = self.text
+        if not self._in_array:
+            bracket_index = self._find_array_start(text)
+            if bracket_index == -1:
+                return completed
+            self._in_array = True
+            self._pos = bracket_index + 1
+
+        for index in range(self._pos, len(text)):
+            char = text[index]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if self._depth == 0 and char == "{":
+                    self._object_start = index
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 0:
+                    # test_scenarios dizisi kapandı
+                    self._done = True
+                    break
+                self._depth -= 1
+                if self._depth == 0 and self._object_start is not None:
+                    self._emit(text[self._object_start:index + 1], completed)
+                    self._object_start = None
+        else:
+            self._pos = len(text)
+
+        return completed
+
+    def finish(self):
+        """
+        Akış bittiğinde çağrılır. Kesik kalan son objenin yalnızca tamamlanmış alanları
+        okunur; yarım kalan değer atılır. Şemadaki tüm alanlar tamamlanmışsa obje
+        kurtarılır, aksi halde kesik olarak self.errors'a yazılır.
+        """
+        completed = []
+        if self._done or self._object_start is None:
+            return completed
+
+        self._object_start, tail = None, self.text[self._object_start:]
+        try:
+            members, dropped = _complete_members(tail)
+            obj = json.loads(_remove_trailing_commas(members), strict=False)
+        except json.JSONDecodeError:
+            self.errors.append("Kesik senaryo atlandı: JSON onarılamadı")
+            return completed
+
+        # Başlığı, adımları veya önceliği yarım kalmış bir senaryoyu kaydetmektense atla
+        missing = [field for field in SCENARIO_SCHEMA if field not in obj]
+        if missing:
+            reason = "yarım kalan alan atıldı" if dropped else "alanlar eksik"
+            self.errors.append(f"Kesik senaryo atlandı ({reason}: {', '.join(missing)})")
+            return completed
+
+        scenario, error = validate(obj, SCENARIO_SCHEMA)
+        if error:
+            self.errors.append(error)
+        else:
+            completed.append(scenario)
+        return completed
+
+def extract_scenarios(text):
+    """
+    Tam bir yanıt metnindeki tüm geçerli senaryoları çıkar.
+    {'scenarios': [...], 'errors': [...], 'truncated': bool} döndürür.
+    """
+    parser = IncrementalScenarioParser()
+    scenarios = parser.feed(text)
+    truncated = parser.truncated
+    scenarios += parser.finish()
+    return {
+        'scenarios': scenarios,
+        'errors': parser.errors,
+        'truncated': truncated
+    }
+
+def parse_bug_report(text):
+    """Yanıttaki bug raporunu onarıp doğrula; başarısız olursa ValueError fırlatır"""
+    obj = repair_json(text)
+    report, error = validate(obj, BUG_REPORT_SCHEMA)
+    if error:
+        raise ValueError(error)
+    return report
@@ -0,0 +1,120 @@
+"""
+Testler için yerel Anthropic sunucusu
+
+Messages API'nin akış (SSE) yanıtlarını taklit eden küçük bir HTTP sunucusu.
+ANTHROPIC_BASE_URL bu sunucuya yönlendirilir; her istek için sıradaki hazır yanıt
+metin parçaları halinde gönderilir ve gelen istekler kaydedilir.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeAnthropic:
+    def __init__(self):
+        self.responses = []
+        self.requests = []
+        self.sent_chunks = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def respond(self, chunks, stop_reason="end_turn", drop_after=None, pause_after=None, resume=None):
+        """
+        Sıradaki isteğe verilecek akışı ekle.
+        drop_after: bu kadar parçadan sonra bağlantıyı yarıda kes.
+        pause_after: bu kadar parçadan sonra resume (threading.Event) set edilene kadar bekle.
+        """
+        self.responses.append({
+            'chunks': list(chunks),
+            'stop_reason': stop_reason,
+            'drop_after': drop_after,
+            'pause_after': pause_after,
+            'resume': resume
+        })
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _next_response(self, body):
+        with self._lock:
+            self.requests.append(body)
+            if self.responses:
+                return self.responses.pop(0)
+        return None
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _write_chunk(self, data):
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            def _event(self, name, payload):
+                self._write_chunk(f"event: {name}\ndata: {json.dumps(payload)}\n\n".encode())
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                response = fake._next_response(body)
+
+                if response is None:
+                    data = json.dumps({"type": "error", "error": {
+                        "type": "invalid_request_error", "message": "Beklenmeyen istek"}}).encode()
+                    self.send_response(400)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+                self._event("message_start", {"type": "message_start", "message": {
+                    "id": "msg_test", "type": "message", "role": "assistant", "model": body["model"],
+                    "content": [], "stop_reason": None, "stop_sequence": None,
+                    "usage": {"input_tokens": 10, "output_tokens": 0}}})
+                self._event("content_block_start", {"type": "content_block_start", "index": 0,
+                                                    "content_block": {"type": "text", "text": ""}})
+
+                for index, text in enumerate(response['chunks']):
+                    if index == response['drop_after']:
+                        # Sonlandırıcı parça gönderilmeden bağlantı kapanır
+                        self.close_connection = True
+                        return
+                    if index == response['pause_after']:
+                        response['resume'].wait(5)
+                    self._event("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                                        "delta": {"type": "text_delta", "text": text}})
+                    with fake._lock:
+                        fake.sent_chunks += 1
+
+                self._event("content_block_stop", {"type": "content_block_stop", "index": 0})
+                self._event("message_delta", {"type": "message_delta",
+                                              "delta": {"stop_reason": response['stop_reason'],
+                                                        "stop_sequence": None},
+                                              "usage": {"output_tokens": len(response['chunks'])}})
+                self._event("message_stop", {"type": "message_stop"})
+                self.wfile.write(b"0\r\n\r\n")
+                self.wfile.flush()
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,40 @@
+import os
+import tempfile
+
+# Database modülleri yüklenmeden önce testlere ait geçici veritabanını seç
+_TEST_DIR = tempfile.mkdtemp(prefix="smartqa_test_")
+os.environ["SMARTQA_DB_PATH"] = os.path.join(_TEST_DIR, "test.db")
+os.environ["SMARTQA_LLM_CACHE_PATH"] = os.path.join(_TEST_DIR, "llm_cache.db")
+
+import pytest
+from services import jira_service
+from services import claude_service
+from services.llm_cache import clear_llm_cache
+from tests.jira_server import FakeJira
+from tests.anthropic_server import FakeAnthropic
+
+
+@pytest.fixture
+def jira(monkeypatch):
+    """jira_service'i yerel sahte Jira sunucusuna yönlendir"""
+    server = FakeJira().start()
+    monkeypatch.setattr(jira_service, "JIRA_URL", server.url)
+    monkeypatch.setattr(jira_service, "JIRA_PROJECT_KEY", "TEST")
+    monkeypatch.setattr(jira_service, "USE_MOCK_JIRA", False)
+    monkeypatch.setattr(jira_service, "JIRA_TIMEOUT", (1, 0.3))
+    monkeypatch.setattr(jira_service, "JIRA_BACKOFF_BASE", 0.001)
+    monkeypatch.setattr(jira_service, "_session", None)
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def anthropic(monkeypatch):
+    """claude_service'i boş önbellekle yerel sahte Anthropic sunucusuna yönlendir"""
+    server = FakeAnthropic().start()
+    monkeypatch.setenv("ANTHROPIC_BASE_URL", server.url)
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setattr(claude_service, "USE_MOCK_AI", False)
+    clear_llm_cache()
+    yield server
+    server.stop()
@@ -0,0 +1,75 @@
+"""
+Testler için yerel Jira sunucusu
+
+Gerçek Jira yerine geçen küçük bir HTTP sunucusu. Her istek için sıradaki hazır
+yanıt (durum kodu, gövde, başlıklar, gecikme) döner; gelen istekler kaydedilir.
+"""
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeJira:
+    def __init__(self):
+        self.responses = []
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def respond(self, status, body=None, headers=None, delay=0):
+        """Sıradaki isteğe verilecek yanıtı ekle"""
+        self.responses.append((status, body, headers or {}, delay))
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _next_response(self, method, path, body):
+        with self._lock:
+            self.requests.append({"method": method, "path": path, "body": body})
+            if self.responses:
+                return self.responses.pop(0)
+        return 500, {"errorMessages": ["Beklenmeyen istek"]}, {}, 0
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _serve(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                body = json.loads(raw) if raw else None
+                status, payload, headers, delay = fake._next_response(self.command, self.path, body)
+                if delay:
+                    time.sleep(delay)
+                data = payload if isinstance(payload, bytes) else json.dumps(payload or {}).encode()
+                try:
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    # İstemci zaman aşımıyla bağlantıyı kapatmış olabilir
+                    pass
+
+            do_GET = _serve
+            do_POST = _serve
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,63 @@
+import threading
+import pytest
+from services.claude_service import stream_test_scenarios
+
+CHUNKS = [
+    '```json\n{"test_scenarios": [',
+    '{"title": "Giriş", "steps": ["Aç", "Gir"], "priority": "high"}',
+    ', {"title": "Çıkış", ',
+    '"steps": ["Çık"]}',
+    ']}\n```'
+]
+
+
+def _stream(num_scenarios=2):
+    return stream_test_scenarios("Demo", "https://demo.test", "Açıklama", num_scenarios)
+
+
+def test_scenarios_are_yielded_as_they_complete(anthropic):
+    resume = threading.Event()
+    anthropic.respond(CHUNKS, pause_after=2, resume=resume)
+
+    scenarios = _stream()
+    first = next(scenarios)
+    # İlk senaryo, yanıtın geri kalanı gönderilmeden önce gelir
+    assert first['title'] == "Giriş"
+    assert anthropic.sent_chunks == 2
+
+    resume.set()
+    assert [scenario['title'] for scenario in scenarios] == ["Çıkış"]
+
+
+def test_complete_response_is_served_from_cache(anthropic):
+    anthropic.respond(CHUNKS)
+
+    first = list(_stream())
+    second = list(_stream())
+
+    assert second == first
+    assert len(anthropic.requests) == 1
+    assert anthropic.requests[0]['stream'] is True
+
+
+def test_response_cut_at_max_tokens_is_not_cached(anthropic):
+    anthropic.respond(CHUNKS[:3], stop_reason="max_tokens")
+    anthropic.respond(CHUNKS)
+
+    assert [scenario['title'] for scenario in _stream()] == ["Giriş"]
+    assert [scenario['title'] for scenario in _stream()] == ["Giriş", "Çıkış"]
+    assert len(anthropic.requests) == 2
+
+
+def test_dropped_stream_raises_hata_and_is_not_cached(anthropic):
+    anthropic.respond(CHUNKS, drop_after=3)
+    anthropic.respond(CHUNKS)
+
+    received = []
+    with pytest.raises(RuntimeError, match="^Hata: "):
+        for scenario in _stream():
+            received.append(scenario['title'])
+
+    assert received == ["Giriş"]
+    assert len(list(_stream())) == 2
+    assert len(anthropic.requests) == 2
@@ -0,0 +1,12 @@
+from database import models
+
+
+def test_project_scope_counts_the_project_itself():
+    project_id = models.create_project("Dashboard", "", "")
+    models.create_test_scenario(project_id, "Giriş", "", ["Aç"])
+
+    stats = models.get_dashboard_stats(project_id)
+
+    assert stats['total_projects'] == 1
+    assert stats['total_scenarios'] == 1
+    assert models.get_dashboard_stats()['total_projects'] >= 1
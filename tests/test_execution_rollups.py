@@ -0,0 +1,48 @@
+from database import models
+from database.db import db_connection
+from database.rebuild import rebuild
+
+
+def _rollups(project_id=None):
+    with db_connection() as conn:
+        sql = "SELECT project_id, day, priority, status, count FROM execution_daily_rollups"
+        if project_id is not None:
+            return [tuple(row) for row in conn.execute(sql + " WHERE project_id = ?", (project_id,))]
+        return sorted(tuple(row) for row in conn.execute(sql))
+
+
+def _create_project_with_executions(name):
+    project_id = models.create_project(name, "", "")
+    scenario_id = models.create_test_scenario(project_id, "Giriş", "", ["Aç"], priority="high")
+    models.create_test_execution(scenario_id, "pass")
+    models.create_test_execution(scenario_id, "fail")
+    return project_id, scenario_id
+
+
+def test_delete_project_leaves_no_empty_rollups():
+    project_id, _ = _create_project_with_executions("Silinecek")
+
+    models.delete_project(project_id)
+
+    assert _rollups(project_id) == []
+    assert all(row[4] > 0 for row in _rollups(0))
+
+
+def test_priority_change_removes_empty_rollups():
+    project_id, scenario_id = _create_project_with_executions("Öncelik")
+
+    models.update_test_scenario(scenario_id, "Giriş", "", ["Aç"], "low")
+
+    rows = _rollups(project_id)
+    assert {row[2] for row in rows} == {"low"}
+    assert all(row[4] > 0 for row in _rollups(0))
+
+
+def test_rebuild_restores_rollups():
+    _create_project_with_executions("Yeniden")
+    expected = _rollups()
+    with db_connection() as conn:
+        conn.execute("DELETE FROM execution_daily_rollups")
+
+    assert rebuild(["rollups"]) == ["rollups"]
+    assert _rollups() == expected
@@ -0,0 +1,59 @@
+import io
+import json
+from database import models
+from services import import_service
+
+
+def _import(content, file_name, project_name):
+    project_id = models.create_project(project_name, "", "")
+    result = import_service.import_scenarios(project_id, io.BytesIO(content.encode()), file_name)
+    titles = sorted(row['title'] for row in models.get_scenarios_by_project(project_id))
+    return result, titles
+
+
+def test_priority_aliases_are_resolved_by_the_model_validator():
+    row, error = models.validate_scenario({"title": " Giriş  ekranı ", "steps": "1. Aç\n2. Gir", "priority": "P1"})
+    assert error is None
+    assert row == ("Giriş ekranı", "", ["Aç", "Gir"], "high")
+
+    assert models.validate_scenario({"title": "x", "steps": ["a"], "priority": "acil"})[1] == "Geçersiz öncelik: acil"
+
+
+def test_csv_rows_go_through_the_model_validator():
+    content = "title,steps,priority\nGiriş,Aç|Gir,major\nÇıkış,Çık,acil\n"
+    result, titles = _import(content, "s.csv", "CSV")
+    assert result['saved_count'] == 1
+    assert result['errors'][0]['error'] == "Geçersiz öncelik: acil"
+    assert titles == ["Giriş"]
+
+
+def test_top_level_object_is_streamed(monkeypatch):
+    monkeypatch.setattr(import_service, "JSON_READ_SIZE", 16)
+    content = json.dumps({"version": 1, "test_scenarios": [
+        {"title": f"Senaryo {i}", "steps": ["adım"]} for i in range(5)
+    ]})
+    result, titles = _import(content, "s.json", "Obje")
+    assert result['saved_count'] == 5
+    assert result['errors'] == []
+
+
+def test_single_object_is_one_scenario():
+    result, titles = _import(json.dumps({"title": "Tek", "steps": ["adım"]}), "s.json", "Tek")
+    assert titles == ["Tek"]
+
+
+def test_oversized_element_is_skipped_with_a_row_error(monkeypatch):
+    monkeypatch.setattr(import_service, "JSON_READ_SIZE", 32)
+    monkeypatch.setattr(import_service, "JSON_MAX_ELEMENT_SIZE", 200)
+    # İkinci kayıt bozuk (eksik virgül), dördüncüsü çok büyük
+    content = (
+        '[{"title": "A", "steps": ["a"]},'
+        ' {"title": "B" "steps": ["b"], "description": "' + "x" * 300 + '"},'
+        ' {"title": "C", "steps": ["c"]},'
+        ' {"title": "D", "steps": ["d"], "description": "' + "y" * 500 + '"},'
+        ' {"title": "E", "steps": ["e"]}]'
+    )
+    result, titles = _import(content, "s.json", "Büyük")
+    assert titles == ["A", "C", "E"]
+    assert [error['line'] for error in result['errors']] == [2, 4]
+    assert "sınırını aşıyor" in result['errors'][0]['error']
@@ -0,0 +1,110 @@
+import pytest
+from database.db import db_connection
+from database import models
+from services import jira_outbox
+
+
+@pytest.fixture
+def bug_id():
+    """Kuyruğa alınmış tek bir bug raporu"""
+    project_id = models.create_project("Outbox", "", "")
+    scenario_id = models.create_test_scenario(project_id, "Giriş", "", ["Aç"])
+    execution_id = models.create_test_execution(scenario_id, "fail")
+    bug_id = models.create_bug_report(execution_id, "Giriş çalışmıyor", "high", "d", "s", "e", "a")
+    models.enqueue_jira_pushes([bug_id])
+    return bug_id
+
+
+def _outbox_row(bug_id):
+    with db_connection() as conn:
+        return conn.execute("SELECT * FROM jira_outbox WHERE bug_id = ?", (bug_id,)).fetchone()
+
+
+def _make_due(bug_id):
+    with db_connection() as conn:
+        conn.execute("UPDATE jira_outbox SET next_attempt_at = CURRENT_TIMESTAMP WHERE bug_id = ?", (bug_id,))
+
+
+def test_active_lease_is_not_reclaimed(bug_id):
+    assert [bug['id'] for bug in models.claim_jira_outbox_batch(50)] == [bug_id]
+    assert models.claim_jira_outbox_batch(50, lease_seconds=600) == []
+
+    reclaimed = models.claim_jira_outbox_batch(50, lease_seconds=0)
+    assert [bug['id'] for bug in reclaimed] == [bug_id]
+    assert reclaimed[0]['needs_verification'] == 1
+    assert reclaimed[0]['attempts'] == 2
+
+
+def test_post_read_timeout_is_verified_before_resending(jira, bug_id):
+    jira.respond(201, {"issues": [{"key": "TEST-9"}], "errors": []}, delay=1)
+
+    jira_outbox.process_outbox_once()
+
+    row = _outbox_row(bug_id)
+    assert row['status'] == 'pending'
+    assert row['needs_verification'] == 1
+    assert "Bağlantı hatası" in row['last_error']
+
+    # İlk istek issue'yu açmıştı; ikinci turda POST yerine arama yapılır
+    _make_due(bug_id)
+    jira.respond(200, {"issues": [{"key": "TEST-9", "fields": {"labels": [f"smartqa-bug-{bug_id}"]}}]})
+    jira_outbox.process_outbox_once()
+
+    assert [request['method'] for request in jira.requests] == ["POST", "GET"]
+    assert f"smartqa-bug-{bug_id}" in jira.requests[1]['path']
+    assert _outbox_row(bug_id)['status'] == 'done'
+    with db_connection() as conn:
+        issue_key = conn.execute("SELECT jira_issue_key FROM bug_reports WHERE id = ?", (bug_id,)).fetchone()[0]
+    assert issue_key == "TEST-9"
+
+
+def test_failed_lookup_does_not_resend(jira, bug_id):
+    with db_connection() as conn:
+        conn.execute("UPDATE jira_outbox SET needs_verification = 1 WHERE bug_id = ?", (bug_id,))
+    jira.respond(400, {"errorMessages": ["JQL hatası"]})
+
+    jira_outbox.process_outbox_once()
+
+    assert [request['method'] for request in jira.requests] == ["GET"]
+    row = _outbox_row(bug_id)
+    assert row['status'] == 'pending'
+    assert row['needs_verification'] == 1
+    assert "Jira arama hatası" in row['last_error']
+
+
+def test_rejected_bug_is_retried_without_verification(jira, bug_id):
+    jira.respond(201, {"issues": [], "errors": [
+        {"failedElementNumber": 0, "elementErrors": {"errorMessages": ["izin yok"]}}
+    ]})
+
+    jira_outbox.process_outbox_once()
+
+    row = _outbox_row(bug_id)
+    assert row['status'] == 'pending'
+    assert row['needs_verification'] == 0
+    assert row['last_error'] == "izin yok"
+
+
+def test_unexpected_error_is_recorded_on_the_row(bug_id, monkeypatch, caplog):
+    def broken(bugs):
+        raise KeyError("issues")
+    monkeypatch.setattr(jira_outbox, "create_jira_issues_bulk", broken)
+
+    jira_outbox.process_outbox_once()
+
+    row = _outbox_row(bug_id)
+    assert row['status'] == 'pending'
+    assert row['needs_verification'] == 1
+    assert "Beklenmeyen hata" in row['last_error']
+    assert "beklenmeyen hatayla" in caplog.text
+
+
+def test_claim_joins_an_open_transaction(bug_id):
+    with db_connection() as conn:
+        conn.execute("UPDATE jira_outbox SET last_error = 'not' WHERE bug_id = ?", (bug_id,))
+        assert conn.in_transaction
+
+        claimed = models.claim_jira_outbox_batch(50)
+
+    assert [bug['id'] for bug in claimed] == [bug_id]
+    assert _outbox_row(bug_id)['status'] == 'sending'
@@ -0,0 +1,169 @@
+import pytest
+import requests
+from services import jira_service
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_post_is_retried_on_throttling(jira, status):
+    jira.respond(status, headers={"Retry-After": "0"})
+    jira.respond(status)
+    jira.respond(201, {"key": "TEST-1"})
+
+    response = jira_service._request("POST", "/rest/api/3/issue", json={})
+
+    assert response.status_code == 201
+    assert len(jira.requests) == 3
+    assert jira_service.get_jira_call_timings()[-1]["attempts"] == 3
+
+
+def test_retry_after_header_is_honoured(jira, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(jira_service.time, "sleep", sleeps.append)
+    jira.respond(429, headers={"Retry-After": "7"})
+    jira.respond(200, {})
+
+    jira_service._request("GET", "/rest/api/3/myself")
+
+    assert sleeps == [7.0]
+
+
+def test_retries_stop_at_the_limit(jira, monkeypatch):
+    monkeypatch.setattr(jira_service, "JIRA_MAX_RETRIES", 2)
+    for _ in range(3):
+        jira.respond(503)
+
+    response = jira_service._request("POST", "/rest/api/3/issue", json={})
+
+    assert response.status_code == 503
+    assert len(jira.requests) == 3
+
+
+@pytest.mark.parametrize("status", [502, 504])
+def test_gateway_errors_are_retried_only_for_get(jira, status):
+    jira.respond(status)
+    jira.respond(200, {"displayName": "QA"})
+    assert jira_service._request("GET", "/rest/api/3/myself").status_code == 200
+    assert len(jira.requests) == 2
+
+    jira.respond(status)
+    assert jira_service._request("POST", "/rest/api/3/issue", json={}).status_code == status
+    assert len(jira.requests) == 3
+
+
+def test_post_read_timeout_is_not_retried(jira):
+    # İstek işlenmiş olabilir; tekrar göndermek mükerrer issue açar
+    jira.respond(201, {"key": "TEST-1"}, delay=1)
+
+    with pytest.raises(requests.ReadTimeout):
+        jira_service._request("POST", "/rest/api/3/issue", json={})
+
+    assert len(jira.requests) == 1
+
+
+def test_get_read_timeout_is_retried(jira):
+    jira.respond(200, {}, delay=1)
+    jira.respond(200, {"displayName": "QA"})
+
+    assert jira_service._request("GET", "/rest/api/3/myself").status_code == 200
+    assert len(jira.requests) == 2
+
+
+def _bugs(count):
+    return [
+        {"id": 100 + i, "title": f"Bug {i}", "description": "", "steps_to_reproduce": "",
+         "expected_result": "", "actual_result": "", "severity": "high"}
+        for i in range(count)
+    ]
+
+
+def test_bulk_maps_failed_elements_to_bugs(jira):
+    jira.respond(201, {
+        "issues": [{"key": "TEST-1"}, {"key": "TEST-2"}],
+        "errors": [{"failedElementNumber": 1,
+                    "elementErrors": {"errorMessages": [], "errors": {"summary": "çok uzun"}}}]
+    })
+
+    result = jira_service.create_jira_issues_bulk(_bugs(3))
+
+    assert [(c["bug_id"], c["issue_key"]) for c in result["created"]] == [(100, "TEST-1"), (102, "TEST-2")]
+    assert [e["bug_id"] for e in result["errors"]] == [101]
+    assert "çok uzun" in result["errors"][0]["error"]
+    assert result["success"] is False
+    assert len(jira.requests[0]["body"]["issueUpdates"]) == 3
+
+
+def test_bulk_splits_into_chunks(jira, monkeypatch):
+    monkeypatch.setattr(jira_service, "JIRA_BULK_LIMIT", 2)
+    jira.respond(201, {"issues": [{"key": "TEST-1"}, {"key": "TEST-2"}], "errors": []})
+    jira.respond(201, {"issues": [], "errors": [
+        {"failedElementNumber": 0, "elementErrors": {"errorMessages": ["izin yok"]}}
+    ]})
+
+    result = jira_service.create_jira_issues_bulk(_bugs(3))
+
+    assert len(jira.requests) == 2
+    assert [c["bug_id"] for c in result["created"]] == [100, 101]
+    assert [e["bug_id"] for e in result["errors"]] == [102]
+    assert "izin yok" in result["errors"][0]["error"]
+
+
+def test_bulk_rejected_chunk_fails_every_bug(jira):
+    jira.respond(400, {"errorMessages": ["Geçersiz proje"]})
+
+    result = jira_service.create_jira_issues_bulk(_bugs(2))
+
+    assert result["created"] == []
+    assert [e["bug_id"] for e in result["errors"]] == [100, 101]
+    assert all("400" in e["error"] and not e["ambiguous"] for e in result["errors"])
+
+
+def test_bulk_missing_issue_is_reported(jira):
+    jira.respond(201, {"issues": [{"key": "TEST-1"}], "errors": []})
+
+    result = jira_service.create_jira_issues_bulk(_bugs(2))
+
+    assert [c["bug_id"] for c in result["created"]] == [100]
+    assert result["errors"][0]["bug_id"] == 101
+
+
+def test_bulk_marks_unknown_outcomes_as_ambiguous(jira):
+    # Okuma zaman aşımı, ağ geçidi hatası ve okunamayan yanıtta issue açılmış olabilir
+    jira.respond(201, {"issues": [{"key": "TEST-1"}]}, delay=1)
+    jira.respond(502)
+    jira.respond(201, b"<html>ok</html>")
+
+    results = [jira_service.create_jira_issues_bulk(_bugs(1)) for _ in range(3)]
+
+    assert [r["errors"][0]["ambiguous"] for r in results] == [True, True, True]
+    assert len(jira.requests) == 3
+
+
+def test_bulk_connection_refused_is_not_ambiguous(jira, monkeypatch):
+    monkeypatch.setattr(jira_service, "JIRA_MAX_RETRIES", 0)
+    jira.stop()
+
+    result = jira_service.create_jira_issues_bulk(_bugs(1))
+
+    assert result["errors"][0]["ambiguous"] is False
+
+
+def test_bugs_are_found_by_label(jira):
+    jira.respond(200, {"issues": [
+        {"key": "TEST-5", "fields": {"labels": ["smartqa", "smartqa-bug-101"]}}
+    ]})
+
+    result = jira_service.find_jira_issues_for_bugs([100, 101])
+
+    assert result["success"] is True
+    assert list(result["found"]) == [101]
+    assert result["found"][101]["issue_key"] == "TEST-5"
+    assert "smartqa-bug-100" in jira.requests[0]["path"]
+
+
+def test_bulk_payload_carries_the_bug_label(jira):
+    jira.respond(201, {"issues": [{"key": "TEST-1"}], "errors": []})
+
+    jira_service.create_jira_issues_bulk(_bugs(1))
+
+    labels = jira.requests[0]["body"]["issueUpdates"][0]["fields"]["labels"]
+    assert "smartqa-bug-100" in labels
@@ -0,0 +1,80 @@
+import sqlite3
+import pytest
+from services import llm_cache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """Geçici dosyada boş bir önbellek; saat elle ilerletilir"""
+    clock = [1000.0]
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_PATH", str(tmp_path / "llm_cache.db"))
+    monkeypatch.setattr(llm_cache, "_conn", None)
+    monkeypatch.setattr(llm_cache.time, "time", lambda: clock[0])
+    yield clock
+    if llm_cache._conn is not None:
+        llm_cache._conn.close()
+
+
+def test_hits_and_misses_are_counted(cache):
+    key = llm_cache.make_cache_key("model", "prompt", max_tokens=10)
+    assert llm_cache.get_cached_response(key) is None
+    llm_cache.store_response(key, "model", "yanıt")
+    assert llm_cache.get_cached_response(key) == "yanıt"
+
+    assert llm_cache.get_llm_cache_stats() == {'hits': 1, 'misses': 1, 'entries': 1, 'bytes': len("yanıt".encode())}
+
+
+def test_key_depends_on_parameters():
+    assert llm_cache.make_cache_key("m", "p", max_tokens=1) != llm_cache.make_cache_key("m", "p", max_tokens=2)
+
+
+def test_expired_entry_is_a_miss(cache, monkeypatch):
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_TTL_SECONDS", 60)
+    llm_cache.store_response("k", "model", "yanıt")
+
+    cache[0] += 61
+    assert llm_cache.get_cached_response("k") is None
+    assert llm_cache.get_llm_cache_stats()['entries'] == 0
+
+
+def test_least_recently_used_entry_is_evicted(cache, monkeypatch):
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_MAX_ENTRIES", 2)
+    llm_cache.store_response("a", "model", "A")
+    cache[0] += 1
+    llm_cache.store_response("b", "model", "B")
+    cache[0] += 1
+    llm_cache.get_cached_response("a")
+    cache[0] += 1
+    llm_cache.store_response("c", "model", "C")
+
+    assert llm_cache.get_cached_response("b") is None
+    assert llm_cache.get_cached_response("a") == "A"
+    assert llm_cache.get_cached_response("c") == "C"
+
+
+def test_total_size_is_bounded(cache, monkeypatch):
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_MAX_BYTES", 10)
+    llm_cache.store_response("a", "model", "x" * 6)
+    cache[0] += 1
+    llm_cache.store_response("b", "model", "y" * 6)
+
+    assert llm_cache.get_cached_response("a") is None
+    assert llm_cache.get_cached_response("b") == "y" * 6
+    assert llm_cache.get_llm_cache_stats()['bytes'] == 6
+
+    # Tek başına sınırı aşan yanıt saklanmaz
+    cache[0] += 1
+    llm_cache.store_response("c", "model", "z" * 11)
+    assert llm_cache.get_cached_response("c") is None
+
+
+def test_cache_file_without_size_column_is_upgraded(cache):
+    conn = sqlite3.connect(llm_cache.LLM_CACHE_PATH)
+    conn.execute("""CREATE TABLE llm_cache (key TEXT PRIMARY KEY, model TEXT, response TEXT NOT NULL,
+                    created_at REAL NOT NULL, last_used_at REAL NOT NULL)""")
+    conn.execute("INSERT INTO llm_cache VALUES ('eski', 'model', 'çok', 1000, 1000)")
+    conn.commit()
+    conn.close()
+
+    assert llm_cache.get_cached_response("eski") == "çok"
+    assert llm_cache.get_llm_cache_stats()['bytes'] == len("çok".encode())
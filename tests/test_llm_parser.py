@@ -0,0 +1,78 @@
+import json
+import pytest
+from benchmarks import llm_parser_corpus
+from services.llm_parser import IncrementalScenarioParser, extract_scenarios, repair_json, validate, SCENARIO_SCHEMA
+
+SCENARIOS = [
+    {"title": "Giriş", "description": "Geçerli kullanıcı", "steps": ["Aç", "Gir"], "priority": "high"},
+    {"title": "Çıkış", "description": "", "steps": ["Çık"], "priority": "low"},
+]
+RESPONSE = json.dumps({"test_scenarios": SCENARIOS}, ensure_ascii=False)
+
+
+def test_corpus_has_no_failures():
+    results = llm_parser_corpus.run(cases=300, seed=42)
+    assert results['failures'] == []
+
+
+@pytest.mark.parametrize("text", [
+    f"```json\n{RESPONSE}\n```",
+    f"İşte senaryolar:\n```json\n{RESPONSE}",
+    f"Senaryolar:\n\n{RESPONSE}\n\nBaşka bir şey?",
+    RESPONSE.replace("]}", ",]}").replace('"high"}', '"high",}'),
+])
+def test_wrapped_and_trailing_comma_responses(text):
+    result = extract_scenarios(text)
+    assert [scenario['title'] for scenario in result['scenarios']] == ["Giriş", "Çıkış"]
+    assert result['errors'] == []
+
+
+def test_truncated_response_keeps_completed_scenarios():
+    cut = RESPONSE.index('"Çıkış"') + 4
+    result = extract_scenarios(RESPONSE[:cut])
+    assert [scenario['title'] for scenario in result['scenarios']] == ["Giriş"]
+    assert result['truncated'] is True
+    assert result['errors'][0].startswith("Kesik senaryo atlandı")
+
+
+def test_truncated_object_with_all_fields_is_recovered():
+    text = RESPONSE[:RESPONSE.rindex('"low"') + len('"low"')]
+    assert [scenario['title'] for scenario in extract_scenarios(text)['scenarios']] == ["Giriş", "Çıkış"]
+
+
+def test_repair_json_closes_truncated_values():
+    assert repair_json('{"title": "Bug", "steps": ["a", "b') == {"title": "Bug", "steps": ["a", "b"]}
+    assert repair_json('[1, 2,]') == [1, 2]
+    with pytest.raises(ValueError):
+        repair_json("JSON yok")
+
+
+def test_validate_normalizes_steps_and_priority_aliases():
+    scenario, error = validate({"title": " T ", "steps": "1. Aç\n2. Gir", "priority": "P1"}, SCENARIO_SCHEMA)
+    assert error is None
+    assert scenario['steps'] == ["Aç", "Gir"]
+    assert scenario['priority'] == "high"
+    assert validate({"title": "T", "steps": [], "priority": "x"}, SCENARIO_SCHEMA)[1] == "'steps' alanı zorunludur"
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 16, len(RESPONSE)])
+def test_incremental_parser_is_independent_of_chunk_boundaries(size):
+    parser = IncrementalScenarioParser()
+    received = []
+    for start in range(0, len(RESPONSE), size):
+        received.append([scenario['title'] for scenario in parser.feed(RESPONSE[start:start + size])])
+    received.append([scenario['title'] for scenario in parser.finish()])
+
+    assert [title for titles in received for title in titles] == ["Giriş", "Çıkış"]
+    # Her senaryo kendi objesi kapandığı parçada gelir, sonda toplu olarak değil
+    first_chunk = next(index for index, titles in enumerate(received) if titles)
+    assert first_chunk <= (RESPONSE.index("}, {") + 1) // size
+
+
+def test_strings_with_brackets_do_not_split_objects():
+    text = json.dumps({"test_scenarios": [
+        {"title": "Parantez } ve ] içeren", "steps": ["\"{\" yaz", "Kaydet"]}
+    ]}, ensure_ascii=False)
+    parser = IncrementalScenarioParser()
+    scenarios = [s for char in text for s in parser.feed(char)] + parser.finish()
+    assert [scenario['steps'] for scenario in scenarios] == [['"{" yaz', "Kaydet"]]
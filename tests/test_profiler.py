@@ -0,0 +1,26 @@
+import sqlite3
+import importlib
+from database import profiler
+
+
+def test_profiling_is_off_by_default(monkeypatch):
+    monkeypatch.delenv("SMARTQA_SQL_PROFILE", raising=False)
+    monkeypatch.delenv("SMARTQA_SQL_PROFILE_PANEL", raising=False)
+    assert importlib.reload(profiler).PROFILE_ENABLED is False
+
+    monkeypatch.setenv("SMARTQA_SQL_PROFILE_PANEL", "1")
+    assert importlib.reload(profiler).PROFILE_ENABLED is True
+    monkeypatch.delenv("SMARTQA_SQL_PROFILE_PANEL")
+    importlib.reload(profiler)
+
+
+def test_profiled_connection_records_queries():
+    profiler.reset_query_stats()
+    conn = sqlite3.connect(":memory:", factory=profiler.ProfiledConnection)
+    conn.execute("CREATE TABLE t (x)")
+    conn.executemany("INSERT INTO t VALUES (?)", [(1,), (2,)])
+    assert conn.execute("SELECT x FROM t WHERE x > 0").fetchall() == [(1,), (2,)]
+
+    stats = {group['sql']: group for group in profiler.get_query_stats()}
+    assert stats["SELECT x FROM t WHERE x > ?"]['rows'] == 2
+    assert stats["INSERT INTO t VALUES (?)"]['rows'] == 2
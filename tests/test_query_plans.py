@@ -0,0 +1,34 @@
+import pytest
+from benchmarks.data_generator import generate_dataset
+from database.db import db_connection
+from database.queries import find_plan_regressions
+
+
+@pytest.fixture(scope="module")
+def analyzed_conn():
+    """Az projeli, istatistikleri toplanmış bir veri seti üzerinde bağlantı"""
+    with db_connection() as conn:
+        generate_dataset(conn, projects=3, scenarios=100, executions=10, seed=7)
+        conn.execute("ANALYZE")
+        yield conn
+
+
+def test_hot_queries_use_their_indexes(analyzed_conn):
+    assert find_plan_regressions(analyzed_conn) == []
+
+
+def test_full_table_scan_is_reported(analyzed_conn):
+    hot_queries = [(
+        "notes_lookup",
+        ("SELECT * FROM test_executions WHERE notes = ?", ("x",)),
+        "idx_executions_scenario_executed",
+    )]
+    regressions = find_plan_regressions(analyzed_conn, hot_queries)
+    assert [item['query'] for item in regressions] == ["notes_lookup"]
+    assert "SCAN test_executions" in regressions[0]['plan']
+
+
+def test_temp_sort_is_reported_unless_allowed(analyzed_conn):
+    sql = ("SELECT * FROM test_executions WHERE scenario_id = ? ORDER BY notes", (1,))
+    assert find_plan_regressions(analyzed_conn, [("sorted", sql, "idx_executions_scenario_executed")])
+    assert not find_plan_regressions(analyzed_conn, [("sorted", sql, "idx_executions_scenario_executed", True)])
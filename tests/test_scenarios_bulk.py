@@ -0,0 +1,60 @@
+from database.db import db_connection
+from database import models
+
+
+def _steps(scenario_id):
+    return models.get_steps_for_scenarios([scenario_id])[scenario_id]
+
+
+def test_bulk_save_keeps_steps_with_their_scenario():
+    project_id = models.create_project("Toplu", "", "")
+    models.create_test_scenario(project_id, "Önceki", "", ["x"])
+
+    result = models.create_test_scenarios_bulk(project_id, [
+        {"title": "Giriş", "steps": ["Aç", "Gir"], "priority": "high"},
+        {"title": "", "steps": ["Boş başlık"]},
+        {"title": "Çıkış", "steps": ["Çık"]},
+    ])
+
+    assert result['saved_count'] == 2
+    assert [error['index'] for error in result['errors']] == [1]
+    scenarios = {row['title']: row for row in models.get_scenarios_by_project(project_id)}
+    assert _steps(scenarios["Giriş"]['id']) == ["Aç", "Gir"]
+    assert _steps(scenarios["Çıkış"]['id']) == ["Çık"]
+    assert scenarios["Giriş"]['priority'] == "high"
+
+
+def test_import_chunk_returns_inserted_ids_in_order():
+    project_id = models.create_project("İçe aktarma", "", "")
+    rows = [("A", "", ["a1"], "low"), ("B", "", ["b1", "b2"], "medium")]
+
+    ids = models.import_test_scenarios_chunk(project_id, rows)
+
+    with db_connection() as conn:
+        titles = [conn.execute("SELECT title FROM test_scenarios WHERE id = ?", (i,)).fetchone()[0] for i in ids]
+    assert titles == ["A", "B"]
+    assert _steps(ids[1]) == ["b1", "b2"]
+
+
+def test_steps_follow_real_ids_when_ids_are_not_contiguous():
+    project_id = models.create_project("Boşluklu", "", "")
+    with db_connection() as conn:
+        # Araya başka bir senaryo ekleyen trigger id'lerde boşluk bırakır
+        conn.execute(f"""
+            CREATE TEMP TRIGGER gap_maker AFTER INSERT ON test_scenarios
+            WHEN NEW.title = 'B'
+            BEGIN
+                INSERT INTO test_scenarios (project_id, title) VALUES ({project_id}, 'Araya giren');
+            END
+        """)
+    try:
+        rows = [("A", "", ["a1"], "low"), ("B", "", ["b1"], "low"), ("C", "", ["c1", "c2"], "low")]
+        ids = models.import_test_scenarios_chunk(project_id, rows)
+    finally:
+        with db_connection() as conn:
+            conn.execute("DROP TRIGGER temp.gap_maker")
+
+    with db_connection() as conn:
+        titles = [conn.execute("SELECT title FROM test_scenarios WHERE id = ?", (i,)).fetchone()[0] for i in ids]
+    assert titles == ["A", "B", "C"]
+    assert [_steps(i) for i in ids] == [["a1"], ["b1"], ["c1", "c2"]]